@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -21,6 +21,11 @@ class Settings(BaseSettings):
     hf_tokenizer_name: str = Field("disabled", env="HF_TOKENIZER_NAME")
     hf_device: int = Field(-1, env="HF_DEVICE")  # -1 CPU, >=0 GPU id
     hf_score_threshold: float = Field(0.6, env="HF_SCORE_THRESHOLD")
+    hf_batch_size: int = Field(16, env="HF_BATCH_SIZE")  # micro-batch size for analyze_batch
+    hf_length_buckets: str = Field("64,128,256,512", env="HF_LENGTH_BUCKETS")  # token-length bucket edges
+    hf_microbatch_enabled: bool = Field(True, env="HF_MICROBATCH_ENABLED")  # coalesce concurrent intakes
+    hf_microbatch_wait_ms: float = Field(10.0, env="HF_MICROBATCH_WAIT_MS")
+    hf_microbatch_max_size: int = Field(16, env="HF_MICROBATCH_MAX_SIZE")
     
     # Ollama Configuration (for semantic risk analysis)
     ollama_model: str = Field("llama3.2:3b", env="OLLAMA_MODEL")  # Lightweight and efficient
@@ -29,7 +34,75 @@ class Settings(BaseSettings):
     ollama_timeout: int = Field(30, env="OLLAMA_TIMEOUT")
     ollama_prompt_chars: int = Field(2000, env="OLLAMA_PROMPT_CHARS")
     ollama_timeout_ceiling: int = Field(90, env="OLLAMA_TIMEOUT_CEILING")
+    ollama_async_enabled: bool = Field(True, env="OLLAMA_ASYNC_ENABLED")  # pooled AsyncOllamaClient in detect_async
+    ollama_max_concurrency: int = Field(4, env="OLLAMA_MAX_CONCURRENCY")  # in-flight generations per process
     
+    # SQLite connection pool (app/storage/pool.py), shared by every store on the same file
+    sqlite_synchronous: str = Field("NORMAL", env="SQLITE_SYNCHRONOUS")  # NORMAL | FULL
+    sqlite_mmap_size: int = Field(268435456, env="SQLITE_MMAP_SIZE")  # bytes (256 MB)
+    sqlite_cache_size_kb: int = Field(65536, env="SQLITE_CACHE_SIZE_KB")
+    db_durability_mode: str = Field("strict", env="DB_DURABILITY_MODE")  # strict | write_behind
+    db_write_behind_max_rows: int = Field(10000, env="DB_WRITE_BEHIND_MAX_ROWS")  # queue bound (backpressure)
+    db_write_behind_flush_ms: float = Field(50.0, env="DB_WRITE_BEHIND_FLUSH_MS")
+    db_write_behind_flush_rows: int = Field(500, env="DB_WRITE_BEHIND_FLUSH_ROWS")
+
+    # Near-duplicate fingerprints (MinHash + LSH, app/models/near_duplicate.py)
+    near_duplicate_enabled: bool = Field(True, env="NEAR_DUPLICATE_ENABLED")
+    near_duplicate_threshold: float = Field(0.6, env="NEAR_DUPLICATE_THRESHOLD")  # estimated Jaccard
+    near_duplicate_num_perm: int = Field(64, env="NEAR_DUPLICATE_NUM_PERM")
+    near_duplicate_bands: int = Field(16, env="NEAR_DUPLICATE_BANDS")  # num_perm / bands rows per band
+    near_duplicate_shingle_size: int = Field(3, env="NEAR_DUPLICATE_SHINGLE_SIZE")  # words per shingle
+
+    # SimHash campaign clustering (app/models/simhash.py)
+    simhash_enabled: bool = Field(True, env="SIMHASH_ENABLED")
+    simhash_max_distance: int = Field(5, env="SIMHASH_MAX_DISTANCE")  # bits; index uses distance+1 tables
+    simhash_bucket_limit: int = Field(128, env="SIMHASH_BUCKET_LIMIT")  # newest entries kept per bucket
+    simhash_max_matches: int = Field(5, env="SIMHASH_MAX_MATCHES")  # near_duplicate edges per intake
+
+    # Behavioral lexicons: <dir>/<language>/<category>.txt (urgency, valence_*, cta), one term
+    # per line, added to the built-in English lists. Unset = built-ins only.
+    lexicon_dir: Optional[str] = Field(None, env="LEXICON_DIR")
+
+    # Stylometric MATTR: "approx" (half-overlapping windows) or "exact" (every window, O(n))
+    mattr_method: str = Field("approx", env="MATTR_METHOD")
+
+    # Narrative coherence in behavioral scoring: "indexed" (O(n log n)) or "pairwise" (O(S^2) original)
+    coherence_method: str = Field("indexed", env="COHERENCE_METHOD")
+
+    # Detection pipeline (async path runs HF and Ollama concurrently)
+    detection_concurrent_stages: bool = Field(True, env="DETECTION_CONCURRENT_STAGES")
+    detection_hf_timeout: float = Field(10.0, env="DETECTION_HF_TIMEOUT")  # seconds
+    detection_ollama_timeout: float = Field(30.0, env="DETECTION_OLLAMA_TIMEOUT")  # seconds
+    detection_cascade_enabled: bool = Field(False, env="DETECTION_CASCADE_ENABLED")  # fast path / deep path
+    detection_cascade_low: float = Field(0.2, env="DETECTION_CASCADE_LOW")  # settle below this score
+    detection_cascade_high: float = Field(0.75, env="DETECTION_CASCADE_HIGH")  # settle at/above (critical)
+
+    # Graph Intelligence
+    graph_incremental_summary: bool = Field(True, env="GRAPH_INCREMENTAL_SUMMARY")
+    graph_sparse_threshold: int = Field(500, env="GRAPH_SPARSE_THRESHOLD")  # dense A_hat at or below (training)
+    graph_gnn_weights: Optional[str] = Field(None, env="GRAPH_GNN_WEIGHTS")  # JSON from `python -m app.models.gnn train`
+    graph_store_backend: str = Field("sqlite", env="GRAPH_STORE_BACKEND")  # sqlite | memory
+    graph_max_content_nodes: int = Field(50000, env="GRAPH_MAX_CONTENT_NODES")
+    graph_window_days: int = Field(30, env="GRAPH_WINDOW_DAYS")
+
+    # Realtime event stream (SSE fan-out to dashboards)
+    events_buffer_size: int = Field(256, env="EVENTS_BUFFER_SIZE")  # per-subscriber ring buffer
+    events_history_size: int = Field(1000, env="EVENTS_HISTORY_SIZE")  # kept for Last-Event-ID resume
+    events_slow_consumer: str = Field("drop_oldest", env="EVENTS_SLOW_CONSUMER")  # drop_oldest | disconnect
+    events_heartbeat_seconds: float = Field(15.0, env="EVENTS_HEARTBEAT_SECONDS")  # keepalive when idle
+    # Event bus between workers (app/services/event_bus.py); memory = single process only
+    event_bus_backend: str = Field("sqlite", env="EVENT_BUS_BACKEND")  # sqlite | redis | memory
+    event_bus_poll_ms: int = Field(100, env="EVENT_BUS_POLL_MS")  # sqlite tail interval (other workers' events)
+    event_bus_retention: int = Field(10000, env="EVENT_BUS_RETENTION")  # sqlite log rows kept
+    event_bus_url: Optional[str] = Field(None, env="EVENT_BUS_URL")  # redis://host:6379/0
+    event_bus_channel: str = Field("events", env="EVENT_BUS_CHANNEL")  # pub/sub channel and key prefix
+
+    # Model result cache (AI detector + Ollama), keyed on normalised content hash
+    result_cache_enabled: bool = Field(True, env="RESULT_CACHE_ENABLED")
+    result_cache_backend: str = Field("sqlite", env="RESULT_CACHE_BACKEND")  # sqlite | memory
+    result_cache_max_entries: int = Field(10000, env="RESULT_CACHE_MAX_ENTRIES")
+    result_cache_ttl_seconds: int = Field(86400, env="RESULT_CACHE_TTL_SECONDS")
+
     # Federated Blockchain Configuration
     federated_encryption_key: str = Field("LULSnIHlBjTSfWDfqVl0kTV9qXUFN0EpGbynAB_34TM=", env="BLOCK_ENCRYPTION_KEY")
     federated_nodes: str = Field("http://localhost:8000,http://localhost:8001,http://localhost:8002,http://localhost:8003,http://localhost:8004", env="FEDERATED_NODES")
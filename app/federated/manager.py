@@ -1,12 +1,11 @@
 """
 Manages the blockchain state and validation logic.
 """
-import sqlite3
-from contextlib import contextmanager
 from pathlib import Path
 from typing import List
 
 from ..config import get_settings
+from ..storage.pool import get_pool
 from .crypto import sha256, verify_signature
 from .ledger import Block
 
@@ -16,17 +15,12 @@ class LedgerManager:
         settings = get_settings()
         # For blockchain nodes, always store the ledger in ./data/federated_ledger.db
         self.ledger_db_path = "data/federated_ledger.db"
+        Path(self.ledger_db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.ledger_db_path)
         self._initialise()
 
-    @contextmanager
     def _cursor(self):
-        conn = sqlite3.connect(self.ledger_db_path)
-        try:
-            cur = conn.cursor()
-            yield cur
-            conn.commit()
-        finally:
-            conn.close()
+        return self._pool.cursor()
 
     def _initialise(self):
         with self._cursor() as cur:
@@ -94,6 +88,29 @@ class LedgerManager:
                 ),
             )
 
+    def replace_chain(self, chain: List[Block]):
+        """Replace every stored block with `chain` in one transaction (network sync)."""
+        with self._cursor() as cur:
+            cur.execute("DELETE FROM blocks")
+            cur.executemany(
+                """
+                INSERT INTO blocks (idx, ts, data_encrypted, previous_hash, hash, signature, public_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        block.index,
+                        block.timestamp,
+                        block.data_encrypted,
+                        block.previous_hash,
+                        block.hash,
+                        block.signature,
+                        block.public_key,
+                    )
+                    for block in chain
+                ],
+            )
+
     def validate_chain(self, chain: List[Block]) -> bool:
         for i in range(1, len(chain)):
             current = chain[i]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 import os
 from functools import lru_cache
-from typing import Dict, Optional, Tuple, Any
+from typing import Any, Dict, List, Optional, Tuple
 
 import torch
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
@@ -25,8 +25,14 @@ class AIDetector:
     2. Model Family detection for AI-generated text (XOmar/model_family_detector_deberta_v3_balanced)
     """
 
+    FAMILY_MODEL_ID = "XOmar/model_family_detector_deberta_v3_balanced"
+
     def __init__(self) -> None:
         self.settings = get_settings()
+        self._batch_size = self.settings.hf_batch_size
+        self._bucket_edges = sorted(
+            int(edge) for edge in self.settings.hf_length_buckets.split(",") if edge.strip()
+        )
         self._ai_human_model = None
         self._ai_human_tokenizer = None
         self._family_model = None
@@ -117,7 +123,7 @@ class AIDetector:
         # --- 2. Load Model Family Detector (optional) ---
         try:
             logger.info("⏳ Loading Model Family detector (Balanced)...")
-            family_model_id = "XOmar/model_family_detector_deberta_v3_balanced"
+            family_model_id = self.FAMILY_MODEL_ID
 
             self._family_model = AutoModelForSequenceClassification.from_pretrained(
                 family_model_id
@@ -142,6 +148,12 @@ class AIDetector:
         """Check if models are loaded and ready."""
         return self._ai_human_model is not None and self._ai_human_tokenizer is not None
 
+    @property
+    def model_identity(self) -> str:
+        """Identifies the loaded checkpoints; cached results are only valid for the same identity."""
+        family = self.FAMILY_MODEL_ID if self._family_model is not None else "none"
+        return f"{self._ai_human_adapter_id}|{family}"
+
     def detect_ai_human(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Detect if text is AI-generated or human-written.
@@ -163,32 +175,35 @@ class AIDetector:
                 outputs = self._ai_human_model(**inputs)
                 probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
 
-            # Dynamic Label Mapping (Safety check)
-            id2label = self._ai_human_model.config.id2label
-            
-            # Find which index corresponds to "AI" or "LABEL_1"
-            ai_index = 1 # Default
-            for idx, label in id2label.items():
-                if "AI" in str(label).upper() or "LABEL_1" in str(label).upper():
-                    ai_index = int(idx)
-                    break
-            
-            human_index = 1 - ai_index # Assuming binary 0/1
-
-            ai_prob = float(probabilities[0][ai_index].item())
-            human_prob = float(probabilities[0][human_index].item())
-
-            return {
-                "ai_probability": ai_prob,
-                "human_probability": human_prob,
-                "is_ai": ai_prob > 0.5,
-                "verdict": "AI" if ai_prob > 0.5 else "Human"
-            }
+            return self._ai_human_result(probabilities[0])
 
         except Exception as exc:
             logger.error(f"AI/Human detection failed: {exc}")
             return None
 
+    def _ai_human_result(self, probabilities) -> Dict[str, Any]:
+        # Dynamic Label Mapping (Safety check)
+        id2label = self._ai_human_model.config.id2label
+
+        # Find which index corresponds to "AI" or "LABEL_1"
+        ai_index = 1 # Default
+        for idx, label in id2label.items():
+            if "AI" in str(label).upper() or "LABEL_1" in str(label).upper():
+                ai_index = int(idx)
+                break
+
+        human_index = 1 - ai_index # Assuming binary 0/1
+
+        ai_prob = float(probabilities[ai_index].item())
+        human_prob = float(probabilities[human_index].item())
+
+        return {
+            "ai_probability": ai_prob,
+            "human_probability": human_prob,
+            "is_ai": ai_prob > 0.5,
+            "verdict": "AI" if ai_prob > 0.5 else "Human"
+        }
+
     def detect_model_family(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Detect which AI model family generated the text.
@@ -209,28 +224,31 @@ class AIDetector:
                 outputs = self._family_model(**inputs)
                 probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
 
-            id2label = self._family_model.config.id2label
-
-            # Create readable probability dict
-            all_probs = {
-                id2label[i]: float(probabilities[0][i].item())
-                for i in sorted(id2label.keys()) # Ensure order
-            }
-
-            top_idx = int(torch.argmax(probabilities[0]).item())
-            family = id2label[top_idx]
-            confidence = float(probabilities[0][top_idx].item())
-
-            return {
-                "family": family,
-                "confidence": confidence,
-                "all_probabilities": all_probs
-            }
+            return self._family_result(probabilities[0])
 
         except Exception as exc:
             logger.error(f"Model family detection failed: {exc}")
             return None
 
+    def _family_result(self, probabilities) -> Dict[str, Any]:
+        id2label = self._family_model.config.id2label
+
+        # Create readable probability dict
+        all_probs = {
+            id2label[i]: float(probabilities[i].item())
+            for i in sorted(id2label.keys()) # Ensure order
+        }
+
+        top_idx = int(torch.argmax(probabilities).item())
+        family = id2label[top_idx]
+        confidence = float(probabilities[top_idx].item())
+
+        return {
+            "family": family,
+            "confidence": confidence,
+            "all_probabilities": all_probs
+        }
+
     def analyze_text(self, text: str) -> Tuple[Optional[Dict], Optional[Dict]]:
         """
         Full pipeline: 
@@ -246,6 +264,91 @@ class AIDetector:
         
         return ai_result, family_result
 
+    def analyze_batch(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[Tuple[Optional[Dict], Optional[Dict]]]:
+        """
+        Same pipeline as analyze_text for many texts at once.
+
+        Inputs are tokenized once, sorted into length buckets and run through
+        each model in micro-batches of `batch_size` (HF_BATCH_SIZE by default),
+        padded only to the longest sequence in that micro-batch. Results come
+        back in input order.
+        """
+        results: List[Tuple[Optional[Dict], Optional[Dict]]] = [(None, None)] * len(texts)
+        if not self.available:
+            return results
+        batch_size = max(1, batch_size or self._batch_size)
+
+        indices = [idx for idx, text in enumerate(texts) if text.strip()]
+        ai_probs = self._batched_probabilities(
+            self._ai_human_model, self._ai_human_tokenizer, [texts[idx] for idx in indices], batch_size
+        )
+        ai_results: Dict[int, Dict[str, Any]] = {
+            idx: self._ai_human_result(row) for idx, row in zip(indices, ai_probs) if row is not None
+        }
+
+        family_results: Dict[int, Dict[str, Any]] = {}
+        flagged = [idx for idx in indices if ai_results.get(idx, {}).get("is_ai", False)]
+        if flagged and self._family_model:
+            family_probs = self._batched_probabilities(
+                self._family_model, self._family_tokenizer, [texts[idx] for idx in flagged], batch_size
+            )
+            family_results = {
+                idx: self._family_result(row) for idx, row in zip(flagged, family_probs) if row is not None
+            }
+
+        return [(ai_results.get(idx), family_results.get(idx)) for idx in range(len(texts))]
+
+    def _batched_probabilities(self, model, tokenizer, texts: List[str], batch_size: int):
+        """
+        Softmax rows for `texts` (input order), computed per length-bucketed
+        micro-batch. A micro-batch that fails leaves None for its texts only.
+        """
+        rows: List[Any] = [None] * len(texts)
+        if not texts:
+            return rows
+        try:
+            encodings = tokenizer(texts, truncation=True, max_length=512)
+        except Exception as exc:
+            logger.error(f"Batched tokenization failed: {exc}")
+            return rows
+        keys = list(encodings.keys())
+        lengths = [len(ids) for ids in encodings["input_ids"]]
+        for micro_batch in self._length_buckets(lengths, batch_size):
+            try:
+                features = [{key: encodings[key][idx] for key in keys} for idx in micro_batch]
+                inputs = tokenizer.pad(features, padding=True, return_tensors="pt").to(self._device)
+                with torch.no_grad():
+                    outputs = model(**inputs)
+                    probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1).cpu()
+            except Exception as exc:
+                logger.error(f"Batched detection failed for {len(micro_batch)} texts: {exc}")
+                continue
+            for idx, row in zip(micro_batch, probabilities):
+                rows[idx] = row
+        return rows
+
+    def _length_buckets(self, lengths: List[int], batch_size: int) -> List[List[int]]:
+        """
+        Group indices by token length: sort, then cut a new micro-batch when it
+        is full or the length crosses a bucket edge, so padding stays small.
+        """
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_bucket = None
+        for idx in order:
+            bucket = next((edge for edge in self._bucket_edges if lengths[idx] <= edge), None)
+            if current and (len(current) >= batch_size or bucket != current_bucket):
+                batches.append(current)
+                current = []
+            current.append(idx)
+            current_bucket = bucket
+        if current:
+            batches.append(current)
+        return batches
+
 @lru_cache(maxsize=1)
 def get_ai_detector() -> AIDetector:
     """Singleton accessor."""
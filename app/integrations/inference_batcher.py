@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from .hf_detector import AIDetector, get_ai_detector
+
+logger = logging.getLogger(__name__)
+
+DetectorResult = Tuple[Optional[Dict], Optional[Dict]]
+
+
+class InferenceBatcher:
+    """
+    Coalesces concurrent single-text requests into AIDetector.analyze_batch calls.
+
+    Each intake runs in its own threadpool worker; instead of every worker
+    doing its own forward pass, callers enqueue their text and block on a
+    Future. One background thread takes the first queued text, waits up to
+    `max_wait_ms` for more (stopping early at `max_batch_size`) and runs the
+    whole group through the model in one pass.
+    """
+
+    def __init__(
+        self,
+        detector: AIDetector,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+    ) -> None:
+        self.detector = detector
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "max_queue_depth": 0, "errors": 0}
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, text: str) -> "Future[DetectorResult]":
+        future: "Future[DetectorResult]" = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        with self._lock:
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+        return future
+
+    def analyze_text(self, text: str) -> DetectorResult:
+        """Drop-in for AIDetector.analyze_text, served from a shared micro-batch."""
+        return self.submit(text).result()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        stats.update(
+            queue_depth=self._queue.qsize(),
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait * 1000,
+            avg_batch_size=round(stats["requests"] / batches, 3) if batches else 0.0,
+            fill_ratio=round(stats["requests"] / (batches * self.max_batch_size), 3) if batches else 0.0,
+        )
+        return stats
+
+    def stop(self) -> None:
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            worker.join(timeout=5)
+        self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        with self._lock:
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+        try:
+            results = self.detector.analyze_batch([text for text, _ in batch], batch_size=len(batch))
+        except Exception as exc:  # hand the failure to every waiting caller
+            logger.error(f"Batched inference failed: {exc}")
+            with self._lock:
+                self._stats["errors"] += 1
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+@lru_cache(maxsize=1)
+def get_inference_batcher() -> InferenceBatcher:
+    """Singleton accessor, sharing the AIDetector singleton."""
+    settings = get_settings()
+    return InferenceBatcher(
+        get_ai_detector(),
+        max_batch_size=settings.hf_microbatch_max_size,
+        max_wait_ms=settings.hf_microbatch_wait_ms,
+    )
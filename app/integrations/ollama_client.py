@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 
 try:
     import ollama
@@ -12,6 +13,8 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("Ollama library not installed. Install with: pip install ollama")
 
+import httpx
+
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -24,9 +27,20 @@ class OllamaClient:
     Expects Ollama server to be running on localhost:11434.
     """
 
+    GENERATE_OPTIONS = {
+        'temperature': 0.3,  # Lower temperature for more consistent scoring
+        'top_p': 0.9,
+        'num_predict': 150,  # Limit response length for efficiency
+    }
+
     def __init__(self) -> None:
         self.settings = get_settings()
         self.available = OLLAMA_AVAILABLE and self.settings.ollama_enabled
+        self._client = (
+            ollama.Client(host=self.settings.ollama_host, timeout=self.settings.ollama_timeout)
+            if OLLAMA_AVAILABLE
+            else None
+        )
         
         if not OLLAMA_AVAILABLE and self.settings.ollama_enabled:
             logger.error(
@@ -37,12 +51,17 @@ class OllamaClient:
         if self.available:
             # Test connection to Ollama server
             try:
-                ollama.list()
+                self._client.list()
                 logger.info(f"Ollama client initialized successfully with model: {self.settings.ollama_model}")
             except Exception as e:
                 logger.warning(f"Ollama server not accessible: {e}")
                 self.available = False
 
+    @property
+    def model_identity(self) -> str:
+        """Model plus prompt budget: changing either changes the scores."""
+        return f"{self.settings.ollama_model}|chars={self.settings.ollama_prompt_chars}"
+
     def risk_assessment(self, text: str) -> Optional[float]:
         """
         Analyze text for disinformation risk using Ollama LLM.
@@ -51,53 +70,50 @@ class OllamaClient:
         if not self.available:
             return None
             
-        # Truncate/sample text if too long
-        limit = max(256, int(self.settings.ollama_prompt_chars))
-        if len(text) <= limit:
-            snippet = text
-        else:
-            head = text[: limit // 2]
-            tail = text[-(limit // 2) :]
-            snippet = f"{head}\n...\n{tail}"
-        
-        # Construct analysis prompt
-        prompt = self._build_prompt(snippet)
+        snippet = self._snippet(text)
         
         try:
             # Call Ollama with timeout handling
-            response = ollama.generate(
+            response = self._client.generate(
                 model=self.settings.ollama_model,
-                prompt=prompt,
-                options={
-                    'temperature': 0.3,  # Lower temperature for more consistent scoring
-                    'top_p': 0.9,
-                    'num_predict': 150,  # Limit response length for efficiency
-                }
+                prompt=self._build_prompt(snippet),
+                options=self.GENERATE_OPTIONS,
             )
-            
-            if not response or 'response' not in response:
-                logger.warning(f"Ollama returned empty response for model {self.settings.ollama_model}")
-                return None
-            
-            output = response['response'].strip()
-            logger.debug(f"Ollama raw response (first 200 chars): {output[:200]}")
-            logger.info("Ollama raw response (full): %s", output)
-            
-            # Extract risk score from response
-            risk_score = self._parse_risk_score(output)
-            
-            if risk_score is not None:
-                logger.info(
-                    f"Ollama risk assessment: {risk_score:.2%} "
-                    f"(model: {self.settings.ollama_model}, chars: {len(snippet)})"
-                )
-            
-            return risk_score
+            return self._score_response(response, snippet)
             
         except Exception as e:
             logger.warning(f"Ollama risk assessment failed: {e}")
             return None
 
+    def _snippet(self, text: str) -> str:
+        """Truncate/sample text if too long: keep the head and tail within the prompt budget."""
+        limit = max(256, int(self.settings.ollama_prompt_chars))
+        if len(text) <= limit:
+            return text
+        head = text[: limit // 2]
+        tail = text[-(limit // 2) :]
+        return f"{head}\n...\n{tail}"
+
+    def _score_response(self, response: Any, snippet: str) -> Optional[float]:
+        if not response or 'response' not in response:
+            logger.warning(f"Ollama returned empty response for model {self.settings.ollama_model}")
+            return None
+        
+        output = response['response'].strip()
+        logger.debug(f"Ollama raw response (first 200 chars): {output[:200]}")
+        logger.info("Ollama raw response (full): %s", output)
+        
+        # Extract risk score from response
+        risk_score = self._parse_risk_score(output)
+        
+        if risk_score is not None:
+            logger.info(
+                f"Ollama risk assessment: {risk_score:.2%} "
+                f"(model: {self.settings.ollama_model}, chars: {len(snippet)})"
+            )
+        
+        return risk_score
+
     def _build_prompt(self, snippet: str) -> str:
         """Construct a detailed prompt for risk assessment."""
         return f"""You are an expert counter-disinformation analyst. Analyze the following content for potential risks including:
@@ -189,3 +205,107 @@ JSON response:"""
                 return payload
             index = end
         return None
+
+
+class AsyncOllamaClient(OllamaClient):
+    """
+    Async drop-in for OllamaClient.risk_assessment, used by DetectorEngine.detect_async.
+
+    One pooled ollama.AsyncClient (httpx keep-alive connections, at most
+    OLLAMA_MAX_CONCURRENCY of them) is shared by every request, a semaphore
+    caps in-flight generations at the same number, and OLLAMA_TIMEOUT bounds
+    each generation. Requests beyond the cap wait on the event loop instead of
+    tying up threadpool workers. Prompting and parsing are inherited.
+    """
+
+    def __init__(self, available: Optional[bool] = None) -> None:
+        # Reachability is checked once by the sync client; skip the blocking probe here.
+        self.settings = get_settings()
+        self.available = (
+            OLLAMA_AVAILABLE and self.settings.ollama_enabled if available is None else available
+        )
+        self.max_concurrency = max(1, int(self.settings.ollama_max_concurrency))
+        self._client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._stats = {"requests": 0, "timeouts": 0, "errors": 0, "max_in_flight": 0}
+
+    def _bind(self) -> None:
+        """The pooled client and semaphore belong to one event loop; rebuild them on a new one."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._client is not None:
+            self._close_stale(self._client, self._loop)
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = ollama.AsyncClient(
+            host=self.settings.ollama_host,
+            timeout=self.settings.ollama_timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    async def risk_assessment(self, text: str) -> Optional[float]:
+        if not self.available:
+            return None
+        self._bind()
+        snippet = self._snippet(text)
+        self._stats["requests"] += 1
+        async with self._semaphore:
+            self._in_flight += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+            try:
+                response = await asyncio.wait_for(
+                    self._client.generate(
+                        model=self.settings.ollama_model,
+                        prompt=self._build_prompt(snippet),
+                        options=self.GENERATE_OPTIONS,
+                    ),
+                    timeout=self.settings.ollama_timeout,
+                )
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                # Whichever fires first: our overall deadline or httpx's per-read timeout.
+                self._stats["timeouts"] += 1
+                logger.warning(f"Ollama generation exceeded {self.settings.ollama_timeout}s")
+                return None
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"Ollama risk assessment failed: {e}")
+                return None
+            finally:
+                self._in_flight -= 1
+        return self._score_response(response, snippet)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": self._in_flight, "max_concurrency": self.max_concurrency}
+
+    def _close_stale(self, client, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Shut down a client left behind on a previous loop instead of leaking its pool."""
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+            return
+        # Its loop is gone: close from here; sockets bound to the dead loop may complain.
+        task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._client is not None:
+            # ollama.AsyncClient has no close(); shut down its httpx pool directly.
+            await self._client._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+async def _close_quietly(client) -> None:
+    try:
+        await client._client.aclose()  # ollama.AsyncClient wraps an httpx.AsyncClient
+    except Exception as exc:
+        logger.debug(f"Closing a stale Ollama client failed: {exc}")
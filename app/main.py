@@ -1,12 +1,13 @@
-import json
-
-from fastapi import Depends, FastAPI, HTTPException, Request, File, UploadFile, Form
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, File, UploadFile, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 from .config import Settings, get_settings
 from .schemas import (
+    BatchDetectionResult,
+    BatchIntake,
     ContentIntake,
     BaseModel,
     DetectionResult,
@@ -15,8 +16,10 @@ from .schemas import (
     SIEMCorrelationPayload,
     ThreatIntelFeed,
 )
+from .services.events import parse_last_event_id, sse_stream
 from .services.orchestrator import AnalysisOrchestrator
 from .storage.database import Database
+from .storage.pool import close_pools
 from .federated.manager import LedgerManager
 from .federated.node import Node
 from .federated.ledger import Block
@@ -56,10 +59,29 @@ async def startup_event():
         print(f"Database initialization warning: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers so in-flight batches finish cleanly."""
+    await orchestrator.detector.aclose()
+    orchestrator.event_bus.close()
+    for db in (orchestrator.db, database_l1, database_l2):
+        db.close()  # commits any write-behind rows before the pools go away
+    close_pools()
+
+
 def get_app_settings() -> Settings:
     return settings
 
 
+def _not_modified(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison against the current graph ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     return template_engine.TemplateResponse("dashboard.html", {"request": request})
@@ -98,15 +120,53 @@ async def submit_content(
     return result
 
 
+@app.post("/api/v1/intake/batch", response_model=BatchDetectionResult)
+async def submit_content_batch(
+    request: Request,
+    payload: BatchIntake,
+    _: Settings = Depends(get_app_settings),
+):
+    # Same permission and region rules as the single-item endpoint
+    user_id = await role_protection(request, "upload")
+    regions = [
+        (item.metadata.region if item.metadata else None) for item in payload.items
+    ]
+    missing = [idx for idx, region in enumerate(regions) if not region or not str(region).strip()]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Region (city/district) is required. Missing for items: {missing}",
+        )
+
+    batch = await orchestrator.process_batch(payload.items)
+
+    for region, result in zip(regions, batch.results):
+        try:
+            score = result.composite_score
+            norm = int(round(score * 100)) if 0 <= score <= 1 else int(round(score))
+            norm = max(0, min(100, norm))
+            record_point(str(region).strip(), norm)
+        except Exception:
+            pass
+
+    return batch
+
+
 @app.get("/api/v1/cases/{intake_id}", response_model=DetectionResult)
-async def get_case(request: Request, intake_id: str):
+async def get_case(request: Request, response: Response, intake_id: str):
     # Role check: Only allow users with 'dashboard' permission
     user_id = await role_protection(request, "dashboard")
     # Use L2 DB connection for dashboard/logs
-    record = database_l2.fetch_case(intake_id)
+    # Reads flush queued write-behind rows first, so they run in the threadpool.
+    record = await run_in_threadpool(database_l2.fetch_case, intake_id)
     if not record:
         raise HTTPException(status_code=404, detail="Case not found")
-    graph_snapshot = orchestrator.graph.summary()
+    # Graph reads sync with the event log under the engine lock: keep them off the loop.
+    etag = await run_in_threadpool(orchestrator.graph.etag, scope=f"case-{intake_id}")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    graph_snapshot = await run_in_threadpool(orchestrator.graph.summary)
     # reconstruct result for client convenience
     return DetectionResult.parse_obj(
         {
@@ -133,22 +193,42 @@ async def request_sharing_package(request_payload: SharingRequest) -> SharingPac
 
 
 @app.get("/api/v1/integrations/threat-intel", response_model=ThreatIntelFeed)
-async def threat_intel_feed() -> ThreatIntelFeed:
-    return orchestrator.graph.threat_intel_feed()
+async def threat_intel_feed(request: Request, response: Response):
+    etag = await run_in_threadpool(orchestrator.graph.etag, scope="threat-intel")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return await run_in_threadpool(orchestrator.graph.threat_intel_feed)
 
 
 @app.get("/api/v1/integrations/siem", response_model=SIEMCorrelationPayload)
-async def siem_feed() -> SIEMCorrelationPayload:
-    return orchestrator.graph.siem_payload()
+async def siem_feed(request: Request, response: Response):
+    etag = await run_in_threadpool(orchestrator.graph.etag, scope="siem")
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return await run_in_threadpool(orchestrator.graph.siem_payload)
 
 
 @app.get("/api/v1/events/stream")
-async def stream_events():
-    async def event_generator():
-        async for event in orchestrator.stream_events():
-            yield f"data: {json.dumps(event)}\n\n"
+async def stream_events(request: Request):
+    # EventSource resends the last id it saw when it reconnects.
+    last_event_id = parse_last_event_id(
+        request.headers.get("Last-Event-ID") or request.query_params.get("lastEventId")
+    )
+    subscription = orchestrator.subscribe_events(last_event_id)
+    return StreamingResponse(
+        sse_stream(subscription, orchestrator.events.heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+@app.get("/api/v1/metrics")
+async def pipeline_metrics(request: Request):
+    # Same permission as the dashboard endpoints
+    user_id = await role_protection(request, "dashboard")
+    return orchestrator.metrics()
 
 
 class FingerprintCheckPayload(BaseModel):
@@ -157,8 +237,9 @@ class FingerprintCheckPayload(BaseModel):
 
 @app.post("/api/v1/fingerprint/check")
 async def fingerprint_check(payload: FingerprintCheckPayload):
-    matches = orchestrator.check_fingerprint(payload.text)
-    return {"matches": matches}
+    matches = await run_in_threadpool(orchestrator.check_fingerprint, payload.text)
+    near_duplicates = await run_in_threadpool(orchestrator.check_near_duplicates, payload.text)
+    return {"matches": matches, "near_duplicates": near_duplicates}
 
 
 # ==================== Federated Blockchain Routes ====================
@@ -323,16 +404,7 @@ async def sync_chain_from_network():
     
     # Replace local chain with the longest valid one
     # WARNING: This deletes and rebuilds the local blockchain!
-    import sqlite3
-    conn = sqlite3.connect(ledger.ledger_db_path)
-    cur = conn.cursor()
-    cur.execute("DELETE FROM blocks")
-    conn.commit()
-    
-    for block in longest_chain:
-        ledger.save_block(block)
-    
-    conn.close()
+    ledger.replace_chain(longest_chain)
     
     return {
         "message": "Chain synced successfully",
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+import networkx as nx
+import numpy as np
+
+# Node type enum stored in CompactGraph.types; -1 marks a free slot.
+CONTENT, ACTOR, NARRATIVE, REGION = range(4)
+NODE_TYPES = ("content", "actor", "narrative", "region")
+PUBLISHED, TARGETS, ORIGIN, NEAR_DUPLICATE = range(4)
+RELATIONS = ("published", "targets", "origin", "near_duplicate")
+HISTORY_SIZE = 20  # actor score-history ring length
+NO_VALUE = -1
+
+_EPOCH = datetime(1970, 1, 1)
+_MASK_BITS = 64  # platforms with a code past this spill into a per-actor set
+
+
+def to_micros(ts: str) -> int:
+    """Naive ISO timestamp -> microseconds since the epoch (exact, unlike float seconds)."""
+    return (datetime.fromisoformat(ts) - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value: int) -> str:
+    return (_EPOCH + timedelta(microseconds=int(value))).isoformat()
+
+
+class StringTable:
+    """Interns repeated values (platforms, sources, classifications) as small ints."""
+
+    def __init__(self) -> None:
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_VALUE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def value(self, code: int) -> Optional[str]:
+        return self.values[code] if code != NO_VALUE else None
+
+
+class CompactGraph:
+    """
+    Integer-indexed node storage for the threat graph.
+
+    Node ids are interned to slots; per-node attributes live in typed numpy
+    columns (type enum, score, timestamp, interned classification/platform/
+    source codes) instead of one dict per node, and each actor keeps its last
+    HISTORY_SIZE scores in a ring-buffer row plus a platform bitmask. Adjacency is
+    a dict per node mapping neighbour slot -> relation code, in insertion
+    order like networkx. Freed slots are reused, so `seq` (not the slot)
+    carries insertion order.
+
+    `to_networkx()` materialises the familiar attribute-dict graph for
+    callers that still want networkx.
+    """
+
+    # column -> (dtype, value of an empty slot)
+    _COLUMNS = {
+        "types": (np.int8, NO_VALUE),
+        "seq": (np.int64, NO_VALUE),
+        "component": (np.int64, NO_VALUE),  # owner-maintained component label
+        "score": (np.float64, 0.0),  # content score, or actor average of the history ring
+        "ts": (np.int64, 0),  # content timestamp / actor last_seen, epoch microseconds
+        "classification": (np.int32, NO_VALUE),
+        "platform": (np.int32, NO_VALUE),
+        "source": (np.int32, NO_VALUE),
+        "platform_mask": (np.uint64, 0),
+        "ring": (np.int32, NO_VALUE),  # actors: row in the history ring table
+        "history_len": (np.int8, 0),
+        "history_head": (np.int8, 0),
+        "content_total": (np.float64, 0.0),  # actors: running sum/count of published scores
+        "content_count": (np.int64, 0),
+    }
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._ids: Dict[str, int] = {}
+        self.names: List[Optional[str]] = []
+        self.adj: List[Optional[Dict[int, int]]] = []
+        self._free: List[int] = []
+        self._edges = 0
+        self._capacity = 0
+        self._extra_platforms: Dict[int, Set[int]] = {}
+        self.platforms = StringTable()
+        self.sources = StringTable()
+        self.classifications = StringTable()
+        for name, (dtype, _) in self._COLUMNS.items():
+            setattr(self, name, np.empty(0, dtype=dtype))
+        # Score-history rings, one row per actor (other node types take none).
+        self.history = np.zeros((0, HISTORY_SIZE), dtype=np.float64)
+        self._ring_rows = 0
+        self._free_rings: List[int] = []
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self._capacity
+        for name, (dtype, empty) in self._COLUMNS.items():
+            setattr(self, name, np.concatenate([getattr(self, name), np.full(extra, empty, dtype=dtype)]))
+        self._capacity = capacity
+
+    def _ring_of(self, slot: int) -> int:
+        row = int(self.ring[slot])
+        if row == NO_VALUE:
+            if self._free_rings:
+                row = self._free_rings.pop()
+            else:
+                row = self._ring_rows
+                self._ring_rows += 1
+                if row == len(self.history):
+                    grown = np.zeros((max(64, 2 * len(self.history)), HISTORY_SIZE), dtype=np.float64)
+                    grown[:row] = self.history
+                    self.history = grown
+            self.ring[slot] = row
+        return row
+
+    # --- nodes and edges -----------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def is_live(self, slot: int) -> bool:
+        return self.names[slot] is not None
+
+    def add_node(self, name: str, node_type: int, seq: int) -> int:
+        """Intern a new node and return its slot."""
+        if self._free:
+            slot = self._free.pop()
+            self.names[slot] = name
+            self.adj[slot] = {}
+        else:
+            slot = len(self.names)
+            if slot == self._capacity:
+                self._grow(2 * self._capacity)
+            self.names.append(name)
+            self.adj.append({})
+        self._ids[name] = slot
+        self.types[slot] = node_type
+        self.seq[slot] = seq
+        return slot
+
+    def remove_node(self, slot: int) -> None:
+        neighbours = self.adj[slot]
+        for peer in neighbours:
+            if peer != slot:
+                del self.adj[peer][slot]
+        self._edges -= len(neighbours)
+        del self._ids[self.names[slot]]
+        self.names[slot] = None
+        self.adj[slot] = None
+        if self.ring[slot] != NO_VALUE:
+            self._free_rings.append(int(self.ring[slot]))
+        self._extra_platforms.pop(slot, None)
+        for name, (_, empty) in self._COLUMNS.items():
+            getattr(self, name)[slot] = empty
+        self._free.append(slot)
+
+    def add_edge(self, left: int, right: int, relation: int) -> bool:
+        """Link two slots (updating the relation of an existing edge); True when new."""
+        created = right not in self.adj[left]
+        self.adj[left][right] = relation
+        self.adj[right][left] = relation
+        self._edges += created
+        return created
+
+    def has_edge(self, left: int, right: int) -> bool:
+        return right in self.adj[left]
+
+    def neighbors(self, slot: int) -> Iterable[int]:
+        return self.adj[slot].keys()
+
+    def degree(self, slot: int) -> int:
+        return len(self.adj[slot])
+
+    def number_of_edges(self) -> int:
+        return self._edges
+
+    def slots(self) -> List[int]:
+        """Live slots in insertion order."""
+        slots = np.fromiter(self._ids.values(), dtype=np.int64, count=len(self._ids))
+        return slots[np.argsort(self.seq[slots], kind="stable")].tolist()
+
+    def connected_component(self, start: int) -> Set[int]:
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for peer in self.adj[queue.popleft()]:
+                if peer not in seen:
+                    seen.add(peer)
+                    queue.append(peer)
+        return seen
+
+    # --- attributes ----------------------------------------------------------
+
+    def set_content(
+        self, slot: int, score: float, classification: str, ts: int, platform: Optional[str], source: str
+    ) -> None:
+        self.score[slot] = score
+        self.classification[slot] = self.classifications.code(classification)
+        self.ts[slot] = ts
+        self.platform[slot] = self.platforms.code(platform)
+        self.source[slot] = self.sources.code(source)
+
+    def record_actor_score(self, slot: int, score: float, platform: Optional[str], ts: int) -> None:
+        """Push a score onto the actor's ring, refresh its average, platforms and last_seen."""
+        row = self._ring_of(slot)  # may grow (replace) self.history
+        head = int(self.history_head[slot])
+        self.history[row, head] = score
+        self.history_head[slot] = (head + 1) % HISTORY_SIZE
+        self.history_len[slot] = min(HISTORY_SIZE, int(self.history_len[slot]) + 1)
+        history = self.score_history(slot)
+        self.score[slot] = sum(history) / len(history)
+        if platform:
+            self._add_platform(slot, self.platforms.code(platform))
+        self.ts[slot] = ts
+
+    def reset_actor(self, slot: int, scores: List[float], platform_codes: Iterable[int]) -> None:
+        """Rebuild an actor's ring and platforms from the content it still publishes."""
+        scores = scores[-HISTORY_SIZE:]
+        row = self._ring_of(slot)
+        self.history[row, : len(scores)] = scores
+        self.history_len[slot] = len(scores)
+        self.history_head[slot] = len(scores) % HISTORY_SIZE
+        self.score[slot] = sum(scores) / len(scores)
+        self.platform_mask[slot] = 0
+        self._extra_platforms.pop(slot, None)
+        for code in platform_codes:
+            self._add_platform(slot, code)
+
+    def score_history(self, slot: int) -> List[float]:
+        """Ring contents, oldest first."""
+        length = int(self.history_len[slot])
+        if not length:
+            return []
+        ring = self.history[int(self.ring[slot])].tolist()
+        if length < HISTORY_SIZE:
+            return ring[:length]
+        head = int(self.history_head[slot])
+        return ring[head:] + ring[:head]
+
+    def _add_platform(self, slot: int, code: int) -> None:
+        if code < _MASK_BITS:
+            self.platform_mask[slot] |= np.uint64(1 << code)
+        else:
+            self._extra_platforms.setdefault(slot, set()).add(code)
+
+    def platform_codes(self, slot: int) -> List[int]:
+        mask = int(self.platform_mask[slot])
+        codes = [bit for bit in range(min(_MASK_BITS, len(self.platforms.values))) if mask >> bit & 1]
+        return codes + sorted(self._extra_platforms.get(slot, ()))
+
+    def platform_counts(self, slots: np.ndarray) -> np.ndarray:
+        """Distinct platforms per actor slot (popcount of the mask plus any spill-over)."""
+        counts = np.unpackbits(self.platform_mask[slots].view(np.uint8)).reshape(-1, _MASK_BITS).sum(axis=1)
+        if self._extra_platforms:
+            extra = [len(self._extra_platforms.get(slot, ())) for slot in slots.tolist()]
+            counts = counts + np.asarray(extra, dtype=counts.dtype)
+        return counts
+
+    def actor_platforms(self, slot: int) -> List[str]:
+        return sorted(self.platforms.values[code] for code in self.platform_codes(slot))
+
+    def attributes(self, slot: int) -> Dict:
+        """The attribute dict the networkx representation carried for this node."""
+        node_type = int(self.types[slot])
+        attrs: Dict = {"type": NODE_TYPES[node_type]}
+        if node_type == CONTENT:
+            attrs.update(
+                score=float(self.score[slot]),
+                classification=self.classifications.value(int(self.classification[slot])),
+                ts=from_micros(self.ts[slot]),
+                platform=self.platforms.value(int(self.platform[slot])),
+                source=self.sources.value(int(self.source[slot])),
+            )
+        elif node_type == ACTOR:
+            attrs.update(
+                score_history=self.score_history(slot),
+                avg_score=float(self.score[slot]),
+                platforms=self.actor_platforms(slot),
+                last_seen=from_micros(self.ts[slot]),
+            )
+        elif node_type == NARRATIVE:
+            attrs["tag"] = self.names[slot].split("::", 1)[1]
+        return attrs
+
+    def to_networkx(self) -> nx.Graph:
+        """Attribute-dict networkx copy; edits to it do not flow back."""
+        graph = nx.Graph()
+        slots = self.slots()
+        names = self.names
+        graph.add_nodes_from((names[slot], self.attributes(slot)) for slot in slots)
+        # Fill the adjacency rows directly so every node keeps its own neighbour
+        # order; both directions of an edge share one attribute dict, as in networkx.
+        adjacency = graph._adj
+        for slot in slots:
+            name = names[slot]
+            row = adjacency[name]
+            for peer, relation in self.adj[slot].items():
+                mirror = adjacency[names[peer]].get(name)
+                row[names[peer]] = mirror if mirror is not None else {"relation": RELATIONS[relation]}
+        return graph
@@ -1,17 +1,25 @@
+import asyncio
 import logging
 import math
 import re
-import statistics
-from collections import Counter
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple
 
 from ..config import get_settings
 from ..integrations.hf_detector import get_ai_detector
-from ..integrations.ollama_client import OllamaClient
+from ..integrations.inference_batcher import get_inference_batcher
+from ..integrations.ollama_client import AsyncOllamaClient, OllamaClient
 from ..schemas import ContentIntake, DetectionBreakdown
+from ..storage.result_cache import create_result_cache
+from .lexicon import load_lexicons
+from .stylometry import StylometricExtractor
 
 logger = logging.getLogger(__name__)
 
+# Behavioral coherence check: sentence split and keyword pattern, compiled once.
+_CLAUSE_SPLIT = re.compile(r"[.!?]+")
+_KEYWORD_PATTERN = re.compile(r"\b[a-z]{4,}\b")
+
 
 class DetectorEngine:
     """
@@ -53,22 +61,24 @@ class DetectorEngine:
 
     # Valence words for emotional manipulation (positive/negative extremes)
     HIGH_VALENCE_WORDS = {
-        "positive": {"amazing", "incredible", "brilliant", "genius, ", "hero"},
+        "positive": {"amazing", "incredible", "brilliant", "genius", "hero"},
         "negative": {"disaster", "catastrophe", "evil", "corrupt", "traitor", "fake"},
     }
 
-    # Expanded CTA phrases
-    CTA_PATTERNS = [
-        r"click\s+(here|now|link)",
-        r"sign\s+up",
-        r"donate\s+(now|today)",
-        r"forward\s+(this|to)",
-        r"share\s+(this|now)",
-        r"join\s+(us|today)",
-        r"act\s+(now|fast)",
-        r"read\s+(more|full)",
+    # Expanded CTA phrases (matched as whole words; see lexicon.py)
+    CTA_PHRASES = [
+        "click here", "click now", "click link",
+        "sign up",
+        "donate now", "donate today",
+        "forward this", "forward to",
+        "share this", "share now",
+        "join us", "join today",
+        "act now", "act fast",
+        "read more", "read full",
     ]
 
+    CASCADE_TIERS = ("fast", "no_model", "ai_detector", "ollama")
+
     def __init__(self) -> None:
         self.settings = get_settings()
 
@@ -86,8 +96,22 @@ class DetectorEngine:
             "uppercase_ratio": 0.5,
         }
         self.bias = -0.25  # Slightly less negative bias for balance
+        self._stylometry = StylometricExtractor(
+            self.FUNCTION_WORDS, mattr_window=50, mattr_method=self.settings.mattr_method
+        )
+        # Urgency, valence and CTA lexicons share one automaton per language.
+        self._lexicons = load_lexicons(
+            self.settings.lexicon_dir,
+            {
+                "urgency": self.URGENCY_WORDS,
+                **{f"valence_{group}": words for group, words in self.HIGH_VALENCE_WORDS.items()},
+                "cta": self.CTA_PHRASES,
+            },
+        )
 
         self._ai_detector = get_ai_detector()
+        # Concurrent single intakes share forward passes through the batcher.
+        self._batcher = get_inference_batcher() if self.settings.hf_microbatch_enabled else None
 
         # Safely initialize Ollama client so the engine doesn't crash if Ollama isn't running
         try:
@@ -95,11 +119,264 @@ class DetectorEngine:
         except Exception as e:
             logger.warning(f"Failed to initialize Ollama client: {e}")
             self._ollama_client = None
+        # detect_async awaits a pooled client instead of holding a thread per generation.
+        self._async_ollama: Optional[AsyncOllamaClient] = None
+        if getattr(self._ollama_client, "available", False) and self.settings.ollama_async_enabled:
+            self._async_ollama = AsyncOllamaClient(available=True)
+
+        # Cascade mode: how many intakes each tier settled (fast, ai_detector, ollama).
+        self._tier_lock = threading.Lock()
+        self._tier_counts = {tier: 0 for tier in self.CASCADE_TIERS}
+
+        # Reposted copies skip the model entirely; entries from other checkpoints are dropped.
+        self._result_cache = create_result_cache(self.settings)
+        if self._result_cache is not None:
+            if getattr(self._ai_detector, "available", False):
+                self._result_cache.invalidate("ai_detector", self._ai_detector.model_identity)
+            if getattr(self._ollama_client, "available", False):
+                self._result_cache.invalidate("ollama", self._ollama_client.model_identity)
 
     def detect(self, intake: ContentIntake) -> Tuple[float, str, DetectionBreakdown]:
+        if self.settings.detection_cascade_enabled:
+            return self._detect_cascade(intake)
+        text = intake.text
+        features = self._extract_features(text)
+
+        # AI Detection (Hugging Face / Local Model)
+        ai_result, model_family_result = self._ai_detection(text)
+
+        # Semantic Risk (Ollama)
+        ollama_risk = self._ollama_risk_assessment(text)
+
+        return self._score(intake, features, ai_result, model_family_result, ollama_risk)
+
+    async def detect_async(self, intake: ContentIntake) -> Tuple[float, str, DetectionBreakdown]:
+        """
+        Concurrent variant of detect(): the HF detector and Ollama run in worker
+        threads at the same time while stylometric features are extracted.
+        A stage that misses its timeout (DETECTION_HF_TIMEOUT,
+        DETECTION_OLLAMA_TIMEOUT) or raises contributes no signal, and
+        _blend_scores redistributes its weight as it does for any unavailable model.
+        """
+        if self.settings.detection_cascade_enabled:
+            return await self._detect_cascade_async(intake)
+        text = intake.text
+        skipped: List[str] = []
+        if self._async_ollama is not None:
+            ollama_stage = self._ollama_risk_assessment_async(text)
+        else:
+            ollama_stage = asyncio.to_thread(self._ollama_risk_assessment, text)
+        features, (ai_result, model_family_result), ollama_risk = await asyncio.gather(
+            asyncio.to_thread(self._extract_features, text),
+            self._run_stage(
+                "AI detector", asyncio.to_thread(self._ai_detection, text),
+                self.settings.detection_hf_timeout, (None, None), skipped,
+            ),
+            self._run_stage(
+                "Ollama", ollama_stage,
+                self.settings.detection_ollama_timeout, None, skipped,
+            ),
+        )
+        result = self._score(intake, features, ai_result, model_family_result, ollama_risk)
+        for stage in skipped:
+            result[2].heuristics.append(f"{stage}; score blended without it.")
+        return result
+
+    def _detect_cascade(self, intake: ContentIntake) -> Tuple[float, str, DetectionBreakdown]:
+        """
+        Fast path / deep path: stylometric + behavioral scores first; only
+        scores inside [DETECTION_CASCADE_LOW, DETECTION_CASCADE_HIGH) escalate
+        to the HF detector, and only those still uncertain go on to Ollama.
+        """
         text = intake.text
         features = self._extract_features(text)
+        result = self._score(intake, features, None, None, None)
+        if self._settled(result[0]):
+            return self._settle("fast", result)
+        if not (self._ai_available() or self._ollama_available()):
+            return self._settle("no_model", result)
+        ai_result, model_family_result = self._ai_detection(text)
+        result = self._score(intake, features, ai_result, model_family_result, None)
+        if self._settled(result[0]) or not self._ollama_available():
+            return self._settle("ai_detector", result)
+        ollama_risk = self._ollama_risk_assessment(text)
+        return self._settle(
+            "ollama", self._score(intake, features, ai_result, model_family_result, ollama_risk)
+        )
+
+    async def _detect_cascade_async(self, intake: ContentIntake) -> Tuple[float, str, DetectionBreakdown]:
+        """_detect_cascade with the per-stage timeouts and async Ollama client of detect_async."""
+        text = intake.text
+        skipped: List[str] = []
+        features = await asyncio.to_thread(self._extract_features, text)
+        result = self._score(intake, features, None, None, None)
+        if self._settled(result[0]):
+            return self._settle("fast", result)
+        if not (self._ai_available() or self._ollama_available()):
+            return self._settle("no_model", result)
+        ai_result, model_family_result = await self._run_stage(
+            "AI detector", asyncio.to_thread(self._ai_detection, text),
+            self.settings.detection_hf_timeout, (None, None), skipped,
+        )
+        result = self._score(intake, features, ai_result, model_family_result, None)
+        if self._settled(result[0]) or not self._ollama_available():
+            tier = "ai_detector"
+        else:
+            if self._async_ollama is not None:
+                ollama_stage = self._ollama_risk_assessment_async(text)
+            else:
+                ollama_stage = asyncio.to_thread(self._ollama_risk_assessment, text)
+            ollama_risk = await self._run_stage(
+                "Ollama", ollama_stage, self.settings.detection_ollama_timeout, None, skipped,
+            )
+            result = self._score(intake, features, ai_result, model_family_result, ollama_risk)
+            tier = "ollama"
+        for stage in skipped:
+            result[2].heuristics.append(f"{stage}; score blended without it.")
+        return self._settle(tier, result)
+
+    def _settled(self, composite: float) -> bool:
+        return (
+            composite < self.settings.detection_cascade_low
+            or composite >= self.settings.detection_cascade_high
+        )
+
+    def _settle(
+        self, tier: str, result: Tuple[float, str, DetectionBreakdown]
+    ) -> Tuple[float, str, DetectionBreakdown]:
+        with self._tier_lock:
+            self._tier_counts[tier] += 1
+        if tier == "fast":
+            result[2].heuristics.append(
+                "Provisional score: cheap signals were decisive, model stages skipped."
+            )
+        elif tier == "no_model":
+            result[2].heuristics.append(
+                "Provisional score: uncertain, but no detection model was available to escalate to."
+            )
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Runtime counters for the detector's shared components (None when disabled)."""
+        return {
+            "inference_batcher": self._batcher.metrics() if self._batcher is not None else None,
+            "result_cache": self._result_cache.metrics() if self._result_cache is not None else None,
+            "detection_cascade": self.cascade_metrics(),
+            "ollama_async": self._async_ollama.metrics() if self._async_ollama is not None else None,
+        }
+
+    async def aclose(self) -> None:
+        """Stop the inference batcher and close the async Ollama client (app shutdown)."""
+        if self._batcher is not None:
+            self._batcher.stop()  # in-flight micro-batches finish first
+        if self._async_ollama is not None:
+            await self._async_ollama.aclose()
+
+    def cascade_metrics(self) -> Dict[str, Any]:
+        with self._tier_lock:
+            counts = dict(self._tier_counts)
+        total = sum(counts.values())
+        return {
+            "enabled": self.settings.detection_cascade_enabled,
+            "total": total,
+            "tiers": {
+                tier: {"count": count, "fraction": round(count / total, 3) if total else 0.0}
+                for tier, count in counts.items()
+            },
+        }
+
+    def _ai_available(self) -> bool:
+        return getattr(self._ai_detector, "available", False)
+
+    def _ollama_available(self) -> bool:
+        return getattr(self._ollama_client, "available", False)
+
+    async def _run_stage(
+        self,
+        name: str,
+        stage: Awaitable[Any],
+        timeout: float,
+        fallback: Any,
+        skipped: List[str],
+    ) -> Any:
+        try:
+            return await asyncio.wait_for(stage, timeout=timeout)
+        except asyncio.TimeoutError:
+            # The worker thread finishes in the background (and still fills the result cache).
+            logger.warning(f"{name} stage exceeded {timeout}s; continuing without it")
+            skipped.append(f"{name} timed out")
+            return fallback
+        except Exception as exc:
+            # Same as an unavailable model, as in detect(); one bad stage must not fail the intake.
+            logger.warning(f"{name} stage failed: {exc}; continuing without it")
+            skipped.append(f"{name} failed")
+            return fallback
+
+    def detect_batch(
+        self, intakes: List[ContentIntake]
+    ) -> List[Tuple[float, str, DetectionBreakdown]]:
+        """
+        Batch variant of detect(): stylometric features for every item first,
+        then the HF detector over the whole batch in padded forward passes.
+        Ollama has no batch API and is still called per item.
+        """
+        texts = [intake.text for intake in intakes]
+        features = [self._extract_features(text) for text in texts]
+        if self.settings.detection_cascade_enabled:
+            return self._detect_batch_cascade(intakes, features)
+        ai_results = self._ai_detection_batch(texts)
+        return [
+            self._score(
+                intake,
+                item_features,
+                ai_result,
+                model_family_result,
+                self._ollama_risk_assessment(intake.text),
+            )
+            for intake, item_features, (ai_result, model_family_result) in zip(
+                intakes, features, ai_results
+            )
+        ]
+
+    def _detect_batch_cascade(
+        self, intakes: List[ContentIntake], features: List[Dict[str, float]]
+    ) -> List[Tuple[float, str, DetectionBreakdown]]:
+        """_detect_cascade over a batch: the uncertain items share batched HF passes."""
+        results = [
+            self._score(intake, item_features, None, None, None)
+            for intake, item_features in zip(intakes, features)
+        ]
+        tiers = ["fast"] * len(intakes)
+        pending = [idx for idx, result in enumerate(results) if not self._settled(result[0])]
+        if not (self._ai_available() or self._ollama_available()):
+            for idx in pending:
+                tiers[idx] = "no_model"
+        ai_by_idx: Dict[int, Tuple[Optional[Dict], Optional[Dict]]] = {}
+        if pending and self._ai_available():
+            ai_results = self._ai_detection_batch([intakes[idx].text for idx in pending])
+            ai_by_idx = dict(zip(pending, ai_results))
+            for idx in pending:
+                results[idx] = self._score(intakes[idx], features[idx], *ai_by_idx[idx], None)
+                tiers[idx] = "ai_detector"
+            pending = [idx for idx in pending if not self._settled(results[idx][0])]
+        if self._ollama_available():
+            for idx in pending:
+                ai_result, model_family_result = ai_by_idx.get(idx, (None, None))
+                ollama_risk = self._ollama_risk_assessment(intakes[idx].text)
+                results[idx] = self._score(
+                    intakes[idx], features[idx], ai_result, model_family_result, ollama_risk
+                )
+                tiers[idx] = "ollama"
+        return [self._settle(tier, result) for tier, result in zip(tiers, results)]
 
+    def _score(
+        self,
+        intake: ContentIntake,
+        features: Dict[str, float],
+        ai_result: Optional[Dict],
+        model_family_result: Optional[Dict],
+        ollama_risk: Optional[float],
+    ) -> Tuple[float, str, DetectionBreakdown]:
         # 1. Base Stylometric Score
         stylometric_score = self._score_features(features)
 
@@ -108,7 +385,6 @@ class DetectorEngine:
         behavior_score = self._calculate_behavioral_risk(intake, features, heuristics)
 
         # 3. AI Detection (Hugging Face / Local Model)
-        ai_result, model_family_result = self._ai_detection(text)
         ai_score: Optional[float] = None
         model_family: Optional[str] = None
         model_family_confidence: Optional[float] = None
@@ -129,7 +405,6 @@ class DetectorEngine:
                 )
 
         # 4. Semantic Risk (Ollama)
-        ollama_risk = self._ollama_risk_assessment(text)
         if ollama_risk is not None:
             heuristics.append(
                 f"Ollama semantic analysis: {ollama_risk:.1%} risk "
@@ -167,78 +442,7 @@ class DetectorEngine:
         return composite, classification, breakdown
 
     def _extract_features(self, text: str) -> Dict[str, float]:
-        tokens = self._tokenize(text)
-        token_count = len(tokens) or 1
-
-        # Sentence segmentation (improved: handle abbreviations better)
-        sentences = re.split(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        sentence_lengths = [len(self._tokenize(s)) for s in sentences]
-        if not sentence_lengths:
-            sentence_lengths = [token_count]
-
-        # Basic Stats
-        avg_token_length = sum(len(t) for t in tokens) / token_count
-
-        # Enhanced Lexical Diversity: MATTR approximation (window=50, robust for short texts)
-        matt_r = self._calculate_mattr(tokens, window=50)
-
-        # Hapax Legomena (words appearing once)
-        counts = Counter(tokens)
-        hapax = sum(1 for _, count in counts.items() if count == 1)
-        hapax_ratio = hapax / token_count
-
-        # Variance statistics
-        try:
-            sentence_length_var = statistics.variance(sentence_lengths)
-        except statistics.StatisticsError:
-            sentence_length_var = 0.0
-
-        # Structural features
-        uppercase_tokens = sum(1 for t in tokens if t.isupper() and len(t) > 1)
-        function_words = sum(1 for t in tokens if t.lower() in self.FUNCTION_WORDS)
-
-        # Repetition Rate (N-gram redundancy)
-        trigrams = list(zip(tokens, tokens[1:], tokens[2:]))
-        if trigrams:
-            unique_trigrams = len(set(trigrams))
-            repetition_rate = 1.0 - (unique_trigrams / len(trigrams))
-        else:
-            repetition_rate = 0.0
-
-        # Character-level Shannon Entropy
-        char_counts = Counter(text)
-        char_probs = [count / len(text) for count in char_counts.values()] if text else []
-        char_entropy = -sum(p * math.log2(p) for p in char_probs) if char_probs else 0.0
-
-        # Readability Proxy (ARI Approximation)
-        char_count = sum(len(t) for t in tokens)
-        avg_chars_per_word = char_count / token_count
-        avg_words_per_sent = token_count / max(len(sentences), 1)
-        readability = (4.71 * avg_chars_per_word) + (0.5 * avg_words_per_sent) - 21.43
-
-        # Punctuation Variety (normalized diversity of ! ? . , ; : etc.)
-        punct_types = set(re.findall(r'[!?.;,:\-–—()"]', text))
-        punct_variety = len(punct_types) / 8.0  # Max 8 common types
-
-        # Vocabulary Richness (HHI proxy: sum (freq^2) normalized; lower = more uniform/AI)
-        freq_squares = sum((count / token_count) ** 2 for count in counts.values())
-        vocabulary_richness = 1.0 - freq_squares  # 1 - HHI, higher = richer
-
-        return {
-            "avg_token_length": avg_token_length,
-            "mattr": matt_r,
-            "hapax_ratio": hapax_ratio,
-            "sentence_length_var": sentence_length_var,
-            "burstiness": self._calculate_burstiness(sentence_lengths),
-            "function_word_ratio": function_words / token_count,
-            "uppercase_ratio": uppercase_tokens / token_count,
-            "repetition_rate": repetition_rate,
-            "entropy": char_entropy,
-            "readability_score": max(0, readability),
-            "punctuation_variety": punct_variety,
-            "vocabulary_richness": vocabulary_richness,
-        }
+        return self._stylometry.extract(text)
 
     def _score_features(self, features: Dict[str, float]) -> float:
         normalized = self._normalize_features(features)
@@ -318,13 +522,10 @@ class DetectorEngine:
                 boost += 0.15
 
         # 2. Urgency & Emotional Manipulation (Enhanced)
-        urgency_hits = sum(1 for word in self.URGENCY_WORDS if word in text_lower)
-        valence_hits = sum(
-            1
-            for group in self.HIGH_VALENCE_WORDS.values()
-            for word in group
-            if word in text_lower
-        )
+        lexicon = self._lexicons.get(intake.language.lower(), self._lexicons["default"])
+        hits = lexicon.counts(text_lower)
+        urgency_hits = hits.get("urgency", 0)
+        valence_hits = sum(count for category, count in hits.items() if category.startswith("valence_"))
         exclamations = text_lower.count("!") + text_lower.count("?")
 
         emotional_boost = min(
@@ -338,8 +539,8 @@ class DetectorEngine:
                 f"{valence_hits} valence words, and {exclamations} exclamations."
             )
 
-        # 3. Call To Action (CTA) Detection (Regex-enhanced)
-        cta_hits = sum(re.search(pattern, text_lower) is not None for pattern in self.CTA_PATTERNS)
+        # 3. Call To Action (CTA) Detection
+        cta_hits = hits.get("cta", 0)
         if cta_hits > 0:
             cta_boost = min(cta_hits * 0.1, 0.2)
             boost += cta_boost
@@ -354,20 +555,14 @@ class DetectorEngine:
             heuristics.append("Aggressive use of capitalization.")
 
         # 5. Narrative Alignment & Coherence (topic drift proxy)
-        sentences = re.split(r"[.!?]+", text_lower)
+        sentences = _CLAUSE_SPLIT.split(text_lower)
         sentences = [s.strip() for s in sentences if s.strip()]
         if len(sentences) > 3:
-            sent_keywords = [set(re.findall(r"\b[a-z]{4,}\b", s)) for s in sentences]
-
-            overlaps = 0.0
-            count_pairs = 0
-            for i, k1 in enumerate(sent_keywords):
-                for k2 in sent_keywords[i + 1 :]:
-                    if k1 or k2:
-                        overlaps += len(k1 & k2) / max(len(k1), len(k2) or 1)
-                        count_pairs += 1
-
-            coherence = overlaps / count_pairs if count_pairs else 1.0
+            sent_keywords = [set(_KEYWORD_PATTERN.findall(s)) for s in sentences]
+            if self.settings.coherence_method == "pairwise":
+                coherence = self._coherence_pairwise(sent_keywords)
+            else:
+                coherence = self._coherence_indexed(sent_keywords)
             if coherence < 0.35:
                 boost += 0.1
                 heuristics.append(
@@ -381,6 +576,43 @@ class DetectorEngine:
         max_boost = min(0.9, 0.55 + text_len / 900.0)
         return min(boost, max_boost)
 
+    @staticmethod
+    def _coherence_pairwise(sent_keywords: List[Set[str]]) -> float:
+        """Mean keyword overlap over all sentence pairs, O(S^2) set intersections."""
+        overlaps = 0.0
+        count_pairs = 0
+        for i, k1 in enumerate(sent_keywords):
+            for k2 in sent_keywords[i + 1 :]:
+                if k1 or k2:
+                    overlaps += len(k1 & k2) / max(len(k1), len(k2) or 1)
+                    count_pairs += 1
+
+        return overlaps / count_pairs if count_pairs else 1.0
+
+    @staticmethod
+    def _coherence_indexed(sent_keywords: List[Set[str]]) -> float:
+        """
+        Same value as _coherence_pairwise in O(S log S + total keywords).
+        Each shared keyword adds 1 / max(|k1|, |k2|) to its pair. Visiting
+        sentences smallest first, the current sentence is the larger of every
+        pair it forms with earlier ones, so a running keyword -> sentence count
+        gives all of its pair overlaps at once.
+        """
+        seen: Dict[str, int] = {}
+        overlaps = 0.0
+        for keywords in sorted(sent_keywords, key=len):
+            if not keywords:
+                continue
+            overlaps += sum(seen.get(word, 0) for word in keywords) / len(keywords)
+            for word in keywords:
+                seen[word] = seen.get(word, 0) + 1
+
+        total = len(sent_keywords)
+        empty = sum(1 for keywords in sent_keywords if not keywords)
+        # Pairs where both sentences have no keywords are skipped, as in the pairwise loop.
+        count_pairs = total * (total - 1) // 2 - empty * (empty - 1) // 2
+        return overlaps / count_pairs if count_pairs else 1.0
+
     def _normalize_features(self, features: Dict[str, float]) -> Dict[str, float]:
         """Normalize raw stats to 0-1 range for linear scoring. Use sigmoid for smoother bounds."""
 
@@ -472,44 +704,6 @@ class DetectorEngine:
 
         return max(0.0, min(1.0, composite))
 
-    @staticmethod
-    def _tokenize(text: str) -> List[str]:
-        # Improved tokenizer that handles contractions slightly better
-        return re.findall(r"\b[\w'-]+\b", text)
-
-    @staticmethod
-    def _calculate_burstiness(sentence_lengths: List[int]) -> float:
-        """
-        Calculates coefficient of variation of sentence lengths.
-        High variation = Human (Burstiness). Low variation = AI (Monotony).
-        """
-        if not sentence_lengths or len(sentence_lengths) < 2:
-            return 0.0
-        mean = statistics.mean(sentence_lengths)
-        stdev = statistics.stdev(sentence_lengths)
-        if mean == 0:
-            return 0.0
-        return min(stdev / mean, 1.0)
-
-    @staticmethod
-    def _calculate_mattr(tokens: List[str], window: int = 50) -> float:
-        """Approximate Moving-Average Type-Token Ratio (MATTR) for robust diversity."""
-        if len(tokens) < window:
-            return len(set(tokens)) / len(tokens) if tokens else 0.0
-
-        total_types = 0.0
-        num_windows = 0
-        step = max(window // 2, 1)
-
-        for i in range(0, len(tokens), step):  # Overlapping windows
-            window_tokens = tokens[i : i + window]
-            if window_tokens:
-                types = len(set(window_tokens))
-                total_types += types / len(window_tokens)
-                num_windows += 1
-
-        return total_types / num_windows if num_windows else 0.0
-
     @staticmethod
     def _sigmoid(x: float) -> float:
         return 1 / (1 + math.exp(-x))
@@ -527,7 +721,46 @@ class DetectorEngine:
     def _ai_detection(self, text: str) -> Tuple[Optional[Dict], Optional[Dict]]:
         if not getattr(self._ai_detector, "available", False):
             return None, None
-        return self._ai_detector.analyze_text(text)
+        cached = self._cached_ai_results([text])[0]
+        if cached is not None:
+            return cached
+        if self._batcher is not None:
+            result = self._batcher.analyze_text(text)
+        else:
+            result = self._ai_detector.analyze_text(text)
+        self._store_ai_results([text], [result])
+        return result
+
+    def _ai_detection_batch(self, texts: List[str]) -> List[Tuple[Optional[Dict], Optional[Dict]]]:
+        if not getattr(self._ai_detector, "available", False):
+            return [(None, None)] * len(texts)
+        results = self._cached_ai_results(texts)
+        misses = [idx for idx, result in enumerate(results) if result is None]
+        if misses:
+            miss_texts = [texts[idx] for idx in misses]
+            computed = self._ai_detector.analyze_batch(miss_texts)
+            for idx, result in zip(misses, computed):
+                results[idx] = result
+            self._store_ai_results(miss_texts, computed)
+        return results
+
+    def _cached_ai_results(self, texts: List[str]) -> List[Optional[Tuple[Optional[Dict], Optional[Dict]]]]:
+        if self._result_cache is None:
+            return [None] * len(texts)
+        entries = self._result_cache.get_many("ai_detector", self._ai_detector.model_identity, texts)
+        return [tuple(entry) if entry is not None else None for entry in entries]
+
+    def _store_ai_results(
+        self, texts: List[str], results: List[Tuple[Optional[Dict], Optional[Dict]]]
+    ) -> None:
+        if self._result_cache is None:
+            return
+        self._result_cache.set_many(
+            "ai_detector",
+            self._ai_detector.model_identity,
+            texts,
+            [list(result) if result[0] is not None else None for result in results],
+        )
 
     def _ollama_risk_assessment(self, text: str) -> Optional[float]:
         """
@@ -536,8 +769,29 @@ class DetectorEngine:
         """
         if self._ollama_client is None:
             return None
+        cache = self._result_cache if self._ollama_client.available else None
+        if cache is not None:
+            cached = cache.get("ollama", self._ollama_client.model_identity, text)
+            if cached is not None:
+                return cached
         try:
-            return self._ollama_client.risk_assessment(text)
+            risk = self._ollama_client.risk_assessment(text)
         except Exception as e:
             logger.warning(f"Ollama risk assessment failed: {e}")
             return None
+        if cache is not None:
+            cache.set("ollama", self._ollama_client.model_identity, text, risk)
+        return risk
+
+    async def _ollama_risk_assessment_async(self, text: str) -> Optional[float]:
+        """_ollama_risk_assessment through the pooled AsyncOllamaClient."""
+        cache = self._result_cache
+        model_id = self._async_ollama.model_identity
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, "ollama", model_id, text)  # SQLite: off the loop
+            if cached is not None:
+                return cached
+        risk = await self._async_ollama.risk_assessment(text)
+        if cache is not None:
+            await asyncio.to_thread(cache.set, "ollama", model_id, text, risk)
+        return risk
@@ -0,0 +1,331 @@
+"""
+Graph neural scorer for the threat graph.
+
+A simplified GCN (SGC/SIGN style): node features are propagated over the
+symmetrically normalised adjacency with self-loops,
+
+    A_hat = D^-1/2 (A + I) D^-1/2,   h_0 = X,   h_k = A_hat h_(k-1),
+
+and a learned linear head over [h_0 | h_1 | h_2] gives each node's risk
+logit. Propagation has no parameters, so the engine keeps h_k per node and
+refreshes only the k-hop neighbourhood of nodes whose features or degree
+changed (`IncrementalGCN`); training runs offline over exported snapshots
+with the torch reference forward (`GCNScorer`).
+
+Usage:
+    python -m app.models.gnn export --out snapshot.json [--labels labels.json]
+    python -m app.models.gnn train snapshot.json ... --out weights.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+try:  # pragma: no cover - torch is only needed for the reference forward and training
+    import torch
+except Exception:  # noqa: BLE001
+    torch = None  # type: ignore
+
+from .compact_graph import ACTOR, CONTENT, NARRATIVE, REGION, CompactGraph
+
+HOPS = 2
+FEATURES = ("is_actor", "is_content", "is_narrative", "is_region", "risk_prior")
+_CLASS_SCORES = {"high-risk": 0.9, "medium-risk": 0.6, "low-risk": 0.2}
+# Default labels for exported snapshots when no analyst labels are given.
+_CLASS_LABELS = {"high-risk": 1.0, "low-risk": 0.0}
+
+
+def node_features(graph: CompactGraph, slots: np.ndarray) -> np.ndarray:
+    """[is_actor, is_content, is_narrative, is_region, risk prior] per slot, float32."""
+    types = graph.types[slots]
+    # Classification codes index this table; -1 (none, e.g. actors) hits the trailing 0.4.
+    class_table = np.array([_CLASS_SCORES.get(value, 0.4) for value in graph.classifications.values] + [0.4])
+    class_score = class_table[graph.classification[slots]]
+    platform_density = np.where(types == ACTOR, np.minimum(1.0, graph.platform_counts(slots) / 3), 0.0)
+    prior = np.minimum(1.0, 0.7 * graph.score[slots] + 0.3 * class_score + 0.2 * platform_density)
+    features = np.stack([types == ACTOR, types == CONTENT, types == NARRATIVE, types == REGION, prior], axis=1)
+    return features.astype(np.float32)
+
+
+@dataclass
+class GNNWeights:
+    """Linear head over the HOPS + 1 propagated feature blocks."""
+
+    weights: np.ndarray  # (HOPS + 1, len(FEATURES)) float32
+    bias: float
+
+    @classmethod
+    def prior(cls) -> "GNNWeights":
+        """Hand-set starting point: own features, then neighbours, then half-weighted context."""
+        neighbour = [0.2, 0.6, 0.2, 0.2, 0.8]
+        weights = [[0.4, 0.9, 0.3, 0.2, 1.1], neighbour, [0.5 * value for value in neighbour]]
+        return cls(np.asarray(weights, dtype=np.float32), 0.05)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "GNNWeights":
+        if not path:
+            return cls.prior()
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        weights = np.asarray(payload["weights"], dtype=np.float32)
+        if weights.shape != (HOPS + 1, len(FEATURES)):
+            raise ValueError(f"{path}: expected {HOPS + 1}x{len(FEATURES)} weights, got {weights.shape}")
+        return cls(weights, float(payload["bias"]))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"features": FEATURES, "hops": HOPS, "weights": self.weights.tolist(), "bias": self.bias}, handle)
+
+
+class IncrementalGCN:
+    """
+    Per-slot cache of the propagated features h_0..h_HOPS and the scores.
+
+    Callers `mark` slots whose features or degree changed; `refresh` then
+    recomputes h_k for the k-hop neighbourhood of those slots only. Every
+    node is aggregated the same way (self first, then neighbours in
+    adjacency order), so a partial refresh gives bit-identical results to
+    a full one.
+    """
+
+    def __init__(self, weights: Optional[GNNWeights] = None) -> None:
+        weights = weights or GNNWeights.prior()
+        self._weights = weights.weights.reshape(-1)
+        self._bias = np.float32(weights.bias)
+        self._capacity = 0
+        self.norm = np.zeros(0, dtype=np.float32)  # (degree + 1) ** -0.5
+        self.hops = [np.zeros((0, len(FEATURES)), dtype=np.float32) for _ in range(HOPS + 1)]
+        self.score = np.zeros(0, dtype=np.float32)
+        self._pending: Set[int] = set()
+
+    def mark(self, *slots: int) -> None:
+        self._pending.update(slots)
+
+    def scores(self, slots) -> np.ndarray:
+        return self.score[slots]
+
+    def refresh(self, graph: CompactGraph, full: bool = False) -> int:
+        """Bring scores up to date with the graph; returns how many nodes were rescored."""
+        self._grow(len(graph.types))
+        if full:
+            changed = set(graph.slots())
+        else:
+            changed = {slot for slot in self._pending if graph.is_live(slot)}
+        self._pending.clear()
+        if not changed:
+            return 0
+        targets = np.fromiter(sorted(changed), dtype=np.int64, count=len(changed))
+        cols, counts = self._gather(graph, targets)
+        self.norm[targets] = 1.0 / np.sqrt(counts.astype(np.float32))  # counts include the self-loop
+        self.hops[0][targets] = node_features(graph, targets)
+        frontier = changed
+        for hop in range(1, HOPS + 1):
+            if not full:  # a full refresh already covers every node
+                frontier = frontier.union(*(graph.adj[slot] for slot in frontier))
+                targets = np.fromiter(sorted(frontier), dtype=np.int64, count=len(frontier))
+                cols, counts = self._gather(graph, targets)
+            self.hops[hop][targets] = self._propagate(targets, cols, counts, self.hops[hop - 1])
+        stacked = np.concatenate([self.hops[hop][targets] for hop in range(HOPS + 1)], axis=1)
+        logits = (stacked * self._weights).sum(axis=1) + self._bias
+        self.score[targets] = 1.0 / (1.0 + np.exp(-logits))
+        return len(targets)
+
+    @staticmethod
+    def _gather(graph: CompactGraph, targets: np.ndarray):
+        """Flattened rows of A + I for `targets`: self first, then neighbours in adjacency order."""
+        rows = [graph.adj[slot] for slot in targets.tolist()]
+        counts = np.fromiter((len(row) + 1 for row in rows), dtype=np.int64, count=len(rows))
+        cols = np.fromiter(
+            chain.from_iterable(chain((slot,), row) for slot, row in zip(targets.tolist(), rows)),
+            dtype=np.int64,
+            count=int(counts.sum()),
+        )
+        return cols, counts
+
+    def _propagate(self, targets: np.ndarray, cols: np.ndarray, counts: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Rows of A_hat @ values for `targets`."""
+        starts = np.zeros(len(targets), dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        weighted = values[cols] * self.norm[cols, None]
+        return np.add.reduceat(weighted, starts, axis=0) * self.norm[targets, None]
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self._capacity
+        if extra <= 0:
+            return
+        self.norm = np.concatenate([self.norm, np.zeros(extra, dtype=np.float32)])
+        self.hops = [np.concatenate([block, np.zeros((extra, len(FEATURES)), dtype=np.float32)]) for block in self.hops]
+        self.score = np.concatenate([self.score, np.zeros(extra, dtype=np.float32)])
+        self._capacity = capacity
+
+
+# --- reference forward and offline training (torch) --------------------------
+
+
+def normalized_adjacency(rows, cols, size: int, sparse: bool = True):
+    """A_hat as a torch tensor: CSR when `sparse`, else dense (O(N^2) memory)."""
+    rows = torch.as_tensor(np.concatenate([np.asarray(rows, dtype=np.int64), np.arange(size)]))
+    cols = torch.as_tensor(np.concatenate([np.asarray(cols, dtype=np.int64), np.arange(size)]))
+    degrees = torch.bincount(rows, minlength=size).to(torch.float32)  # includes the self-loop
+    norm = degrees.rsqrt()
+    values = norm[rows] * norm[cols]
+    if not sparse:
+        adjacency = torch.zeros((size, size), dtype=torch.float32)
+        adjacency[rows, cols] = values
+        return adjacency
+    return torch.sparse_coo_tensor(torch.stack([rows, cols]), values, (size, size)).coalesce().to_sparse_csr()
+
+
+class GCNScorer:
+    """Torch version of the scorer: full-graph forward with trainable head weights."""
+
+    def __init__(self, weights: Optional[GNNWeights] = None) -> None:
+        if torch is None:  # pragma: no cover
+            raise RuntimeError("torch is required for GCNScorer")
+        weights = weights or GNNWeights.prior()
+        self.weight = torch.tensor(weights.weights.reshape(-1), requires_grad=True)
+        self.bias = torch.tensor(weights.bias, dtype=torch.float32, requires_grad=True)
+
+    def parameters(self) -> List:
+        return [self.weight, self.bias]
+
+    def logits(self, features, adjacency):
+        blocks = [features]
+        for _ in range(HOPS):
+            blocks.append(adjacency @ blocks[-1])
+        return torch.cat(blocks, dim=1) @ self.weight + self.bias
+
+    def forward(self, features, adjacency):
+        return torch.sigmoid(self.logits(features, adjacency))
+
+    def to_weights(self) -> GNNWeights:
+        weights = self.weight.detach().numpy().reshape(HOPS + 1, len(FEATURES)).copy()
+        return GNNWeights(weights, float(self.bias.detach()))
+
+
+def export_snapshot(graph: CompactGraph, labels: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    JSON-ready training snapshot of the live graph: node ids, features, each
+    edge once, and 0/1 labels. Content labels default to its classification
+    (high-risk 1, low-risk 0); `labels` (node id -> label) takes precedence.
+    """
+    slots = graph.slots()
+    position = {slot: idx for idx, slot in enumerate(slots)}
+    names = [graph.names[slot] for slot in slots]
+    edges = [
+        [position[slot], position[peer]]
+        for slot in slots
+        for peer in graph.adj[slot]
+        if position[slot] < position[peer]
+    ]
+    merged = {
+        graph.names[slot]: _CLASS_LABELS[value]
+        for slot in slots
+        if graph.types[slot] == CONTENT
+        and (value := graph.classifications.value(int(graph.classification[slot]))) in _CLASS_LABELS
+    }
+    known = set(names)
+    merged.update({node: float(label) for node, label in (labels or {}).items() if node in known})
+    return {
+        "nodes": names,
+        "features": node_features(graph, np.asarray(slots, dtype=np.int64)).tolist(),
+        "edges": edges,
+        "labels": merged,
+    }
+
+
+def train(
+    snapshots: Iterable[Dict],
+    epochs: int = 200,
+    learning_rate: float = 0.05,
+    initial: Optional[GNNWeights] = None,
+    sparse_threshold: int = 500,
+) -> GNNWeights:
+    """Fit the head with binary cross-entropy on the labelled nodes of each snapshot."""
+    if torch is None:  # pragma: no cover
+        raise RuntimeError("torch is required for training")
+    batches = []
+    for snapshot in snapshots:
+        index = {node: idx for idx, node in enumerate(snapshot["nodes"])}
+        labelled = [(index[node], label) for node, label in snapshot["labels"].items() if node in index]
+        if not labelled:
+            continue
+        size = len(snapshot["nodes"])
+        edges = np.asarray(snapshot["edges"], dtype=np.int64).reshape(-1, 2)
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+        batches.append(
+            (
+                torch.tensor(snapshot["features"], dtype=torch.float32).reshape(size, len(FEATURES)),
+                normalized_adjacency(rows, cols, size, sparse=size > sparse_threshold),
+                torch.tensor([idx for idx, _ in labelled]),
+                torch.tensor([label for _, label in labelled], dtype=torch.float32),
+            )
+        )
+    if not batches:
+        raise ValueError("no labelled nodes in the given snapshots")
+
+    scorer = GCNScorer(initial)
+    optimiser = torch.optim.Adam(scorer.parameters(), lr=learning_rate)
+    loss_fn = torch.nn.BCEWithLogitsLoss()
+    for _ in range(epochs):
+        for features, adjacency, index, target in batches:
+            optimiser.zero_grad()
+            loss = loss_fn(scorer.logits(features, adjacency)[index], target)
+            loss.backward()
+            optimiser.step()
+    return scorer.to_weights()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="snapshot the configured graph store's hot window")
+    export.add_argument("--out", required=True)
+    export.add_argument("--labels", help="JSON object of node id -> 0/1 analyst labels")
+    fit = commands.add_parser("train", help="fit scorer weights (GRAPH_GNN_WEIGHTS) on snapshots")
+    fit.add_argument("snapshots", nargs="+")
+    fit.add_argument("--out", required=True)
+    fit.add_argument("--epochs", type=int, default=200)
+    fit.add_argument("--lr", type=float, default=0.05)
+    fit.add_argument("--init", help="start from these weights instead of the hand-set prior")
+    args = parser.parse_args()
+
+    from ..config import get_settings
+
+    if args.command == "export":
+        from .graph_intel import GraphIntelEngine
+
+        labels = None
+        if args.labels:
+            with open(args.labels, "r", encoding="utf-8") as handle:
+                labels = json.load(handle)
+        engine = GraphIntelEngine()
+        engine.summary()  # loads the hot window and catches up with the event log
+        with open(args.out, "w", encoding="utf-8") as handle:
+            json.dump(export_snapshot(engine.compact, labels), handle)
+        print(f"exported {len(engine.compact)} nodes to {args.out}")
+        return
+
+    snapshots = []
+    for path in args.snapshots:
+        with open(path, "r", encoding="utf-8") as handle:
+            snapshots.append(json.load(handle))
+    weights = train(
+        snapshots,
+        epochs=args.epochs,
+        learning_rate=args.lr,
+        initial=GNNWeights.load(args.init),
+        sparse_threshold=get_settings().graph_sparse_threshold,
+    )
+    weights.save(args.out)
+    print(f"saved weights to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,17 @@ from __future__ import annotations
 
 import hashlib
 import json
-from datetime import datetime
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Dict, List, Optional, Set, Tuple
 
 import networkx as nx
+import numpy as np
 
-try:  # pragma: no cover - torch is optional during docs build
-    import torch
-except Exception:  # noqa: BLE001
-    torch = None  # type: ignore
-
+from ..config import get_settings
 from ..schemas import (
     CommunitySnapshot,
     ContentIntake,
@@ -22,19 +23,98 @@ from ..schemas import (
     SIEMCorrelationPayload,
     ThreatIntelFeed,
 )
+from ..storage.graph_store import GraphStore, create_graph_store
+from .compact_graph import (
+    ACTOR,
+    CONTENT,
+    NARRATIVE,
+    NEAR_DUPLICATE,
+    ORIGIN,
+    PUBLISHED,
+    REGION,
+    TARGETS,
+    CompactGraph,
+    to_micros,
+)
+from .gnn import GNNWeights, IncrementalGCN
+from .graph_kernel import GraphCSR
+
+_MICROS_PER_DAY = 86_400_000_000
+_COMPACT_EVERY = 1000  # graph_events rows appended between log compactions
+
+
+@dataclass
+class _ComponentSections:
+    """Summary fragments for one connected component, cached between ingests."""
+
+    order: int
+    community: Optional[CommunitySnapshot] = None
+    cluster: Optional[Tuple[float, List[str], List[str], List[str]]] = None
+    actor_risk: List[Tuple[int, str, float]] = field(default_factory=list)
+    # CoordinationAlert fields; only the top alerts are validated into models.
+    alerts: List[Tuple[int, Dict]] = field(default_factory=list)
+    chains: List[Tuple[int, List[PropagationChain]]] = field(default_factory=list)
+
+
+@dataclass
+class _NodeLabels:
+    """Display values resolved once per analytics pass, keyed by CSR index."""
+
+    platforms: Dict[int, str] = field(default_factory=dict)  # content
+    tags: Dict[int, str] = field(default_factory=dict)  # narratives
+
+
+@dataclass
+class _GraphSnapshot:
+    """Read models derived from one graph generation; feeds are built on first read."""
+
+    generation: int
+    summary: GraphSummary
+    threat_intel: Optional[ThreatIntelFeed] = None
+    siem: Optional[SIEMCorrelationPayload] = None
 
 
 class GraphIntelEngine:
-    def __init__(self) -> None:
-        self.graph = nx.Graph()
-        if torch:
-            self._feature_weights = torch.tensor([0.4, 0.9, 0.3, 0.2, 1.1], dtype=torch.float32)
-            self._neighbor_weights = torch.tensor([0.2, 0.6, 0.2, 0.2, 0.8], dtype=torch.float32)
-            self._gnn_bias = torch.tensor(0.05, dtype=torch.float32)
-        else:  # pragma: no cover - fallback when torch missing
-            self._feature_weights = None
-            self._neighbor_weights = None
-            self._gnn_bias = None
+    def __init__(
+        self,
+        incremental: Optional[bool] = None,
+        store: Optional[GraphStore] = None,
+    ) -> None:
+        settings = get_settings()
+        self.incremental = (
+            settings.graph_incremental_summary if incremental is None else incremental
+        )
+        # Node storage: interned ids, typed columns and actor score rings
+        # (compact_graph.py). `graph` exposes a networkx copy for compatibility.
+        self.compact = CompactGraph()
+        self._graph_view: Optional[Tuple[int, nx.Graph]] = None
+        # Persistence and the hot in-memory window (LRU over content nodes).
+        self.store = store if store is not None else create_graph_store(settings)
+        self._max_content_nodes = settings.graph_max_content_nodes
+        self._window_days = settings.graph_window_days
+        self._content_lru: "OrderedDict[int, int]" = OrderedDict()  # content slot -> ts (epoch us)
+        self._latest_ts = 0
+        self._event_cursor = 0
+        self._loaded = False
+        # Serialises ingest, catch-up and reads: the pipeline ingests from
+        # threadpool threads while read endpoints sync with the log.
+        self._lock = threading.RLock()
+        # Bumped by every applied event; read endpoints reuse the snapshot
+        # built for the current generation instead of re-summarising.
+        self._generation = 0
+        self._snapshot: Optional[_GraphSnapshot] = None
+        # Insertion rank of every node (CompactGraph.seq); keeps member lists
+        # and tie-breaks deterministic across both paths.
+        self._seq = count()
+        # Incremental bookkeeping: CompactGraph.component labels every slot;
+        # component id -> member slots.
+        self._components: Dict[int, Set[int]] = {}
+        self._component_ids = count()
+        self._component_cache: Dict[int, _ComponentSections] = {}
+        self._dirty_components: Set[int] = set()
+        # GCN scores cached per slot; only the k-hop neighbourhood of nodes
+        # whose features or degree changed is rescored (gnn.py).
+        self._gnn = IncrementalGCN(GNNWeights.load(settings.graph_gnn_weights))
 
     def ingest(
         self,
@@ -42,59 +122,256 @@ class GraphIntelEngine:
         intake: ContentIntake,
         classification: str,
         composite_score: float,
+        near_duplicates: Optional[List[str]] = None,
+    ) -> GraphSummary:
+        return self.ingest_batch(
+            [(intake_id, intake, classification, composite_score)],
+            [near_duplicates or []],
+        )
+
+    def ingest_batch(
+        self,
+        items: List[Tuple[str, ContentIntake, str, float]],
+        near_duplicates: Optional[List[List[str]]] = None,
     ) -> GraphSummary:
+        """
+        Ingest several scored intakes, persisting them together and summarising once.
+        `near_duplicates[i]` lists earlier intake ids whose text item i copies;
+        each still in the graph gets a content-content "near_duplicate" edge.
+        """
+        near_duplicates = near_duplicates or [[] for _ in items]
+        events = [self._build_event(*item, duplicates) for item, duplicates in zip(items, near_duplicates)]
+        with self._lock:
+            self._ensure_loaded()
+            event_ids = self.store.append_many(events)
+            # Apply intakes other workers persisted since our last sync first, so
+            # every process replays the log in the same order.
+            self._catch_up(before_id=event_ids[0])
+            for event_id, event in zip(event_ids, events):
+                self._apply_logged(event_id, event)
+            self._compact_log(event_ids)
+            return self._current_snapshot().summary
+
+    def _build_event(
+        self,
+        intake_id: str,
+        intake: ContentIntake,
+        classification: str,
+        composite_score: float,
+        near_duplicates: Optional[List[str]] = None,
+    ) -> Dict:
         platform = "unknown"
         if intake.metadata and intake.metadata.platform:
             platform = intake.metadata.platform
 
-        content_node = f"content::{intake_id}"
-        self.graph.add_node(
-            content_node,
-            type="content",
-            score=composite_score,
-            classification=classification,
-            ts=datetime.utcnow().isoformat(),
-            platform=platform,
-            source=intake.source,
-        )
-
+        # Anonymous actors are keyed by a stable digest so every worker (and
+        # every restart) maps the same source onto the same node.
         actor_id = (
             intake.metadata.actor_id
             if intake.metadata and intake.metadata.actor_id
-            else f"actor::anon::{hash(intake.source) % 10000}"
+            else f"actor::anon::{int(hashlib.sha1(intake.source.encode('utf-8')).hexdigest(), 16) % 10000}"
         )
-        self.graph.add_node(actor_id, type="actor")
-        actor_record = self.graph.nodes[actor_id]
-        history = actor_record.get("score_history", [])
-        history.append(composite_score)
-        actor_record["score_history"] = history[-20:]
-        actor_record["avg_score"] = sum(actor_record["score_history"]) / len(actor_record["score_history"])
-        platforms = set(actor_record.get("platforms", []))
-        if platform:
-            platforms.add(platform)
-        actor_record["platforms"] = sorted(platforms)
-        actor_record["last_seen"] = datetime.utcnow().isoformat()
-
-        self.graph.add_edge(actor_id, content_node, relation="published")
-
-        if intake.tags:
-            for tag in intake.tags:
-                tag_node = f"narrative::{tag}"
-                self.graph.add_node(tag_node, type="narrative", tag=tag)
-                self.graph.add_edge(content_node, tag_node, relation="targets")
-
-        if intake.metadata and intake.metadata.region:
-            region_node = f"region::{intake.metadata.region}"
-            self.graph.add_node(region_node, type="region")
-            self.graph.add_edge(actor_id, region_node, relation="origin")
+        return {
+            "intake_id": intake_id,
+            "actor_id": actor_id,
+            "score": composite_score,
+            "classification": classification,
+            "ts": datetime.utcnow().isoformat(),
+            "platform": platform,
+            "source": intake.source,
+            "tags": list(intake.tags or []),
+            "region": intake.metadata.region if intake.metadata else None,
+            "near_duplicates": list(near_duplicates or []),
+        }
 
-        return self._summarise()
+    @property
+    def graph(self) -> nx.Graph:
+        """networkx copy of the hot window for compatibility, rebuilt once per generation."""
+        if self._graph_view is None or self._graph_view[0] != self._generation:
+            self._graph_view = (self._generation, self.compact.to_networkx())
+        return self._graph_view[1]
+
+    def _apply_event(self, event: Dict) -> None:
+        self._generation += 1
+        graph = self.compact
+        composite_score = event["score"]
+        platform = event["platform"]
+        ts = to_micros(event["ts"])
+        content = self._add_node(f"content::{event['intake_id']}", CONTENT)
+        graph.set_content(content, composite_score, event["classification"], ts, platform, event["source"])
+
+        actor = self._add_node(event["actor_id"], ACTOR)
+        graph.record_actor_score(actor, composite_score, platform, ts)
+        self._gnn.mark(content, actor)
+
+        if not graph.has_edge(actor, content):
+            graph.content_total[actor] += composite_score
+            graph.content_count[actor] += 1
+        self._add_edge(actor, content, PUBLISHED)
+
+        for tag in event["tags"]:
+            self._add_edge(content, self._add_node(f"narrative::{tag}", NARRATIVE), TARGETS)
+
+        if event["region"]:
+            self._add_edge(actor, self._add_node(f"region::{event['region']}", REGION), ORIGIN)
+
+        for peer in event.get("near_duplicates", ()):
+            peer_slot = graph.id_of(f"content::{peer}")
+            if peer_slot is not None:  # evicted copies are not linked
+                self._add_edge(content, peer_slot, NEAR_DUPLICATE)
+
+        self._dirty_components.add(int(graph.component[content]))
+        self._touch_content(content, ts)
+
+    def _ensure_loaded(self) -> None:
+        """Lazily replay the hot window from the store on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        since = (datetime.utcnow() - timedelta(days=self._window_days)).isoformat()
+        for event_id, event in self.store.recent_events(self._max_content_nodes, since):
+            self._apply_logged(event_id, event)
+        if self._event_cursor == 0:
+            # Nothing inside the window: skip older history entirely.
+            self._event_cursor = self.store.last_event_id()
+
+    def _catch_up(self, before_id: Optional[int] = None) -> None:
+        for event_id, event in self.store.events_between(self._event_cursor, before_id):
+            self._apply_logged(event_id, event)
+
+    def _apply_logged(self, event_id: int, event: Dict) -> None:
+        """Apply a logged event once; ids at or below the cursor are already in the graph."""
+        if event_id <= self._event_cursor:
+            return
+        self._apply_event(event)
+        self._event_cursor = event_id
+
+    def _compact_log(self, event_ids: List[int]) -> None:
+        """Every _COMPACT_EVERY events, drop log rows no replay can reach (outside the window)."""
+        if event_ids[-1] // _COMPACT_EVERY == (event_ids[0] - 1) // _COMPACT_EVERY:
+            return
+        since = (datetime.utcnow() - timedelta(days=self._window_days)).isoformat()
+        self.store.prune(since, keep_last=self._max_content_nodes)
+
+    def _touch_content(self, content: int, ts: int) -> None:
+        """Mark a content node hot and evict cold ones beyond the window."""
+        self._content_lru[content] = ts
+        self._content_lru.move_to_end(content)
+        self._latest_ts = max(self._latest_ts, ts)
+        cutoff = self._latest_ts - self._window_days * _MICROS_PER_DAY
+        while self._content_lru:
+            oldest, touched = next(iter(self._content_lru.items()))
+            if len(self._content_lru) <= self._max_content_nodes and touched >= cutoff:
+                break
+            self._evict_content(oldest)
+
+    def _evict_content(self, content: int) -> None:
+        """Drop a content node plus any actor/narrative/region left without content."""
+        self._content_lru.pop(content, None)
+        graph = self.compact
+        if not graph.is_live(content):
+            return
+        component_id = int(graph.component[content])
+        neighbors = list(graph.neighbors(content))
+        self._drop_node(content)
+        for neighbor in neighbors:
+            if not graph.is_live(neighbor):
+                continue
+            if graph.types[neighbor] == ACTOR:
+                self._refresh_actor_stats(neighbor)
+                if graph.content_count[neighbor] == 0:
+                    linked = list(graph.neighbors(neighbor))
+                    self._drop_node(neighbor)
+                    for node in linked:
+                        if graph.degree(node) == 0:
+                            self._drop_node(node)
+            elif graph.degree(neighbor) == 0:
+                self._drop_node(neighbor)
+        self._split_component(component_id)
+
+    def _drop_node(self, slot: int) -> None:
+        graph = self.compact
+        self._gnn.mark(*graph.neighbors(slot))
+        self._components[int(graph.component[slot])].discard(slot)
+        self._content_lru.pop(slot, None)
+        graph.remove_node(slot)
+
+    def _refresh_actor_stats(self, actor: int) -> None:
+        """Re-derive actor aggregates from the content still inside the window."""
+        graph = self.compact
+        content = [slot for slot in graph.neighbors(actor) if graph.types[slot] == CONTENT]
+        scores = [float(graph.score[slot]) for slot in content]
+        graph.content_total[actor] = sum(scores)
+        graph.content_count[actor] = len(scores)
+        if not content:
+            return
+        platforms = {int(graph.platform[slot]) for slot in content}
+        graph.reset_actor(actor, scores, [code for code in platforms if graph.platforms.value(code)])
+        self._gnn.mark(actor)
+
+    def _split_component(self, component_id: int) -> None:
+        """Re-derive connectivity for a component that lost nodes."""
+        remaining = self._components.pop(component_id)
+        self._component_cache.pop(component_id, None)
+        self._dirty_components.discard(component_id)
+        while remaining:
+            start = remaining.pop()
+            members = self.compact.connected_component(start)
+            remaining -= members
+            new_id = next(self._component_ids)
+            self._components[new_id] = members
+            self.compact.component[list(members)] = new_id
+            self._dirty_components.add(new_id)
 
     def summary(self) -> GraphSummary:
+        return self.snapshot().summary
+
+    def snapshot(self) -> _GraphSnapshot:
+        """Sync with the event log, then return the snapshot for the current generation."""
+        with self._lock:
+            self._ensure_loaded()
+            self._catch_up()
+            return self._current_snapshot()
+
+    def etag(self, scope: str = "graph") -> str:
+        """
+        Validator for the graph read models. Built from the event-log cursor
+        rather than the local generation, so every worker replaying the same
+        log hands out the same tag.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._catch_up()
+            return f'W/"{scope}-{self._event_cursor}"'
+
+    def _current_snapshot(self) -> _GraphSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.generation != self._generation:
+            snapshot = _GraphSnapshot(self._generation, self._current_summary())
+            self._snapshot = snapshot
+        return snapshot
+
+    def _current_summary(self) -> GraphSummary:
+        if self.incremental:
+            return self._summarise_incremental()
         return self._summarise()
 
     def threat_intel_feed(self) -> ThreatIntelFeed:
-        summary = self._summarise()
+        with self._lock:
+            snapshot = self.snapshot()
+            if snapshot.threat_intel is None:
+                snapshot.threat_intel = self._build_threat_intel_feed(snapshot.summary)
+            return snapshot.threat_intel
+
+    def siem_payload(self) -> SIEMCorrelationPayload:
+        with self._lock:
+            snapshot = self.snapshot()
+            if snapshot.siem is None:
+                snapshot.siem = self._build_siem_payload(snapshot.summary)
+            return snapshot.siem
+
+    @staticmethod
+    def _build_threat_intel_feed(summary: GraphSummary) -> ThreatIntelFeed:
         indicator_pool = set(summary.high_risk_actors)
         for cluster in summary.gnn_clusters:
             indicator_pool.update(cluster.actors)
@@ -113,8 +390,8 @@ class GraphIntelEngine:
             dataset_fingerprint=payload_fingerprint,
         )
 
-    def siem_payload(self) -> SIEMCorrelationPayload:
-        summary = self._summarise()
+    @staticmethod
+    def _build_siem_payload(summary: GraphSummary) -> SIEMCorrelationPayload:
         correlation_keys = sorted(
             {
                 *(cluster.cluster_id for cluster in summary.gnn_clusters),
@@ -130,249 +407,248 @@ class GraphIntelEngine:
         )
 
     def _summarise(self) -> GraphSummary:
-        node_count = self.graph.number_of_nodes()
-        edge_count = self.graph.number_of_edges()
-        gnn_projection = self._gnn_projection()
-        high_risk = self._top_risk_actors(gnn_projection)
-        communities = self._communities_snapshot(gnn_projection)
-        gnn_clusters = self._gnn_clusters(gnn_projection)
-        coordination_alerts = self._coordination_alerts(gnn_projection)
-        propagation = self._propagation_chains(gnn_projection)
+        """Full rebuild: rescore every node, then one analytics pass over every component."""
+        self._gnn.refresh(self.compact, full=True)
+        slots = self.compact.slots()
+        sections = self._analyse(slots) if slots else {}
+        return self._assemble(sections.values())
 
-        return GraphSummary(
-            node_count=node_count,
-            edge_count=edge_count,
-            high_risk_actors=high_risk,
-            communities=communities,
-            gnn_clusters=gnn_clusters,
-            coordination_alerts=coordination_alerts,
-            propagation_chains=propagation,
-        )
+    def _summarise_incremental(self) -> GraphSummary:
+        """Recompute only dirty components, then assemble cached sections.
 
-    def _gnn_projection(self) -> Dict[str, List[float]]:
-        if not torch or self.graph.number_of_nodes() == 0:
-            return {}
-        nodes = list(self.graph.nodes())
-        feature_matrix = self._build_feature_matrix(nodes)
-        adjacency = self._build_adjacency(nodes)
-        degrees = adjacency.sum(dim=1, keepdim=True).clamp(min=1.0)
-        neighbor_features = adjacency @ feature_matrix / degrees
-        base_scores = (feature_matrix * self._feature_weights).sum(dim=1)
-        neighbor_effect = (neighbor_features * self._neighbor_weights).sum(dim=1)
-        context_features = adjacency @ neighbor_features / degrees
-        context_effect = 0.5 * (context_features * self._neighbor_weights).sum(dim=1)
-        logits = base_scores + neighbor_effect + context_effect + self._gnn_bias
-        scores = torch.sigmoid(logits).tolist()
-        return {"nodes": nodes, "scores": scores}
-
-    def _build_feature_matrix(self, nodes: List[str]):
-        rows: List[List[float]] = []
-        for node in nodes:
-            data = self.graph.nodes[node]
-            node_type = data.get("type", "content")
-            score = float(data.get("score", data.get("avg_score", 0.0)))
-            classification = data.get("classification")
-            class_score = {
-                "high-risk": 0.9,
-                "medium-risk": 0.6,
-                "low-risk": 0.2,
-            }.get(classification, 0.4)
-            platform_density = min(1.0, len(data.get("platforms", [])) / 3) if node_type == "actor" else 0.0
-            region_flag = 1.0 if node_type == "region" else 0.0
-            rows.append(
-                [
-                    1.0 if node_type == "actor" else 0.0,
-                    1.0 if node_type == "content" else 0.0,
-                    1.0 if node_type == "narrative" else 0.0,
-                    region_flag,
-                    min(1.0, 0.7 * score + 0.3 * class_score + 0.2 * platform_density),
-                ]
-            )
-        return torch.tensor(rows, dtype=torch.float32)
-
-    def _build_adjacency(self, nodes: List[str]):
-        adjacency = torch.zeros((len(nodes), len(nodes)), dtype=torch.float32)
-        index_lookup = {node: idx for idx, node in enumerate(nodes)}
-        for source, target in self.graph.edges():
-            i = index_lookup[source]
-            j = index_lookup[target]
-            adjacency[i, j] = 1.0
-            adjacency[j, i] = 1.0
-        return adjacency
-
-    def _top_risk_actors(self, gnn_projection: Dict[str, List[float]], limit: int = 5) -> List[str]:
-        actors = [
-            (node, data)
-            for node, data in self.graph.nodes(data=True)
-            if data.get("type") == "actor"
-        ]
-        score_lookup = dict(zip(gnn_projection.get("nodes", []), gnn_projection.get("scores", [])))
-        scores: List[Tuple[str, float]] = []
-        for actor, _ in actors:
-            neighbor_scores = [
-                self.graph.nodes[n].get("score", 0.0)
-                for n in self.graph.neighbors(actor)
-                if self.graph.nodes[n].get("type") == "content"
-            ]
-            if neighbor_scores:
-                avg_neighbor = sum(neighbor_scores) / len(neighbor_scores)
-                combined = 0.6 * avg_neighbor + 0.4 * score_lookup.get(actor, avg_neighbor)
-                scores.append((actor, combined))
-        scores.sort(key=lambda item: item[1], reverse=True)
-        return [actor for actor, _ in scores[:limit]]
-
-    def _communities_snapshot(
-        self, gnn_projection: Dict[str, List[float]]
-    ) -> List[CommunitySnapshot]:
-        communities: List[CommunitySnapshot] = []
-        score_lookup = dict(zip(gnn_projection.get("nodes", []), gnn_projection.get("scores", [])))
-        for component in nx.connected_components(self.graph):
-            members = list(component)
-            content = [node for node in members if node.startswith("content::")]
-            actors = [node for node in members if node.startswith("actor::")]
-            narratives = [node for node in members if node.startswith("narrative::")]
-            regions = [node for node in members if node.startswith("region::")]
-            if not (content or actors or narratives):
-                continue
-            avg_score = (
-                sum(score_lookup.get(node, 0.0) for node in members) / len(members)
-                if members
-                else 0.0
-            )
-            communities.append(
-                CommunitySnapshot(
-                    actors=actors,
-                    content=content,
-                    narratives=[node.split("::", 1)[1] for node in narratives],
-                    regions=[node.split("::", 1)[1] for node in regions],
-                    gnn_score=round(avg_score, 3),
-                )
-            )
-        return communities
+        Every section depends only on nodes inside one connected component
+        (the projection propagates two hops along edges), so clean components
+        keep their cached fragments and both paths assemble identical summaries.
+        """
+        self._gnn.refresh(self.compact)
+        if self._dirty_components:
+            dirty = [cid for cid in self._dirty_components if cid in self._components]
+            slots = self._ordered(slot for cid in dirty for slot in self._components[cid])
+            if slots:
+                self._component_cache.update(self._analyse(slots))
+            self._dirty_components.clear()
+        return self._assemble(self._component_cache.values())
+
+    def _assemble(self, component_sections) -> GraphSummary:
+        """Merge per-component fragments in first-seen component order."""
+        sections = sorted(component_sections, key=lambda item: item.order)
+        communities = [section.community for section in sections if section.community]
 
-    def _gnn_clusters(
-        self, gnn_projection: Dict[str, List[float]], limit: int = 5
-    ) -> List[GNNCluster]:
-        if not gnn_projection:
-            return []
-        score_lookup = dict(zip(gnn_projection.get("nodes", []), gnn_projection.get("scores", [])))
         clusters: List[GNNCluster] = []
-        for idx, component in enumerate(nx.connected_components(self.graph), start=1):
-            members = list(component)
-            if not members:
-                continue
-            avg_score = sum(score_lookup.get(node, 0.0) for node in members) / len(members)
-            if avg_score < 0.35:
+        for idx, section in enumerate(sections, start=1):
+            if section.cluster is None:
                 continue
-            actors = [node for node in members if node.startswith("actor::")]
-            narratives = [node.split("::", 1)[1] for node in members if node.startswith("narrative::")]
-            content = [node for node in members if node.startswith("content::")]
+            score, actors, narratives, content = section.cluster
             clusters.append(
                 GNNCluster(
                     cluster_id=f"cluster-{idx}",
-                    score=round(avg_score, 3),
-                    actors=actors[:10],
-                    narratives=narratives[:10],
-                    content=content[:10],
+                    score=score,
+                    actors=actors,
+                    narratives=narratives,
+                    content=content,
                 )
             )
         clusters.sort(key=lambda cluster: cluster.score, reverse=True)
-        return clusters[:limit]
 
-    def _coordination_alerts(
-        self, gnn_projection: Dict[str, List[float]], limit: int = 10
-    ) -> List[CoordinationAlert]:
-        if not gnn_projection:
-            return []
-        score_lookup = dict(zip(gnn_projection.get("nodes", []), gnn_projection.get("scores", [])))
-        alerts: List[CoordinationAlert] = []
-        for actor, data in self.graph.nodes(data=True):
-            if data.get("type") != "actor":
-                continue
-            content_neighbors = [
-                neighbor
-                for neighbor in self.graph.neighbors(actor)
-                if self.graph.nodes[neighbor].get("type") == "content"
-            ]
-            peer_actors = sorted(
-                {
-                    peer
-                    for content in content_neighbors
-                    for peer in self.graph.neighbors(content)
-                    if self.graph.nodes[peer].get("type") == "actor" and peer != actor
-                }
-            )
-            if not peer_actors:
-                continue
-            shared_tags = sorted(
-                {
-                    self.graph.nodes[tag].get("tag", tag.split("::", 1)[-1])
-                    for content in content_neighbors
-                    for tag in self.graph.neighbors(content)
-                    if self.graph.nodes[tag].get("type") == "narrative"
-                }
-            )
-            if not shared_tags:
-                continue
-            platforms = sorted(
-                {
-                    self.graph.nodes[content].get("platform", "unknown") or "unknown"
-                    for content in content_neighbors
-                }
-            ) or ["unknown"]
-            risk = max(
-                score_lookup.get(actor, 0.0),
-                max((score_lookup.get(peer, 0.0) for peer in peer_actors), default=0.0),
-            )
-            alerts.append(
-                CoordinationAlert(
-                    actor=actor,
-                    peer_actors=peer_actors[:5],
-                    shared_tags=shared_tags[:5],
-                    platforms=platforms,
-                    risk=round(risk, 3),
-                )
+        actor_risk = [item for section in sections for item in section.actor_risk]
+        actor_risk.sort(key=lambda item: (-item[2], item[0]))
+
+        alerts = [item for section in sections for item in section.alerts]
+        alerts.sort(key=lambda item: (-item[1]["risk"], item[0]))
+
+        narrative_chains = [item for section in sections for item in section.chains]
+        narrative_chains.sort(key=lambda item: item[0])
+        chains = [chain for _, group in narrative_chains for chain in group]
+
+        return GraphSummary(
+            node_count=len(self.compact),
+            edge_count=self.compact.number_of_edges(),
+            high_risk_actors=[actor for _, actor, _ in actor_risk[:5]],
+            communities=communities,
+            gnn_clusters=clusters[:5],
+            coordination_alerts=[CoordinationAlert(**fields) for _, fields in alerts[:10]],
+            propagation_chains=chains[:5],
+        )
+
+    def _analyse(self, slots: List[int]) -> Dict[int, _ComponentSections]:
+        """
+        Single analytics pass over whole components (`slots` in insertion order).
+
+        One CSR adjacency feeds every section: nodes are grouped by component
+        once, and actor peer sets and narrative fan-out are read off per-type
+        CSR slices. GCN scores come from the refreshed per-slot cache.
+        """
+        csr = GraphCSR.from_compact(self.compact, slots)
+        scores = self._gnn.scores(csr.slots).tolist()
+
+        members_of: Dict[int, List[int]] = {}
+        for idx, cid in enumerate(self.compact.component[csr.slots].tolist()):
+            members_of.setdefault(cid, []).append(idx)
+
+        labels = _NodeLabels()
+        platforms = self.compact.platforms
+        platform_codes = self.compact.platform[csr.slots].tolist()
+        for idx, node_type in enumerate(csr.types):
+            if node_type == CONTENT:
+                labels.platforms[idx] = platforms.value(platform_codes[idx]) or "unknown"
+            elif node_type == NARRATIVE:
+                labels.tags[idx] = csr.nodes[idx].split("::", 1)[-1]
+
+        return {
+            cid: self._component_sections(members, csr, scores, labels)
+            for cid, members in members_of.items()
+        }
+
+    def _component_sections(
+        self,
+        members: List[int],
+        csr: GraphCSR,
+        scores: List[float],
+        labels: _NodeLabels,
+    ) -> _ComponentSections:
+        names, types, order = csr.nodes, csr.types, csr.order
+        section = _ComponentSections(order=order[members[0]])
+
+        content = [names[idx] for idx in members if types[idx] == CONTENT]
+        actors = [names[idx] for idx in members if types[idx] == ACTOR]
+        narratives = [names[idx].split("::", 1)[-1] for idx in members if types[idx] == NARRATIVE]
+        regions = [names[idx].split("::", 1)[-1] for idx in members if types[idx] == REGION]
+        avg_score = sum(scores[idx] for idx in members) / len(members)
+        if content or actors or narratives:
+            section.community = CommunitySnapshot(
+                actors=actors,
+                content=content,
+                narratives=narratives,
+                regions=regions,
+                gnn_score=round(avg_score, 3),
             )
-        alerts.sort(key=lambda alert: alert.risk, reverse=True)
-        return alerts[:limit]
+        if avg_score >= 0.35:
+            section.cluster = (round(avg_score, 3), actors[:10], narratives[:10], content[:10])
+
+        graph = self.compact
+        for idx in members:
+            node_type = types[idx]
+            if node_type == ACTOR:
+                slot = csr.slots[idx]
+                published = int(graph.content_count[slot])
+                if published:
+                    avg_neighbor = float(graph.content_total[slot]) / published
+                    combined = 0.6 * avg_neighbor + 0.4 * scores[idx]
+                    section.actor_risk.append((order[idx], names[idx], combined))
+                alert = self._actor_alert(idx, csr, scores, labels)
+                if alert:
+                    section.alerts.append((order[idx], alert))
+            elif node_type == NARRATIVE:
+                chains = self._narrative_chains(idx, csr, scores, labels, limit=5)
+                if chains:
+                    section.chains.append((order[idx], chains))
+        return section
+
+    def _add_node(self, name: str, node_type: int) -> int:
+        slot = self.compact.id_of(name)
+        if slot is not None:
+            if self.compact.types[slot] != node_type:
+                self.compact.types[slot] = node_type
+                self._gnn.mark(slot)
+            return slot
+        slot = self.compact.add_node(name, node_type, next(self._seq))
+        self._gnn.mark(slot)
+        cid = next(self._component_ids)
+        self.compact.component[slot] = cid
+        self._components[cid] = {slot}
+        return slot
+
+    def _add_edge(self, source: int, target: int, relation: int) -> None:
+        if self.compact.add_edge(source, target, relation):
+            self._gnn.mark(source, target)  # degrees changed
+        left = int(self.compact.component[source])
+        right = int(self.compact.component[target])
+        if left == right:
+            return
+        # Merge the smaller component into the larger one.
+        if len(self._components[left]) < len(self._components[right]):
+            left, right = right, left
+        absorbed = self._components.pop(right)
+        self.compact.component[list(absorbed)] = left
+        self._components[left].update(absorbed)
+        self._component_cache.pop(right, None)
+        self._dirty_components.discard(right)
+        self._dirty_components.add(left)
 
-    def _propagation_chains(
-        self, gnn_projection: Dict[str, List[float]], limit: int = 5
+    def _ordered(self, slots) -> List[int]:
+        slots = np.fromiter(slots, dtype=np.int64)
+        return slots[np.argsort(self.compact.seq[slots])].tolist()
+
+    def _gnn_projection(self, slots: Optional[List[int]] = None) -> Dict[str, List]:
+        """Current GCN scores for `slots` (default: every node), after rescoring pending changes."""
+        self._gnn.refresh(self.compact)
+        if slots is None:
+            slots = self.compact.slots()
+        return {
+            "nodes": [self.compact.names[slot] for slot in slots],
+            "scores": self._gnn.scores(slots).tolist(),
+        }
+
+    @staticmethod
+    def _actor_alert(actor: int, csr: GraphCSR, scores: List[float], labels: _NodeLabels) -> Optional[Dict]:
+        content_ptr, content_idx = csr.typed(CONTENT)
+        actor_ptr, actor_idx = csr.typed(ACTOR)
+        tag_ptr, tag_idx = csr.typed(NARRATIVE)
+        content_neighbors = content_idx[content_ptr[actor] : content_ptr[actor + 1]]
+        # Actors publishing the same content, or a near-duplicate copy of it.
+        linked_content = set(content_neighbors)
+        for item in content_neighbors:
+            linked_content.update(content_idx[content_ptr[item] : content_ptr[item + 1]])
+        peers: Set[int] = set()
+        for item in linked_content:
+            peers.update(actor_idx[actor_ptr[item] : actor_ptr[item + 1]])
+        peers.discard(actor)
+        if not peers:
+            return None
+        shared_tags = sorted(
+            {labels.tags[tag] for item in content_neighbors for tag in tag_idx[tag_ptr[item] : tag_ptr[item + 1]]}
+        )
+        if not shared_tags:
+            return None
+        platforms = sorted({labels.platforms[item] for item in content_neighbors}) or ["unknown"]
+        risk = max(scores[actor], max(scores[peer] for peer in peers))
+        return {
+            "actor": csr.nodes[actor],
+            "peer_actors": sorted(csr.nodes[peer] for peer in peers)[:5],
+            "shared_tags": shared_tags[:5],
+            "platforms": platforms,
+            "risk": round(risk, 3),
+        }
+
+    @staticmethod
+    def _narrative_chains(
+        narrative: int,
+        csr: GraphCSR,
+        scores: List[float],
+        labels: _NodeLabels,
+        limit: int,
     ) -> List[PropagationChain]:
-        if not gnn_projection:
+        actors = csr.neighbors_of_type(narrative, ACTOR)
+        contents = csr.neighbors_of_type(narrative, CONTENT)
+        if len(actors) < 2 or not contents:
             return []
-        score_lookup = dict(zip(gnn_projection.get("nodes", []), gnn_projection.get("scores", [])))
         chains: List[PropagationChain] = []
-        narrative_nodes = [node for node, data in self.graph.nodes(data=True) if data.get("type") == "narrative"]
-        for narrative in narrative_nodes:
-            actors = [
-                neighbor
-                for neighbor in self.graph.neighbors(narrative)
-                if self.graph.nodes[neighbor].get("type") == "actor"
-            ]
-            contents = [
-                neighbor
-                for neighbor in self.graph.neighbors(narrative)
-                if self.graph.nodes[neighbor].get("type") == "content"
-            ]
-            if len(actors) < 2 or not contents:
-                continue
-            ranked_actors = sorted(actors, key=lambda node: score_lookup.get(node, 0.0), reverse=True)[:2]
-            for content in contents[:2]:
-                path = [ranked_actors[0], content, narrative, ranked_actors[-1]]
-                platforms = sorted({self.graph.nodes[content].get("platform", "unknown") or "unknown"})
-                likelihood = (
-                    score_lookup.get(content, 0.0)
-                    + score_lookup.get(narrative, 0.0)
-                    + sum(score_lookup.get(actor, 0.0) for actor in ranked_actors)
-                ) / max(1, 2 + len(ranked_actors))
-                chains.append(
-                    PropagationChain(
-                        path=path,
-                        likelihood=round(min(0.99, likelihood), 3),
-                        platforms=platforms,
-                    )
+        ranked_actors = sorted(actors, key=scores.__getitem__, reverse=True)[:2]
+        names = csr.nodes
+        for item in contents[:2]:
+            path = [names[ranked_actors[0]], names[item], names[narrative], names[ranked_actors[-1]]]
+            likelihood = (
+                scores[item]
+                + scores[narrative]
+                + sum(scores[actor] for actor in ranked_actors)
+            ) / max(1, 2 + len(ranked_actors))
+            chains.append(
+                PropagationChain(
+                    path=path,
+                    likelihood=round(min(0.99, likelihood), 3),
+                    platforms=[labels.platforms[item]],
                 )
-                if len(chains) >= limit:
-                    return chains
+            )
+            if len(chains) >= limit:
+                break
         return chains
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .compact_graph import CompactGraph
+
+
+class GraphCSR:
+    """
+    Integer-indexed adjacency (CSR) over an ordered list of CompactGraph slots.
+
+    `indices[indptr[i]:indptr[i + 1]]` are the neighbours of `nodes[i]` in
+    insertion order, so everything derived from it breaks ties exactly like
+    the graph itself. The slot list must be closed under adjacency (whole
+    connected components).
+    """
+
+    __slots__ = ("nodes", "slots", "types", "order", "indptr", "indices", "_edge_index", "_by_type")
+
+    def __init__(
+        self,
+        nodes: List[str],
+        slots: np.ndarray,
+        types: List[int],
+        order: List[int],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+    ) -> None:
+        self.nodes = nodes
+        self.slots = slots  # CompactGraph slot of each position, for column lookups
+        self.types = types
+        self.order = order  # insertion rank (CompactGraph.seq) of each position
+        self.indptr = indptr.tolist()
+        self.indices = indices.tolist()
+        rows = np.repeat(np.arange(len(nodes), dtype=np.int64), np.diff(indptr))
+        self._edge_index: Tuple[np.ndarray, np.ndarray] = (rows, indices)
+        self._by_type: Dict[int, Tuple[List[int], List[int]]] = {}
+
+    @classmethod
+    def from_compact(cls, graph: CompactGraph, slots: List[int]) -> "GraphCSR":
+        slot_array = np.asarray(slots, dtype=np.int64)
+        position = np.full(len(graph.types), -1, dtype=np.int64)
+        position[slot_array] = np.arange(len(slots), dtype=np.int64)
+        adjacency = graph.adj
+        degrees = [len(adjacency[slot]) for slot in slots]
+        neighbours = np.fromiter(
+            chain.from_iterable(adjacency[slot] for slot in slots), dtype=np.int64, count=sum(degrees)
+        )
+        indptr = np.zeros(len(slots) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=indptr[1:])
+        return cls(
+            [graph.names[slot] for slot in slots],
+            slot_array,
+            graph.types[slot_array].tolist(),
+            graph.seq[slot_array].tolist(),
+            indptr,
+            position[neighbours],
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def neighbors(self, idx: int) -> List[int]:
+        return self.indices[self.indptr[idx] : self.indptr[idx + 1]]
+
+    def neighbors_of_type(self, idx: int, node_type: int) -> List[int]:
+        indptr, indices = self.typed(node_type)
+        return indices[indptr[idx] : indptr[idx + 1]]
+
+    def edge_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Both directions of every edge as (rows, cols), for the projection backends."""
+        return self._edge_index
+
+    def typed(self, node_type: int) -> Tuple[List[int], List[int]]:
+        """CSR restricted to neighbours of one type (order kept), built once with numpy."""
+        typed: Optional[Tuple[List[int], List[int]]] = self._by_type.get(node_type)
+        if typed is None:
+            rows, cols = self._edge_index
+            keep = np.asarray(self.types, dtype=np.int8)[cols] == node_type
+            counts = np.bincount(rows[keep], minlength=len(self.nodes))
+            typed = (np.concatenate(([0], np.cumsum(counts))).tolist(), cols[keep].tolist())
+            self._by_type[node_type] = typed
+        return typed
@@ -0,0 +1,110 @@
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words, or runs of other non-space characters: punctuation becomes its own
+# token, so phrases only match across whitespace and "must-see" matches as written.
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]+")
+
+_TERMS = "__terms__"  # trie key holding (category, term) pairs that end at a node
+_MAX_PHRASE_TOKENS = 16  # longest phrase tail walked from a head word
+
+
+class LexiconMatcher:
+    """
+    Multi-pattern lexicon matcher over word tokens.
+
+    Terms are tokenized the same way as the text. Single-word terms live in
+    a dict and are found with one set intersection against the text's
+    tokens; phrases live in a token trie keyed by their first word, and the
+    trie is only walked from positions holding such a first word. Both structures
+    are built once, so a scan costs O(text) however large the lexicon is.
+    Matching is on whole tokens: "now" does not fire inside "know" or "snow".
+    """
+
+    def __init__(self, lexicons: Mapping[str, Iterable[str]]) -> None:
+        self._words: Dict[str, List[Tuple[str, str]]] = {}
+        self._phrases: Dict[str, dict] = {}
+        self.categories: List[str] = []
+        self.size = 0
+        for category, terms in lexicons.items():
+            self.add_terms(category, terms)
+
+    def add_terms(self, category: str, terms: Iterable[str]) -> None:
+        if category not in self.categories:
+            self.categories.append(category)
+        for term in terms:
+            tokens = _TOKEN_PATTERN.findall(term.lower())
+            if not tokens:
+                continue
+            if len(tokens) == 1:
+                entries = self._words.setdefault(tokens[0], [])
+            else:
+                node = self._phrases.setdefault(tokens[0], {})
+                for token in tokens[1:]:
+                    node = node.setdefault(token, {})
+                entries = node.setdefault(_TERMS, [])
+            if (category, term) not in entries:
+                entries.append((category, term))
+                self.size += 1
+
+    @classmethod
+    def from_directory(
+        cls, directory: Path, base: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> "LexiconMatcher":
+        """`<category>.txt` files, one term per line; blank lines and # comments are skipped."""
+        matcher = cls(base or {})
+        for path in sorted(Path(directory).glob("*.txt")):
+            with path.open(encoding="utf-8") as handle:
+                terms = [line.strip() for line in handle]
+            matcher.add_terms(path.stem, [term for term in terms if term and not term.startswith("#")])
+        return matcher
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct terms found in `text`, per category."""
+        found: Dict[str, Set[str]] = {category: set() for category in self.categories}
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        present = set(tokens)
+        for token in present.intersection(self._words):
+            for category, term in self._words[token]:
+                found[category].add(term)
+        if present.isdisjoint(self._phrases):
+            return found
+        phrases = self._phrases
+        for position in [idx for idx, token in enumerate(tokens) if token in phrases]:
+            node = phrases[tokens[position]]
+            for token in tokens[position + 1 : position + 1 + _MAX_PHRASE_TOKENS]:
+                node = node.get(token)
+                if node is None:
+                    break
+                for category, term in node.get(_TERMS, ()):
+                    found[category].add(term)
+        return found
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct terms found in `text`, per category."""
+        return {category: len(terms) for category, terms in self.match(text).items()}
+
+
+def load_lexicons(
+    directory: Optional[str], builtin: Mapping[str, Iterable[str]]
+) -> Dict[str, LexiconMatcher]:
+    """
+    Matchers keyed by language. "default" holds the built-in lexicons; each
+    `<directory>/<language>/` adds its category files on top of them.
+    """
+    matchers = {"default": LexiconMatcher(builtin)}
+    if not directory:
+        return matchers
+    root = Path(directory)
+    if not root.is_dir():
+        logger.warning(f"Lexicon directory {root} not found; using built-in lexicons only.")
+        return matchers
+    for language_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+        matcher = LexiconMatcher.from_directory(language_dir, builtin)
+        matchers[language_dir.name.lower()] = matcher
+        logger.info(f"Loaded {matcher.size} lexicon terms for '{language_dir.name}'.")
+    return matchers
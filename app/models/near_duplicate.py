@@ -0,0 +1,241 @@
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..config import get_settings
+
+_WORD_PATTERN = re.compile(r"\w+")
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_MASK = np.uint64(0xFFFFFFFF)
+
+
+def _stable_integers(seed: int, count: int, low: int, high: int) -> np.ndarray:
+    """
+    Deterministic uint64 draws in [low, high) via splitmix64. Hash parameters
+    end up in persisted signatures, so they must not depend on numpy's RNG
+    stream staying the same across releases.
+    """
+    values = []
+    state = seed & 0xFFFFFFFFFFFFFFFF
+    for _ in range(count):
+        state = (state + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        z ^= z >> 31
+        values.append(low + z % (high - low))
+    return np.array(values, dtype=np.uint64)
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles (character shingles for very short texts).
+
+    Shingles are hashed with CRC32 so signatures are stable across processes
+    and can be persisted. Each of the `num_perm` permutations is a universal
+    hash (a*x + b) mod p with a, b < 2**32 so the products fit in uint64.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1) -> None:
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = _stable_integers(seed, num_perm, 1, 2**32 - 1)
+        self._b = _stable_integers(seed + 1, num_perm, 0, 2**32 - 1)
+
+    def shingles(self, text: str) -> Set[bytes]:
+        tokens = _WORD_PATTERN.findall(text.lower())
+        size = self.shingle_size
+        if len(tokens) >= size:
+            return {" ".join(tokens[idx : idx + size]).encode("utf-8") for idx in range(len(tokens) - size + 1)}
+        compact = " ".join(tokens)
+        width = size + 2
+        if len(compact) <= width:
+            return {compact.encode("utf-8")}
+        return {compact[idx : idx + width].encode("utf-8") for idx in range(len(compact) - width + 1)}
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(shingle) for shingle in self.shingles(text)), dtype=np.uint64)
+        permuted = ((np.outer(hashes, self._a) + self._b) % _PRIME) & _MASK
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        """Estimated Jaccard similarity: the fraction of agreeing permutations."""
+        return float(np.count_nonzero(left == right)) / len(left)
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures with sub-linear lookups.
+
+    Each band's keys live in a sorted int64 array (binary search per query)
+    plus a small dict of recent inserts. When the dict holds more than an
+    eighth of the sorted data it is merged in, so inserts cost O(log n)
+    amortised and memory stays at ~12 bytes per item per band.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._multipliers = _stable_integers(7, self.rows, 1, 2**63) | np.uint64(1)
+        self.ids: List[str] = []
+        self._keys = [np.empty(0, dtype=np.int64) for _ in range(bands)]
+        self._positions = [np.empty(0, dtype=np.int64) for _ in range(bands)]
+        self._pending: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._pending_count = 0
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(n, num_perm) uint32 signatures -> (n, bands) int64 band keys."""
+        rows = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        with np.errstate(over="ignore"):  # wrap-around multiply-add is the hash
+            return (rows * self._multipliers).sum(axis=2, dtype=np.uint64).view(np.int64)
+
+    def add(self, item_id: str, keys: Sequence[int]) -> None:
+        position = len(self.ids)
+        self.ids.append(item_id)
+        for band, key in enumerate(keys):
+            self._pending[band].setdefault(int(key), []).append(position)
+        self._pending_count += 1
+        if self._pending_count > max(1024, len(self._keys[0]) // 8):
+            self._merge()
+
+    def bulk_load(self, item_ids: List[str], keys: np.ndarray) -> None:
+        """Add many items at once (keys is (n, bands)); used when loading from SQLite."""
+        if not item_ids:
+            return
+        self._merge()
+        start = len(self.ids)
+        self.ids.extend(item_ids)
+        positions = np.arange(start, start + len(item_ids), dtype=np.int64)
+        for band in range(self.bands):
+            self._keys[band], self._positions[band] = self._sorted(
+                np.concatenate([self._keys[band], keys[:, band]]),
+                np.concatenate([self._positions[band], positions]),
+            )
+
+    def candidates(self, keys: Sequence[int]) -> Set[int]:
+        found: Set[int] = set()
+        for band, key in enumerate(keys):
+            key = int(key)
+            sorted_keys = self._keys[band]
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            hi = np.searchsorted(sorted_keys, key, side="right")
+            if hi > lo:
+                found.update(self._positions[band][lo:hi].tolist())
+            found.update(self._pending[band].get(key, ()))
+        return found
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _merge(self) -> None:
+        if not self._pending_count:
+            return
+        for band in range(self.bands):
+            pending = self._pending[band]
+            keys = np.fromiter(
+                (key for key, positions in pending.items() for _ in positions), dtype=np.int64
+            )
+            positions = np.fromiter(
+                (position for members in pending.values() for position in members), dtype=np.int64
+            )
+            self._keys[band], self._positions[band] = self._sorted(
+                np.concatenate([self._keys[band], keys]),
+                np.concatenate([self._positions[band], positions]),
+            )
+            self._pending[band] = {}
+        self._pending_count = 0
+
+    @staticmethod
+    def _sorted(keys: np.ndarray, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(keys, kind="stable")
+        return keys[order], positions[order]
+
+
+class NearDuplicateIndex:
+    """
+    Fuzzy fingerprint matching for /api/v1/fingerprint/check.
+
+    Every intake's MinHash signature and band keys are stored in the
+    near_duplicate_signatures table (see Database.store_minhashes); the LSH
+    index is loaded from there on first use and updated in memory as intakes
+    arrive. Every add and query first tails rows written since the last sync
+    (by rowid), so intakes stored by other workers are matched too; the tail
+    reads committed rows only, so it never forces a write-behind flush. Queries
+    only touch the items sharing at least one band with the text, then keep
+    those whose estimated Jaccard is >= the threshold.
+    """
+
+    def __init__(self, db: Any, threshold: Optional[float] = None) -> None:
+        settings = get_settings()
+        self.db = db
+        self.threshold = settings.near_duplicate_threshold if threshold is None else threshold
+        self.hasher = MinHasher(settings.near_duplicate_num_perm, settings.near_duplicate_shingle_size)
+        self.index = LSHIndex(settings.near_duplicate_num_perm, settings.near_duplicate_bands)
+        # Rows written with other parameters are ignored rather than mis-compared.
+        self.scheme = (
+            f"minhash:{settings.near_duplicate_num_perm}:{settings.near_duplicate_bands}"
+            f":{settings.near_duplicate_shingle_size}"
+        )
+        self._lock = threading.Lock()
+        self._rowid = 0  # newest near_duplicate_signatures row in the index
+        # Indexed locally, row not yet seen by _sync: intake_id -> signature, so
+        # queries can verify against it before write-behind commits the row.
+        self._own: Dict[str, bytes] = {}
+
+    def add(self, intake_id: str, text: str) -> None:
+        self.add_many([(intake_id, text)])
+
+    def add_many(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        signatures = np.stack([self.hasher.signature(text) for _, text in items])
+        keys = self.index.band_keys(signatures)
+        rows = [
+            (intake_id, signature.tobytes(), key_row.tobytes())
+            for (intake_id, _), signature, key_row in zip(items, signatures, keys)
+        ]
+        with self._lock:
+            self._sync()
+            self._own.update((intake_id, signature) for intake_id, signature, _ in rows)  # skipped when tailed back
+            self.db.store_minhashes(self.scheme, rows)
+            for (intake_id, _), key_row in zip(items, keys):
+                self.index.add(intake_id, key_row)
+
+    def query(self, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+        signature = self.hasher.signature(text)
+        keys = self.index.band_keys(signature[None, :])[0]
+        with self._lock:
+            self._sync()
+            candidate_ids = [self.index.ids[position] for position in self.index.candidates(keys)]
+            pending = {intake_id: self._own[intake_id] for intake_id in candidate_ids if intake_id in self._own}
+        committed = [intake_id for intake_id in candidate_ids if intake_id not in pending]
+        matches = []
+        for intake_id, stored in {**self.db.fetch_minhashes(self.scheme, committed), **pending}.items():
+            similarity = MinHasher.similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+            if similarity >= self.threshold:
+                matches.append({"intake_id": intake_id, "similarity": round(similarity, 3)})
+        matches.sort(key=lambda match: match["similarity"], reverse=True)
+        return matches[:limit]
+
+    def _sync(self) -> None:
+        """Index rows other workers (or earlier runs) stored since the last sync."""
+        item_ids, key_blobs, self._rowid = self.db.load_minhash_band_keys(self.scheme, self._rowid)
+        if self._own:
+            keep = [idx for idx, item_id in enumerate(item_ids) if item_id not in self._own]
+            for item_id in item_ids:
+                self._own.pop(item_id, None)
+            item_ids, key_blobs = [item_ids[idx] for idx in keep], [key_blobs[idx] for idx in keep]
+        if not item_ids:
+            return
+        keys = np.frombuffer(b"".join(key_blobs), dtype=np.int64).reshape(len(item_ids), self.index.bands)
+        if len(item_ids) > 1024:  # startup or a long gap: one sort instead of many merges
+            self.index.bulk_load(item_ids, keys)
+        else:
+            for item_id, key_row in zip(item_ids, keys):
+                self.index.add(item_id, key_row)
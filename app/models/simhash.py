@@ -0,0 +1,132 @@
+import hashlib
+import re
+import threading
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Set, Tuple
+
+import numpy as np
+
+from ..config import get_settings
+
+_WORD_PATTERN = re.compile(r"\w+")
+_BITS = 64
+
+
+def _feature_hashes(features: List[str]) -> np.ndarray:
+    # blake2b rather than hash(): values are persisted and compared across processes.
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little") for f in features],
+        dtype=np.uint64,
+    )
+
+
+def simhash64(text: str) -> int:
+    """
+    64-bit SimHash over lower-cased words, weighted by frequency. Copies that
+    differ by a word or two land a few bits apart; unrelated texts ~32 bits.
+    """
+    counts = Counter(_WORD_PATTERN.findall(text.lower()))
+    if not counts:
+        return 0
+    features = list(counts)
+    weights = np.fromiter((counts[feature] for feature in features), dtype=np.int64)
+    # (n, 64) bit matrix, least significant bit first.
+    bits = np.unpackbits(_feature_hashes(features).view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    totals = weights @ (2 * bits.astype(np.int64) - 1)
+    return int(np.packbits(totals > 0, bitorder="little").view("<u8")[0])
+
+
+def hamming(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+class SimHashIndex:
+    """
+    Multi-table index for "every stored SimHash within k bits of this one".
+
+    The 64 bits are cut into k + 1 blocks; two hashes within k bits agree
+    exactly on at least one block (pigeonhole), so a query only scans the
+    k + 1 buckets its own blocks select. Buckets keep the newest
+    `bucket_limit` entries and a query links at most `max_matches` items,
+    which keeps the work per intake O(1) even when a campaign posts the same
+    text thousands of times: older copies are already linked to newer ones.
+    """
+
+    def __init__(self, max_distance: int = 5, bucket_limit: int = 128, max_matches: int = 5) -> None:
+        if not 0 <= max_distance < _BITS:
+            raise ValueError("max_distance must be between 0 and 63")
+        self.max_distance = max_distance
+        self.max_matches = max_matches
+        blocks = max_distance + 1
+        bounds = [round(idx * _BITS / blocks) for idx in range(blocks + 1)]
+        self._blocks = [(start, (1 << (end - start)) - 1) for start, end in zip(bounds, bounds[1:])]
+        self._tables: List[Dict[int, Deque[Tuple[str, int]]]] = [{} for _ in self._blocks]
+        self._bucket_limit = bucket_limit
+
+    def query(self, value: int) -> List[Tuple[str, int]]:
+        """(item_id, distance) pairs within max_distance, nearest then newest first."""
+        seen: Dict[str, int] = {}
+        order: Dict[str, int] = {}
+        for table, key in zip(self._tables, self._keys(value)):
+            for rank, (item_id, stored) in enumerate(reversed(table.get(key, ()))):
+                if item_id in seen:
+                    continue
+                distance = hamming(value, stored)
+                if distance <= self.max_distance:
+                    seen[item_id] = distance
+                    order[item_id] = rank
+        matches = sorted(seen.items(), key=lambda match: (match[1], order[match[0]]))
+        return matches[: self.max_matches]
+
+    def add(self, item_id: str, value: int) -> None:
+        for table, key in zip(self._tables, self._keys(value)):
+            bucket = table.get(key)
+            if bucket is None:
+                bucket = table[key] = deque(maxlen=self._bucket_limit)
+            bucket.append((item_id, value))
+
+    def _keys(self, value: int) -> List[int]:
+        return [(value >> start) & mask for start, mask in self._blocks]
+
+
+class CampaignMatcher:
+    """
+    Copy-paste campaign matching for the orchestrator.
+
+    `match(intake_id, text)` returns the intake's SimHash plus the earlier
+    intakes within SIMHASH_MAX_DISTANCE bits, then indexes it. The index is
+    seeded from the simhash column of the fingerprints table on first use,
+    limited to the graph's hot window since only those content nodes can
+    still receive near_duplicate edges, and every match first tails rows
+    stored since (by id), so copies ingested by other workers are found too.
+    """
+
+    def __init__(self, db: Any) -> None:
+        settings = get_settings()
+        self.db = db
+        self.index = SimHashIndex(
+            settings.simhash_max_distance, settings.simhash_bucket_limit, settings.simhash_max_matches
+        )
+        self._load_limit = settings.graph_max_content_nodes
+        self._lock = threading.Lock()
+        self._last_id = 0  # newest fingerprints row in the index
+        self._own: Set[str] = set()  # indexed by match(), row not yet seen by _sync
+
+    def match(self, intake_id: str, text: str) -> Tuple[int, List[str]]:
+        value = simhash64(text)
+        with self._lock:
+            self._sync()
+            matches = [item_id for item_id, _ in self.index.query(value)]
+            self.index.add(intake_id, value)
+            self._own.add(intake_id)  # the orchestrator stores its row afterwards
+        return value, matches
+
+    def _sync(self) -> None:
+        """Index fingerprints stored since the last sync, skipping the ones match() already added."""
+        rows, self._last_id = self.db.load_simhashes(self._load_limit, self._last_id)
+        for intake_id, value in rows:
+            if intake_id in self._own:
+                self._own.discard(intake_id)
+                continue
+            self.index.add(intake_id, value)
+
@@ -0,0 +1,187 @@
+import math
+import re
+import statistics
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List
+
+# Compiled once per process instead of on every call.
+TOKEN_PATTERN = re.compile(r"\b[\w'-]+\b")
+# Sentence break: whitespace after . ? ! that does not follow an abbreviation.
+# The cheap punctuation lookbehind goes first so most positions fail fast.
+SENTENCE_BREAK = re.compile(r"(?<=[.?!])(?<!\w\.\w.)(?<![A-Z][a-z]\.)\s")
+_NON_SPACE = re.compile(r"\S")
+PUNCTUATION = frozenset('!?.;,:-–—()"')
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text)
+
+
+def calculate_mattr(tokens: List[str], window: int = 50) -> float:
+    """Approximate Moving-Average Type-Token Ratio (MATTR) for robust diversity."""
+    if len(tokens) < window:
+        return len(set(tokens)) / len(tokens) if tokens else 0.0
+
+    total_types = 0.0
+    num_windows = 0
+    step = max(window // 2, 1)
+
+    for i in range(0, len(tokens), step):  # Overlapping windows
+        window_tokens = tokens[i : i + window]
+        if window_tokens:
+            types = len(set(window_tokens))
+            total_types += types / len(window_tokens)
+            num_windows += 1
+
+    return total_types / num_windows if num_windows else 0.0
+
+
+def calculate_mattr_exact(tokens: List[str], window: int = 50) -> float:
+    """
+    Exact MATTR: mean type-token ratio over every window of `window` tokens.
+    One running count is updated per step (one token in, one out), so it is
+    O(n) with no window copies.
+    """
+    if len(tokens) < window:
+        return len(set(tokens)) / len(tokens) if tokens else 0.0
+
+    counts: Dict[str, int] = {}
+    for token in tokens[:window]:
+        counts[token] = counts.get(token, 0) + 1
+    types = len(counts)
+    total_types = types
+    for entering, leaving in zip(tokens[window:], tokens):
+        if entering != leaving:
+            remaining = counts[leaving] - 1
+            if remaining:
+                counts[leaving] = remaining
+            else:
+                del counts[leaving]
+                types -= 1
+            seen = counts.get(entering, 0)
+            if not seen:
+                types += 1
+            counts[entering] = seen + 1
+        total_types += types
+
+    return total_types / ((len(tokens) - window + 1) * window)
+
+
+def calculate_burstiness(sentence_lengths: List[int]) -> float:
+    """
+    Calculates coefficient of variation of sentence lengths.
+    High variation = Human (Burstiness). Low variation = AI (Monotony).
+    """
+    if not sentence_lengths or len(sentence_lengths) < 2:
+        return 0.0
+    mean = statistics.mean(sentence_lengths)
+    stdev = statistics.stdev(sentence_lengths)
+    if mean == 0:
+        return 0.0
+    return min(stdev / mean, 1.0)
+
+
+class StylometricExtractor:
+    """
+    Single-pass stylometric feature extraction for DetectorEngine.
+
+    The text is tokenized once, sentence by sentence: each segment between
+    sentence breaks is tokenized in place (no substring copies), which gives
+    the token stream and the per-sentence lengths together. Type counts,
+    function words, casing and trigram uniqueness come from one Counter, and
+    entropy and punctuation variety from one character Counter. The output
+    is identical to the previous multi-pass extractor (see
+    benchmarks/bench_stylometry.py).
+    """
+
+    def __init__(
+        self, function_words: Iterable[str], mattr_window: int = 50, mattr_method: str = "approx"
+    ) -> None:
+        self.function_words: FrozenSet[str] = frozenset(function_words)
+        self.mattr_window = mattr_window
+        # "approx": half-overlapping windows (the original); "exact": every window.
+        self._mattr = calculate_mattr_exact if mattr_method == "exact" else calculate_mattr
+
+    def split(self, text: str):
+        """Tokens plus the token count of every non-blank sentence."""
+        tokens: List[str] = []
+        sentence_lengths: List[int] = []
+        start = 0
+        breaks = [match.start() for match in SENTENCE_BREAK.finditer(text)]
+        for end in breaks + [len(text)]:
+            segment_tokens = TOKEN_PATTERN.findall(text, start, end)
+            if segment_tokens or _NON_SPACE.search(text, start, end):
+                sentence_lengths.append(len(segment_tokens))
+                tokens.extend(segment_tokens)
+            start = end + 1  # the break consumes one whitespace character
+        return tokens, sentence_lengths
+
+    def extract(self, text: str) -> Dict[str, float]:
+        tokens, sentence_lengths = self.split(text)
+        token_count = len(tokens) or 1
+        sentence_count = len(sentence_lengths)
+        if not sentence_lengths:
+            sentence_lengths = [token_count]
+
+        counts = Counter(tokens)
+        char_count = 0
+        hapax = 0
+        uppercase_tokens = 0
+        function_words = 0
+        for token, count in counts.items():
+            char_count += len(token) * count
+            if count == 1:
+                hapax += 1
+            if len(token) > 1 and token.isupper():
+                uppercase_tokens += count
+            if token.lower() in self.function_words:
+                function_words += count
+
+        # HHI proxy; sum() (not +=) so the rounding matches the previous extractor
+        freq_squares = sum((count / token_count) ** 2 for count in counts.values())
+
+        # Repetition Rate (N-gram redundancy)
+        trigram_count = len(tokens) - 2
+        if trigram_count > 0:
+            unique_trigrams = len(set(zip(tokens, tokens[1:], tokens[2:])))
+            repetition_rate = 1.0 - (unique_trigrams / trigram_count)
+        else:
+            repetition_rate = 0.0
+
+        # Character-level Shannon Entropy and punctuation from one character count
+        char_counts = Counter(text)
+        char_entropy = 0.0
+        if text:
+            length = len(text)
+            char_entropy = -sum(p * math.log2(p) for p in [count / length for count in char_counts.values()])
+        punct_types = PUNCTUATION.intersection(char_counts)
+
+        # statistics.variance on integers, without its Fraction arithmetic: the
+        # exact ratio below rounds to the same float.
+        n = len(sentence_lengths)
+        if n > 1:
+            total = sum(sentence_lengths)
+            squares = sum(length * length for length in sentence_lengths)
+            sentence_length_var = (n * squares - total * total) / (n * (n - 1))
+        else:
+            sentence_length_var = 0.0
+
+        # Readability Proxy (ARI Approximation)
+        avg_chars_per_word = char_count / token_count
+        avg_words_per_sent = token_count / max(sentence_count, 1)
+        readability = (4.71 * avg_chars_per_word) + (0.5 * avg_words_per_sent) - 21.43
+
+        return {
+            "avg_token_length": char_count / token_count,
+            "mattr": self._mattr(tokens, window=self.mattr_window),
+            "hapax_ratio": hapax / token_count,
+            "sentence_length_var": sentence_length_var,
+            "burstiness": calculate_burstiness(sentence_lengths),
+            "function_word_ratio": function_words / token_count,
+            "uppercase_ratio": uppercase_tokens / token_count,
+            "repetition_rate": repetition_rate,
+            "entropy": char_entropy,
+            "readability_score": max(0, readability),
+            "punctuation_variety": len(punct_types) / 8.0,  # Max 8 common types
+            "vocabulary_richness": 1.0 - freq_squares,  # 1 - HHI, higher = richer
+        }
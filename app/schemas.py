@@ -86,12 +86,31 @@ class DetectionResult(BaseModel):
     classification: str
     breakdown: DetectionBreakdown
     provenance: ProvenancePayload
-    graph_summary: GraphSummary
+    graph_summary: Optional[GraphSummary] = None  # omitted per item in batch results
     summary: Optional[str] = None
     findings: Optional[List[str]] = None
     decision_reason: Optional[str] = None
 
 
+class BatchIntake(BaseModel):
+    items: List[ContentIntake] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchStats(BaseModel):
+    items: int
+    elapsed_ms: float
+    items_per_second: float
+    detection_ms: float
+    graph_ms: float
+    persistence_ms: float
+
+
+class BatchDetectionResult(BaseModel):
+    results: List[DetectionResult]
+    graph_summary: GraphSummary  # once for the batch, after every item is ingested
+    stats: BatchStats
+
+
 class ThreatIntelFeed(BaseModel):
     generated_at: datetime
     graph_summary: GraphSummary
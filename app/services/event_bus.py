@@ -0,0 +1,272 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from ..config import Settings, get_settings
+from ..storage.migrations import migrate
+from ..storage.pool import get_pool
+from .events import EventBroadcaster
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    Carries pipeline events from the worker process that emitted them to the
+    EventBroadcaster of every worker, so a dashboard connected to any uvicorn
+    worker sees every intake.
+
+    `publish` may be called from any thread. `start` begins delivering events
+    into the local broadcaster (idempotent; the SSE endpoint calls it before
+    subscribing) and, for cross-process backends, backfills the broadcaster's
+    replay history first so Last-Event-ID resume works on any worker. Event
+    ids are assigned by the bus and are the same in every process.
+    """
+
+    def __init__(self, broadcaster: EventBroadcaster) -> None:
+        self.broadcaster = broadcaster
+
+    def publish(self, data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"backend": "memory"}
+
+
+class MemoryEventBus(EventBus):
+    """Single-process bus: publishing hands the event straight to the broadcaster."""
+
+    def publish(self, data: Dict[str, Any]) -> None:
+        self.broadcaster.publish(data)
+
+
+class _TailingEventBus(EventBus):
+    """Shared tailer thread for backends that deliver events from outside the process."""
+
+    backend = ""
+
+    def __init__(self, broadcaster: EventBroadcaster, history_size: int = 1000) -> None:
+        super().__init__(broadcaster)
+        self.history_size = history_size
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._published = 0
+        self._delivered = 0
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._backfill()  # before any subscriber registers, so resume sees it
+            self._thread = threading.Thread(target=self._tail, name=f"event-bus-{self.backend}", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "tailing": self._thread is not None and self._thread.is_alive(),
+            "published": self._published,
+            "delivered": self._delivered,
+        }
+
+    def _deliver(self, event_id: int, data: Dict[str, Any]) -> None:
+        self.broadcaster.publish(data, event_id=event_id)
+        self._delivered += 1
+
+    def _backfill(self) -> None:
+        raise NotImplementedError
+
+    def _tail(self) -> None:
+        raise NotImplementedError
+
+
+class SQLiteEventBus(_TailingEventBus):
+    """
+    Append-only `stream_events` log in the shared SQLite file, tailed by every
+    worker. No external service is needed: every process that opens the same
+    database file sees the same events.
+
+    SQLite has a single writer, so rowids become visible in commit order and
+    tailing `id > cursor` never skips a late commit. A local publish wakes
+    this process's tailer immediately; events from other workers arrive
+    within `poll_interval`. Rows older than the newest `retention` are pruned.
+    """
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        path: str,
+        broadcaster: EventBroadcaster,
+        poll_interval: float = 0.1,
+        retention: int = 10000,
+        history_size: int = 1000,
+    ) -> None:
+        super().__init__(broadcaster, history_size)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = max(retention, history_size)
+        self._cursor_id = 0
+        self._wakeup = threading.Event()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.path)
+        self._initialise()
+
+    def _initialise(self) -> None:
+        """stream_events is created by migration 8 (storage/migrations.py)."""
+        migrate(self._pool.connection())
+
+    def _cursor(self):
+        return self._pool.cursor()
+
+    def publish(self, data: Dict[str, Any]) -> None:
+        with self._cursor() as cur:
+            cur.execute(
+                "INSERT INTO stream_events (payload, created_at) VALUES (?, ?)",
+                (json.dumps(data), datetime.utcnow().isoformat()),
+            )
+            event_id = cur.lastrowid
+            if event_id % 1000 == 0:
+                cur.execute("DELETE FROM stream_events WHERE id <= ?", (event_id - self.retention,))
+        self._published += 1
+        self._wakeup.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**super().metrics(), "cursor": self._cursor_id}
+
+    def _backfill(self) -> None:
+        with self._cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM stream_events")
+            last_id = int(cur.fetchone()[0])
+        self._cursor_id = max(0, last_id - self.history_size)
+        self._drain()
+
+    def _tail(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except Exception as exc:  # e.g. "database is locked": retry on the next poll
+                logger.warning(f"Event bus tail failed at id {self._cursor_id}: {exc}")
+
+    def _drain(self) -> None:
+        while True:
+            with self._cursor() as cur:
+                cur.execute(
+                    "SELECT id, payload FROM stream_events WHERE id > ? ORDER BY id LIMIT 500",
+                    (self._cursor_id,),
+                )
+                rows = cur.fetchall()
+            for event_id, payload in rows:
+                try:
+                    data = json.loads(payload)
+                except ValueError:
+                    logger.error(f"Event bus skipped unreadable stream_events row {event_id}")
+                else:
+                    self._deliver(event_id, data)
+                self._cursor_id = event_id
+            if len(rows) < 500:
+                return
+
+
+class BrokerEventBus(_TailingEventBus):
+    """
+    Pub/sub through a Redis-like broker. `client` needs the redis-py subset
+    `incr`, `rpush`, `ltrim`, `lrange`, `publish` and `pubsub()` (with
+    `subscribe`, `listen` and `close`). Ids come from INCR on `<channel>:id`;
+    the newest `history_size` messages are kept in the `<channel>:history`
+    list for backfill. Delivery order is the broker's, so ids are unique but
+    two workers publishing at once may deliver them slightly out of order.
+    """
+
+    backend = "redis"
+
+    def __init__(self, client: Any, broadcaster: EventBroadcaster, channel: str = "events", history_size: int = 1000) -> None:
+        super().__init__(broadcaster, history_size)
+        self.client = client
+        self.channel = channel
+        self._pubsub: Any = None
+        self._backfilled: Set[int] = set()
+
+    def publish(self, data: Dict[str, Any]) -> None:
+        event_id = int(self.client.incr(f"{self.channel}:id"))
+        message = json.dumps({"id": event_id, "data": data})
+        self.client.rpush(f"{self.channel}:history", message)
+        self.client.ltrim(f"{self.channel}:history", -self.history_size, -1)
+        self.client.publish(self.channel, message)
+        self._published += 1
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._pubsub is not None:
+            self._pubsub.close()  # unblocks listen()
+        super().close()
+
+    def _backfill(self) -> None:
+        # Subscribe first so nothing published during the backfill is missed.
+        self._pubsub = self.client.pubsub()
+        self._pubsub.subscribe(self.channel)
+        for message in self.client.lrange(f"{self.channel}:history", -self.history_size, -1):
+            event = json.loads(message)
+            self._backfilled.add(event["id"])
+            self._deliver(event["id"], event["data"])
+
+    def _tail(self) -> None:
+        try:
+            for message in self._pubsub.listen():
+                if self._stopped.is_set():
+                    return
+                self._handle(message)
+        except Exception:
+            if not self._stopped.is_set():
+                raise
+
+    def _handle(self, message: Dict[str, Any]) -> None:
+        if message.get("type") != "message":
+            return
+        event = json.loads(message["data"])
+        if event["id"] in self._backfilled:
+            self._backfilled.discard(event["id"])
+            return
+        self._deliver(event["id"], event["data"])
+
+
+def create_event_bus(broadcaster: EventBroadcaster, settings: Optional[Settings] = None) -> EventBus:
+    settings = settings or get_settings()
+    if settings.event_bus_backend == "sqlite":
+        return SQLiteEventBus(
+            settings.database_url.replace("sqlite:///", ""),
+            broadcaster,
+            poll_interval=settings.event_bus_poll_ms / 1000,
+            retention=settings.event_bus_retention,
+            history_size=settings.events_history_size,
+        )
+    if settings.event_bus_backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("EVENT_BUS_BACKEND=redis requires the redis package") from exc
+        return BrokerEventBus(
+            redis.Redis.from_url(settings.event_bus_url or "redis://localhost:6379/0"),
+            broadcaster,
+            channel=settings.event_bus_channel,
+            history_size=settings.events_history_size,
+        )
+    return MemoryEventBus(broadcaster)
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, AsyncGenerator, Deque, Dict, Iterable, List, Optional, Set
+
+from ..config import Settings
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    id: int
+    data: Dict[str, Any]
+    frame: str  # encoded once at publish, shared by every client
+
+
+def format_sse(event_id: int, data: Dict[str, Any]) -> str:
+    return f"id: {event_id}\ndata: {json.dumps(data)}\n\n"
+
+
+class Subscription:
+    """
+    One subscriber's bounded ring buffer, owned by the event loop that
+    created it. The broadcaster appends from any thread; the consumer wakes
+    through an asyncio.Event set on its own loop.
+    """
+
+    def __init__(self, broadcaster: "EventBroadcaster", loop: asyncio.AbstractEventLoop, size: int) -> None:
+        self._broadcaster = broadcaster
+        self.loop = loop
+        self.buffer: Deque[StreamEvent] = deque(maxlen=size)
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.dropped = 0  # events lost to the ring buffer (drop_oldest)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[StreamEvent]:
+        """Next event; None when `timeout` passes first (send a heartbeat) or once closed and drained."""
+        while True:
+            self._ready.clear()
+            if self.buffer:
+                return self.buffer.popleft()
+            if self.closed:
+                return None
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+    def close(self) -> None:
+        self.closed = True
+        self._broadcaster._unsubscribe(self)
+
+    def _wake(self) -> None:
+        self._ready.set()
+
+
+class EventBroadcaster:
+    """
+    Fan-out of pipeline events to every connected dashboard.
+
+    `publish` is safe from any thread (the pipeline runs in the threadpool):
+    it numbers the event, keeps it in a replay history for Last-Event-ID
+    resume, appends it to each subscriber's ring buffer and wakes each
+    subscriber loop once via call_soon_threadsafe. A subscriber whose buffer
+    is full either loses its oldest event (drop_oldest) or is disconnected
+    so the client reconnects and resumes from the history (disconnect).
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 256,
+        history_size: int = 1000,
+        slow_consumer: str = DROP_OLDEST,
+        heartbeat_seconds: float = 15.0,
+    ) -> None:
+        if slow_consumer not in (DROP_OLDEST, DISCONNECT):
+            raise ValueError(f"unknown slow consumer policy: {slow_consumer}")
+        self.buffer_size = buffer_size
+        self.slow_consumer = slow_consumer
+        self.heartbeat_seconds = heartbeat_seconds
+        self._lock = threading.Lock()
+        self._ids = count(1)
+        self._history: Deque[StreamEvent] = deque(maxlen=history_size)
+        self._subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscription]] = {}
+        self._published = 0
+        self._dropped = 0
+        self._disconnected = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "EventBroadcaster":
+        return cls(
+            buffer_size=settings.events_buffer_size,
+            history_size=settings.events_history_size,
+            slow_consumer=settings.events_slow_consumer,
+            heartbeat_seconds=settings.events_heartbeat_seconds,
+        )
+
+    def publish(self, data: Dict[str, Any], event_id: Optional[int] = None) -> StreamEvent:
+        """Deliver `data` to every subscriber; `event_id` is the bus-assigned id when events cross processes."""
+        with self._lock:
+            if event_id is None:
+                event_id = next(self._ids)
+            event = StreamEvent(event_id, data, format_sse(event_id, data))
+            self._history.append(event)
+            self._published += 1
+            woken: Dict[asyncio.AbstractEventLoop, List[Subscription]] = {}
+            for loop, subscriptions in list(self._subscribers.items()):
+                woken[loop] = list(subscriptions)
+                for subscription in woken[loop]:
+                    # The consumer may pop concurrently, so drop counts can be off by one.
+                    if len(subscription.buffer) == self.buffer_size:
+                        if self.slow_consumer == DISCONNECT:
+                            self._disconnect(subscription)
+                            continue
+                        subscription.dropped += 1
+                        self._dropped += 1
+                    subscription.buffer.append(event)
+        self._wake(woken)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber on the running loop, replaying history newer than `last_event_id`."""
+        subscription = Subscription(self, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            if last_event_id is not None:
+                subscription.buffer.extend(event for event in self._history if event.id > last_event_id)
+            self._subscribers.setdefault(subscription.loop, set()).add(subscription)
+        return subscription
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": sum(len(subscriptions) for subscriptions in self._subscribers.values()),
+                "published": self._published,
+                "dropped": self._dropped,
+                "disconnected": self._disconnected,
+                "slow_consumer": self.slow_consumer,
+            }
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._discard(subscription)
+
+    def _disconnect(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        subscription.buffer.clear()
+        self._discard(subscription)
+        self._disconnected += 1
+
+    def _discard(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.loop)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.loop]
+
+    @staticmethod
+    def _wake(loops: Dict[asyncio.AbstractEventLoop, List[Subscription]]) -> None:
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for loop, subscriptions in loops.items():
+            if loop is current:
+                _wake_all(subscriptions)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(_wake_all, subscriptions)
+
+
+def _wake_all(subscriptions: Iterable[Subscription]) -> None:
+    for subscription in subscriptions:
+        subscription._wake()
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def sse_stream(subscription: Subscription, heartbeat_seconds: float) -> AsyncGenerator[str, None]:
+    """SSE frames for one client: events, `: keepalive` comments when idle; ends when disconnected."""
+    try:
+        while True:
+            event = await subscription.get(timeout=heartbeat_seconds)
+            if event is not None:
+                yield event.frame
+            elif subscription.closed:
+                return
+            else:
+                yield ": keepalive\n\n"
+    finally:
+        subscription.close()
@@ -1,7 +1,7 @@
-import asyncio
 import os
+import time
 from datetime import datetime
-from typing import Any, AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import httpx
@@ -9,10 +9,22 @@ from fastapi.concurrency import run_in_threadpool
 
 from ..models.detection import DetectorEngine
 from ..models.graph_intel import GraphIntelEngine
+from ..models.near_duplicate import NearDuplicateIndex
+from ..models.simhash import CampaignMatcher
 from ..models.sharing import SharingEngine
 from ..models.watermark import WatermarkEngine
-from ..schemas import ContentIntake, DetectionResult, SharingPackage, SharingRequest
+from ..schemas import (
+    BatchDetectionResult,
+    BatchStats,
+    ContentIntake,
+    DetectionBreakdown,
+    DetectionResult,
+    SharingPackage,
+    SharingRequest,
+)
 from ..storage.database import Database
+from .event_bus import create_event_bus
+from .events import EventBroadcaster, Subscription
 
 try:
     from ..federated.manager import LedgerManager
@@ -31,7 +43,12 @@ class AnalysisOrchestrator:
         self.graph = GraphIntelEngine()
         self.sharing = SharingEngine()
         self.db = Database()
-        self._event_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=200)
+        self.near_duplicates = (
+            NearDuplicateIndex(self.db) if self.detector.settings.near_duplicate_enabled else None
+        )
+        self.campaigns = CampaignMatcher(self.db) if self.detector.settings.simhash_enabled else None
+        self.events = EventBroadcaster.from_settings(self.detector.settings)
+        self.event_bus = create_event_bus(self.events, self.detector.settings)
         
         # Initialize federated ledger if available
         if FEDERATED_ENABLED:
@@ -46,15 +63,26 @@ class AnalysisOrchestrator:
             self.node = None
 
     async def process_intake(self, intake: ContentIntake) -> DetectionResult:
-        return await run_in_threadpool(self._process_sync, intake)
+        detection = None
+        if self.detector.settings.detection_concurrent_stages:
+            detection = await self.detector.detect_async(intake)
+        return await run_in_threadpool(self._process_sync, intake, detection)
+
+    async def process_batch(self, intakes: List[ContentIntake]) -> BatchDetectionResult:
+        return await run_in_threadpool(self._process_batch_sync, intakes)
 
-    def _process_sync(self, intake: ContentIntake) -> DetectionResult:
+    def _process_sync(
+        self, intake: ContentIntake, detection: Optional[Tuple[float, str, DetectionBreakdown]] = None
+    ) -> DetectionResult:
         intake_id = str(uuid4())
         submitted_at = datetime.utcnow()
 
-        composite_score, classification, breakdown = self.detector.detect(intake)
+        composite_score, classification, breakdown = detection or self.detector.detect(intake)
         provenance = self.watermark.verify(intake.text)
-        graph_summary = self.graph.ingest(intake_id, intake, classification, composite_score)
+        simhash, near_duplicates = self._match_campaign(intake_id, intake.text)
+        graph_summary = self.graph.ingest(
+            intake_id, intake, classification, composite_score, near_duplicates=near_duplicates
+        )
 
         summary_text = self._generate_summary(intake, classification, composite_score, breakdown)
         decision_reason = self._build_decision_reason(classification, composite_score, breakdown)
@@ -79,7 +107,9 @@ class AnalysisOrchestrator:
 
         # Store fingerprint for post-hoc verification
         try:
-            self.db.store_fingerprint(intake_id, intake.text, provenance.content_hash)
+            self.db.store_fingerprint(intake_id, intake.text, provenance.content_hash, simhash=simhash)
+            if self.near_duplicates is not None:
+                self.near_duplicates.add(intake_id, intake.text)
         except Exception:
             # non-fatal; continue
             pass
@@ -97,25 +127,165 @@ class AnalysisOrchestrator:
             decision_reason=decision_reason,
         )
 
+        self._emit_analysis_event(result)
+        return result
+
+    def _process_batch_sync(self, intakes: List[ContentIntake]) -> BatchDetectionResult:
+        """
+        Batch pipeline: detection over the whole batch (HF forward passes are
+        batched), one graph ingest + summary, and a single SQLite transaction
+        for every case, audit row and fingerprint.
+        """
+        started = time.perf_counter()
+        submitted_at = datetime.utcnow()
+        intake_ids = [str(uuid4()) for _ in intakes]
+
+        detections = self.detector.detect_batch(intakes)
+        provenances = [self.watermark.verify(intake.text) for intake in intakes]
+        campaign_matches = [
+            self._match_campaign(intake_id, intake.text) for intake_id, intake in zip(intake_ids, intakes)
+        ]
+        detected = time.perf_counter()
+
+        graph_summary = self.graph.ingest_batch(
+            [
+                (intake_id, intake, classification, composite_score)
+                for intake_id, intake, (composite_score, classification, _) in zip(
+                    intake_ids, intakes, detections
+                )
+            ],
+            [near_duplicates for _, near_duplicates in campaign_matches],
+        )
+        ingested = time.perf_counter()
+
+        results: List[DetectionResult] = []
+        cases: List[Dict[str, Any]] = []
+        actions: List[Dict[str, Any]] = []
+        fingerprints: List[Dict[str, Any]] = []
+        for intake_id, intake, (composite_score, classification, breakdown), provenance, (simhash, _) in zip(
+            intake_ids, intakes, detections, provenances, campaign_matches
+        ):
+            summary_text = self._generate_summary(intake, classification, composite_score, breakdown)
+            decision_reason = self._build_decision_reason(classification, composite_score, breakdown)
+            cases.append(
+                {
+                    "intake_id": intake_id,
+                    "raw_text": intake.text,
+                    "classification": classification,
+                    "composite_score": composite_score,
+                    "metadata": intake.dict().get("metadata", {}) or {},
+                    "breakdown": breakdown.dict(),
+                    "provenance": provenance.dict(),
+                    "summary": summary_text,
+                    "decision_reason": decision_reason,
+                }
+            )
+            actions.append(
+                {
+                    "intake_id": intake_id,
+                    "action": "analysis_completed",
+                    "actor": "system",
+                    "payload": {"score": composite_score, "classification": classification},
+                }
+            )
+            fingerprints.append(
+                {
+                    "intake_id": intake_id,
+                    "text": intake.text,
+                    "content_hash": provenance.content_hash,
+                    "simhash": simhash,
+                }
+            )
+            results.append(
+                DetectionResult(
+                    intake_id=intake_id,
+                    submitted_at=submitted_at,
+                    composite_score=composite_score,
+                    classification=classification,
+                    breakdown=breakdown,
+                    provenance=provenance,
+                    summary=summary_text,
+                    findings=breakdown.heuristics[:5] if breakdown.heuristics else None,
+                    decision_reason=decision_reason,
+                )
+            )
+
+        self.db.save_batch(cases=cases, actions=actions, fingerprints=fingerprints)
+        # Near-duplicate index, as in _process_sync: the batch is already persisted
+        try:
+            if self.near_duplicates is not None:
+                self.near_duplicates.add_many([(item["intake_id"], item["text"]) for item in fingerprints])
+        except Exception:
+            # non-fatal; continue
+            pass
+        finished = time.perf_counter()
+
+        for result in results:
+            self._emit_analysis_event(result)
+
+        elapsed = finished - started
+        return BatchDetectionResult(
+            results=results,
+            graph_summary=graph_summary,
+            stats=BatchStats(
+                items=len(results),
+                elapsed_ms=round(elapsed * 1000, 2),
+                items_per_second=round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+                detection_ms=round((detected - started) * 1000, 2),
+                graph_ms=round((ingested - detected) * 1000, 2),
+                persistence_ms=round((finished - ingested) * 1000, 2),
+            ),
+        )
+
+    def _emit_analysis_event(self, result: DetectionResult) -> None:
         self._emit_event(
             {
                 "type": "analysis_completed",
-                "intake_id": intake_id,
-                "score": composite_score,
-                "classification": classification,
-                "submitted_at": submitted_at.isoformat(),
+                "intake_id": result.intake_id,
+                "score": result.composite_score,
+                "classification": result.classification,
+                "submitted_at": result.submitted_at.isoformat(),
             }
         )
-        return result
 
-    async def stream_events(self) -> AsyncGenerator[Dict[str, Any], None]:
-        while True:
-            event = await self._event_queue.get()
-            yield event
+    def subscribe_events(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Subscribe on the running loop; the first subscriber starts tailing the event bus."""
+        self.event_bus.start()
+        return self.events.subscribe(last_event_id)
+
+    async def stream_events(self, last_event_id: Optional[int] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        subscription = self.subscribe_events(last_event_id)
+        try:
+            while True:
+                event = await subscription.get()
+                if event is None:  # disconnected as a slow consumer
+                    return
+                yield event.data
+        finally:
+            subscription.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Runtime counters for the pipeline's shared components."""
+        return {
+            **self.detector.metrics(),
+            "persistence": self.db.persistence_metrics(),
+            "events": {**self.events.metrics(), "bus": self.event_bus.metrics()},
+        }
+
+    def _match_campaign(self, intake_id: str, text: str) -> Tuple[Optional[int], List[str]]:
+        """SimHash of the text and earlier intakes it copies (within SIMHASH_MAX_DISTANCE bits)."""
+        if self.campaigns is None:
+            return None, []
+        return self.campaigns.match(intake_id, text)
 
     def check_fingerprint(self, text: str) -> list[Dict[str, Any]]:
         return self.db.check_fingerprint(text)
 
+    def check_near_duplicates(self, text: str) -> list[Dict[str, Any]]:
+        if self.near_duplicates is None:
+            return []
+        return self.near_duplicates.query(text)
+
     async def _fetch_case_from_main_api(self, intake_id: str) -> Optional[Dict[str, Any]]:
         """Fetch case data from main API if not found locally (for federated nodes)."""
         main_api_url = os.getenv("MAIN_API_URL", "http://localhost:8000")
@@ -140,7 +310,7 @@ class AnalysisOrchestrator:
         return None
 
     async def build_sharing_package(self, request: SharingRequest) -> SharingPackage:
-        record = self.db.fetch_case(request.intake_id)
+        record = await run_in_threadpool(self.db.fetch_case, request.intake_id)
         
         # If not found locally, try fetching from main API (for federated nodes)
         if not record:
@@ -312,12 +482,8 @@ class AnalysisOrchestrator:
         return " ".join(reason_parts)
 
     def _emit_event(self, event: Dict[str, Any]) -> None:
-        try:
-            self._event_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            # Drop oldest if backpressure occurs
-            self._event_queue.get_nowait()
-            self._event_queue.put_nowait(event)
+        # Safe from threadpool threads; the bus delivers it to every worker's subscribers.
+        self.event_bus.publish(event)
 
     def _determine_policy(self, request: SharingRequest) -> list[str]:
         policy = ["classified:restricted"]
@@ -1,78 +1,106 @@
 import hashlib
 import json
-import sqlite3
-from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..config import get_settings
+from .migrations import migrate
+from .pool import get_pool
+from .write_behind import WriteBehindQueue, acquire_writer, release_writer
 
 
 class Database:
+    _CASE_INSERT = """
+                INSERT OR REPLACE INTO cases (
+                    intake_id,
+                    raw_text,
+                    classification,
+                    composite_score,
+                    metadata_json,
+                    breakdown_json,
+                    provenance_json,
+                    summary_text,
+                    decision_reason,
+                    created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+    _AUDIT_INSERT = """
+                INSERT INTO audit_log (intake_id, action, actor, payload, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """
+    _FINGERPRINT_INSERT = """
+                INSERT INTO fingerprints (intake_id, content_hash, normalized_hash, simhash, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """
+
     def __init__(self) -> None:
         settings = get_settings()
         self.path = settings.database_url.replace("sqlite:///", "")
         Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.path)
         self._initialise()
+        # write_behind: case/audit/fingerprint rows are group-committed by a writer
+        # thread, shared by every Database on the same file (reads flush it).
+        self.durability_mode = settings.db_durability_mode
+        self._writer: Optional[WriteBehindQueue] = None
+        self._released = False
+        if self.durability_mode == "write_behind":
+            self._writer = acquire_writer(
+                self._pool,
+                max_rows=settings.db_write_behind_max_rows,
+                flush_interval_ms=settings.db_write_behind_flush_ms,
+                flush_rows=settings.db_write_behind_flush_rows,
+            )
 
     def _initialise(self) -> None:
-        with self._cursor() as cur:
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS cases (
-                    intake_id TEXT PRIMARY KEY,
-                    raw_text TEXT NOT NULL,
-                    classification TEXT NOT NULL,
-                    composite_score REAL NOT NULL,
-                    metadata_json TEXT,
-                    breakdown_json TEXT,
-                    provenance_json TEXT,
-                    summary_text TEXT,
-                    decision_reason TEXT,
-                    created_at TEXT NOT NULL
-                )
-            """
-            )
-            cur.execute("PRAGMA table_info(cases)")
-            columns = {row[1] for row in cur.fetchall()}
-            if "summary_text" not in columns:
-                cur.execute("ALTER TABLE cases ADD COLUMN summary_text TEXT")
-            if "decision_reason" not in columns:
-                cur.execute("ALTER TABLE cases ADD COLUMN decision_reason TEXT")
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS audit_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    intake_id TEXT,
-                    action TEXT NOT NULL,
-                    actor TEXT NOT NULL,
-                    payload TEXT,
-                    created_at TEXT NOT NULL
-                )
-            """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS fingerprints (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    intake_id TEXT NOT NULL,
-                    content_hash TEXT NOT NULL,
-                    normalized_hash TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                )
-            """
-            )
+        """Create or upgrade the schema; see migrations.py for the versioned steps."""
+        migrate(self._pool.connection())
 
-    @contextmanager
     def _cursor(self):
-        conn = sqlite3.connect(self.path)
-        try:
-            cur = conn.cursor()
-            yield cur
-            conn.commit()
-        finally:
-            conn.close()
+        return self._pool.cursor()
+
+    def _write(self, writes: List[Tuple[str, Tuple]]) -> None:
+        """Run inserts in one transaction now (strict) or hand them to the writer thread."""
+        if self._writer is not None:
+            self._writer.enqueue(writes)
+            return
+        with self._cursor() as cur:
+            for sql, params in writes:
+                cur.execute(sql, params)
+
+    def _read_cursor(self):
+        """
+        Cursor for reads; write-behind rows enqueued before the call are
+        committed first. Blocking: async handlers call reads via the threadpool.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        return self._cursor()
+
+    def _committed_cursor(self):
+        """
+        Cursor for tailing reads that only need rows other workers committed:
+        no write-behind flush, so queued rows from this process stay invisible.
+        The in-memory indexes already hold those, so intakes keep group-committing.
+        """
+        return self._cursor()
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Commit anything queued; the last Database on the file stops the writer thread."""
+        if self._writer is not None and not self._released:
+            self._released = True
+            release_writer(self._writer)
+
+    def persistence_metrics(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {"durability_mode": self.durability_mode}
+        if self._writer is not None:
+            metrics.update(self._writer.metrics())
+        return metrics
 
     def save_case(
         self,
@@ -86,54 +114,171 @@ class Database:
         summary: Optional[str] = None,
         decision_reason: Optional[str] = None,
     ) -> None:
-        with self._cursor() as cur:
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO cases (
-                    intake_id,
-                    raw_text,
-                    classification,
-                    composite_score,
-                    metadata_json,
-                    breakdown_json,
-                    provenance_json,
-                    summary_text,
-                    decision_reason,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._write(
+            [
                 (
-                    intake_id,
-                    raw_text,
-                    classification,
-                    composite_score,
-                    json.dumps(metadata),
-                    json.dumps(breakdown),
-                    json.dumps(provenance),
-                    summary,
-                    decision_reason,
-                    datetime.utcnow().isoformat(),
-                ),
+                    self._CASE_INSERT,
+                    self._case_row(
+                        intake_id,
+                        raw_text,
+                        classification,
+                        composite_score,
+                        metadata,
+                        breakdown,
+                        provenance,
+                        summary,
+                        decision_reason,
+                    ),
+                )
+            ]
+        )
+
+    def save_batch(
+        self,
+        cases: List[Dict[str, Any]],
+        actions: List[Dict[str, Any]],
+        fingerprints: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Persist cases, audit rows and fingerprints for a whole batch in a single
+        transaction. Each dict uses the keyword arguments of save_case,
+        log_action and store_fingerprint respectively.
+        """
+        case_rows = [self._case_row(**case) for case in cases]
+        audit_rows = [self._audit_row(**action) for action in actions]
+        fingerprint_rows = [self._fingerprint_row(**item) for item in fingerprints]
+        if self._writer is not None:
+            self._writer.enqueue(
+                [(self._CASE_INSERT, row) for row in case_rows]
+                + [(self._AUDIT_INSERT, row) for row in audit_rows]
+                + [(self._FINGERPRINT_INSERT, row) for row in fingerprint_rows]
             )
+            return
+        with self._cursor() as cur:
+            cur.executemany(self._CASE_INSERT, case_rows)
+            cur.executemany(self._AUDIT_INSERT, audit_rows)
+            cur.executemany(self._FINGERPRINT_INSERT, fingerprint_rows)
+
+    @staticmethod
+    def _case_row(
+        intake_id: str,
+        raw_text: str,
+        classification: str,
+        composite_score: float,
+        metadata: Dict[str, Any],
+        breakdown: Dict[str, Any],
+        provenance: Dict[str, Any],
+        summary: Optional[str] = None,
+        decision_reason: Optional[str] = None,
+    ) -> Tuple:
+        return (
+            intake_id,
+            raw_text,
+            classification,
+            composite_score,
+            json.dumps(metadata),
+            json.dumps(breakdown),
+            json.dumps(provenance),
+            summary,
+            decision_reason,
+            datetime.utcnow().isoformat(),
+        )
+
+    @staticmethod
+    def _audit_row(intake_id: str, action: str, actor: str, payload: Dict[str, Any]) -> Tuple:
+        return (
+            intake_id,
+            action,
+            actor,
+            json.dumps(payload),
+            datetime.utcnow().isoformat(),
+        )
+
+    def _fingerprint_row(
+        self, intake_id: str, text: str, content_hash: str, simhash: Optional[int] = None
+    ) -> Tuple:
+        normalized_hash = hashlib.sha256(self._normalize_text(text).encode("utf-8")).hexdigest()
+        if simhash is not None and simhash >= 1 << 63:
+            simhash -= 1 << 64  # SQLite integers are signed 64-bit
+        return (intake_id, content_hash, normalized_hash, simhash, datetime.utcnow().isoformat())
 
     def _normalize_text(self, text: str) -> str:
         # simple normalization for fuzzy match: lowercase and collapse whitespace
         return "".join(text.lower().split())
 
-    def store_fingerprint(self, intake_id: str, text: str, content_hash: str) -> None:
-        normalized_hash = hashlib.sha256(self._normalize_text(text).encode("utf-8")).hexdigest()
-        with self._cursor() as cur:
+    def store_fingerprint(
+        self, intake_id: str, text: str, content_hash: str, simhash: Optional[int] = None
+    ) -> None:
+        self._write([(self._FINGERPRINT_INSERT, self._fingerprint_row(intake_id, text, content_hash, simhash))])
+
+    def load_simhashes(self, limit: int, after_id: int = 0) -> Tuple[List[Tuple[str, int]], int]:
+        """
+        The newest `limit` (intake_id, simhash) pairs with id > `after_id`,
+        oldest first, as unsigned ints, plus the id of the last one.
+        """
+        with self._committed_cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, intake_id, simhash FROM (
+                    SELECT id, intake_id, simhash FROM fingerprints
+                    WHERE simhash IS NOT NULL AND id > ? ORDER BY id DESC LIMIT ?
+                ) ORDER BY id
+            """,
+                (after_id, limit),
+            )
+            rows = cur.fetchall()
+        last_id = rows[-1][0] if rows else after_id
+        return [(intake_id, value & 0xFFFFFFFFFFFFFFFF) for _, intake_id, value in rows], last_id
+
+    _MINHASH_INSERT = """
+                INSERT OR REPLACE INTO near_duplicate_signatures
+                (intake_id, scheme, signature, band_keys, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """
+
+    def store_minhashes(self, scheme: str, rows: List[Tuple[str, bytes, bytes]]) -> None:
+        """Persist (intake_id, signature, band_keys) rows for NearDuplicateIndex."""
+        created_at = datetime.utcnow().isoformat()
+        self._write(
+            [
+                (self._MINHASH_INSERT, (intake_id, scheme, signature, band_keys, created_at))
+                for intake_id, signature, band_keys in rows
+            ]
+        )
+
+    def load_minhash_band_keys(self, scheme: str, after_rowid: int = 0) -> Tuple[List[str], List[bytes], int]:
+        """(intake_ids, band_keys, last rowid) of rows written after `after_rowid`, in write order."""
+        with self._committed_cursor() as cur:
             cur.execute(
                 """
-                INSERT INTO fingerprints (intake_id, content_hash, normalized_hash, created_at)
-                VALUES (?, ?, ?, ?)
+                SELECT rowid, intake_id, band_keys FROM near_duplicate_signatures
+                WHERE scheme = ? AND rowid > ? ORDER BY rowid
             """,
-                (intake_id, content_hash, normalized_hash, datetime.utcnow().isoformat()),
+                (scheme, after_rowid),
             )
+            rows = cur.fetchall()
+        last_rowid = rows[-1][0] if rows else after_rowid
+        return [row[1] for row in rows], [row[2] for row in rows], last_rowid
+
+    def fetch_minhashes(self, scheme: str, intake_ids: List[str]) -> Dict[str, bytes]:
+        """Committed signatures only; NearDuplicateIndex keeps its own queued ones in memory."""
+        found: Dict[str, bytes] = {}
+        with self._committed_cursor() as cur:
+            for start in range(0, len(intake_ids), 500):  # stay under SQLite's variable limit
+                chunk = intake_ids[start : start + 500]
+                cur.execute(
+                    f"""
+                    SELECT intake_id, signature FROM near_duplicate_signatures
+                    WHERE scheme = ? AND intake_id IN ({",".join("?" * len(chunk))})
+                """,
+                    (scheme, *chunk),
+                )
+                found.update(cur.fetchall())
+        return found
 
     def check_fingerprint(self, text: str) -> list[Dict[str, Any]]:
         normalized_hash = hashlib.sha256(self._normalize_text(text).encode("utf-8")).hexdigest()
-        with self._cursor() as cur:
+        with self._read_cursor() as cur:
             cur.execute(
                 """
                 SELECT intake_id, content_hash, normalized_hash, created_at
@@ -154,7 +299,7 @@ class Database:
             ]
 
     def fetch_case(self, intake_id: str) -> Optional[Dict[str, Any]]:
-        with self._cursor() as cur:
+        with self._read_cursor() as cur:
             cur.execute(
                 """
                 SELECT
@@ -190,17 +335,4 @@ class Database:
             }
 
     def log_action(self, intake_id: str, action: str, actor: str, payload: Dict[str, Any]):
-        with self._cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO audit_log (intake_id, action, actor, payload, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    intake_id,
-                    action,
-                    actor,
-                    json.dumps(payload),
-                    datetime.utcnow().isoformat(),
-                ),
-            )
+        self._write([(self._AUDIT_INSERT, self._audit_row(intake_id, action, actor, payload))])
@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import Settings, get_settings
+from .migrations import migrate
+from .pool import get_pool
+
+GraphEvent = Dict[str, Any]
+
+
+class GraphStore:
+    """
+    Persistence interface for GraphIntelEngine.
+
+    The graph is derived entirely from ingest events, so a store only has to
+    append events and hand them back in order. Event ids are monotonic across
+    every process sharing the store, which lets each worker catch up on
+    intakes processed elsewhere.
+    """
+
+    def append(self, event: GraphEvent) -> int:
+        return self.append_many([event])[0]
+
+    def append_many(self, events: List[GraphEvent]) -> List[int]:
+        """Persist events atomically; returns their (contiguous) ids."""
+        raise NotImplementedError
+
+    def events_between(self, after_id: int, before_id: Optional[int] = None) -> List[Tuple[int, GraphEvent]]:
+        """Events with after_id < id < before_id (open-ended when before_id is None)."""
+        raise NotImplementedError
+
+    def recent_events(self, limit: int, since: Optional[str] = None) -> List[Tuple[int, GraphEvent]]:
+        """The newest `limit` events created at or after `since`, oldest first."""
+        raise NotImplementedError
+
+    def last_event_id(self) -> int:
+        raise NotImplementedError
+
+    def prune(self, before: str, keep_last: int) -> int:
+        """
+        Delete events created before `before` or older than the newest
+        `keep_last`; replay never reaches them. Returns the rows removed.
+        """
+        return 0
+
+
+class MemoryGraphStore(GraphStore):
+    """Process-local store: nothing is persisted (the original behaviour)."""
+
+    def __init__(self) -> None:
+        self._last_id = 0
+
+    def append_many(self, events: List[GraphEvent]) -> List[int]:
+        first = self._last_id + 1
+        self._last_id += len(events)
+        return list(range(first, self._last_id + 1))
+
+    def events_between(self, after_id: int, before_id: Optional[int] = None) -> List[Tuple[int, GraphEvent]]:
+        return []
+
+    def recent_events(self, limit: int, since: Optional[str] = None) -> List[Tuple[int, GraphEvent]]:
+        return []
+
+    def last_event_id(self) -> int:
+        return self._last_id
+
+
+class SQLiteGraphStore(GraphStore):
+    """Append-only graph event log in SQLite, shared by all workers."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.path)
+        self._initialise()
+
+    def _initialise(self) -> None:
+        """graph_events is created by migration 6 (migrations.py)."""
+        migrate(self._pool.connection())
+
+    def _cursor(self):
+        return self._pool.cursor()
+
+    def append_many(self, events: List[GraphEvent]) -> List[int]:
+        ids: List[int] = []
+        with self._cursor() as cur:
+            for event in events:
+                cur.execute(
+                    "INSERT INTO graph_events (intake_id, payload, created_at) VALUES (?, ?, ?)",
+                    (event["intake_id"], json.dumps(event), event["ts"]),
+                )
+                ids.append(int(cur.lastrowid))
+        return ids
+
+    def events_between(self, after_id: int, before_id: Optional[int] = None) -> List[Tuple[int, GraphEvent]]:
+        with self._cursor() as cur:
+            if before_id is None:
+                cur.execute(
+                    "SELECT id, payload FROM graph_events WHERE id > ? ORDER BY id",
+                    (after_id,),
+                )
+            else:
+                cur.execute(
+                    "SELECT id, payload FROM graph_events WHERE id > ? AND id < ? ORDER BY id",
+                    (after_id, before_id),
+                )
+            return [(row[0], json.loads(row[1])) for row in cur.fetchall()]
+
+    def recent_events(self, limit: int, since: Optional[str] = None) -> List[Tuple[int, GraphEvent]]:
+        with self._cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, payload FROM graph_events
+                WHERE created_at >= ?
+                ORDER BY id DESC
+                LIMIT ?
+            """,
+                (since or "", limit),
+            )
+            rows = cur.fetchall()
+        return [(row[0], json.loads(row[1])) for row in reversed(rows)]
+
+    def last_event_id(self) -> int:
+        with self._cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM graph_events")
+            return int(cur.fetchone()[0])
+
+
+    def prune(self, before: str, keep_last: int) -> int:
+        with self._cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM graph_events
+                WHERE created_at < ?
+                   OR id <= (SELECT MAX(id) FROM graph_events) - ?
+            """,
+                (before, keep_last),
+            )
+            return cur.rowcount
+
+
+def create_graph_store(settings: Optional[Settings] = None) -> GraphStore:
+    settings = settings or get_settings()
+    if settings.graph_store_backend == "sqlite":
+        return SQLiteGraphStore(settings.database_url.replace("sqlite:///", ""))
+    return MemoryGraphStore()
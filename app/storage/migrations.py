@@ -0,0 +1,161 @@
+import sqlite3
+from typing import List, Tuple
+
+# (version, statements). Append new migrations; never edit one that has shipped.
+MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (
+        1,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS cases (
+                intake_id TEXT PRIMARY KEY,
+                raw_text TEXT NOT NULL,
+                classification TEXT NOT NULL,
+                composite_score REAL NOT NULL,
+                metadata_json TEXT,
+                breakdown_json TEXT,
+                provenance_json TEXT,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS audit_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                intake_id TEXT,
+                action TEXT NOT NULL,
+                actor TEXT NOT NULL,
+                payload TEXT,
+                created_at TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                intake_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                normalized_hash TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        [
+            "ALTER TABLE cases ADD COLUMN summary_text TEXT",
+            "ALTER TABLE cases ADD COLUMN decision_reason TEXT",
+        ],
+    ),
+    (
+        3,
+        [
+            "CREATE INDEX IF NOT EXISTS idx_fingerprints_normalized_hash ON fingerprints (normalized_hash)",
+            "CREATE INDEX IF NOT EXISTS idx_fingerprints_content_hash ON fingerprints (content_hash)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_log_intake_created ON audit_log (intake_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_cases_created_classification ON cases (created_at, classification)",
+        ],
+    ),
+    (
+        4,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS near_duplicate_signatures (
+                intake_id TEXT PRIMARY KEY,
+                scheme TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                band_keys BLOB NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+    (
+        5,
+        ["ALTER TABLE fingerprints ADD COLUMN simhash INTEGER"],
+    ),
+    (
+        6,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS graph_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                intake_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_graph_events_created_at ON graph_events (created_at)",
+        ],
+    ),
+    (
+        7,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS result_cache (
+                namespace TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, model_id, content_hash)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_result_cache_created_at ON result_cache (created_at)",
+        ],
+    ),
+    (
+        8,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS stream_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+        ],
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _legacy_version(cur: sqlite3.Cursor) -> int:
+    """
+    Version of a database created before schema versioning (user_version 0).
+    The pre-versioning code always created all three tables and later added the
+    summary columns in place, so the cases columns tell v1 from v2.
+    """
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cases'")
+    if cur.fetchone() is None:
+        return 0
+    cur.execute("PRAGMA table_info(cases)")
+    columns = {row[1] for row in cur.fetchall()}
+    return 2 if {"summary_text", "decision_reason"} <= columns else 1
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Bring the database up to SCHEMA_VERSION, tracked in PRAGMA user_version.
+    Each migration runs in its own IMMEDIATE transaction together with the
+    version bump, so concurrent workers apply it exactly once.
+    """
+    cur = conn.cursor()
+    try:
+        for version, statements in MIGRATIONS:
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                current = cur.execute("PRAGMA user_version").fetchone()[0]
+                if current == 0:
+                    current = _legacy_version(cur)
+                if version > current:
+                    for statement in statements:
+                        cur.execute(statement)
+                cur.execute(f"PRAGMA user_version = {max(version, current)}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return cur.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        cur.close()
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from ..config import Settings, get_settings
+
+
+class ConnectionPool:
+    """
+    One reusable SQLite connection per thread for a single database file.
+
+    FastAPI's threadpool reuses worker threads, so each worker keeps its
+    connection across requests instead of paying for connect/close on every
+    query. Connections are opened in WAL mode (readers no longer block the
+    writer) with synchronous, mmap_size and cache_size taken from Settings.
+    Connections left behind by finished threads are closed on the next open.
+    """
+
+    def __init__(self, path: str, settings: Optional[Settings] = None) -> None:
+        self.path = path
+        settings = settings or get_settings()
+        self._pragmas = (
+            "PRAGMA journal_mode=WAL",
+            f"PRAGMA synchronous={settings.sqlite_synchronous}",
+            f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+            f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}",  # negative = KiB
+            "PRAGMA busy_timeout=5000",
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for pragma in self._pragmas:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                for thread in [thread for thread in self._connections if not thread.is_alive()]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    @contextmanager
+    def cursor(self):
+        """Same contract as the old per-call _cursor: commit on success, discard on error."""
+        conn = self.connection()
+        cur = conn.cursor()
+        try:
+            yield cur
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: str) -> ConnectionPool:
+    """Process-wide pool for `path`; every store on the same file shares it."""
+    key = os.path.abspath(path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(path)
+        return pool
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import Settings, get_settings
+from .migrations import migrate
+from .pool import get_pool
+
+CacheKey = Tuple[str, str, str]  # (namespace, model identity, content hash)
+_PURGE_INTERVAL_SECONDS = 3600.0  # at most one expired-row sweep per hour (or per TTL)
+
+
+class ResultCache:
+    """
+    Two-tier cache for expensive model outputs, keyed on normalised content.
+
+    Reposted copies of a text (differing only in whitespace) map to the same
+    SHA-256 content hash. Lookups hit an in-process LRU first, then the
+    `result_cache` SQLite table shared by every worker; both tiers expire
+    entries after `ttl_seconds`; expired rows are purged from the table by
+    the next write after each purge interval. The model identity is part of
+    the key, and `invalidate` drops rows written by any other identity, so
+    swapping a checkpoint never serves stale scores. None results are never
+    cached.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400,
+    ) -> None:
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._next_purge = 0.0
+        self._purged = 0
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._pool = get_pool(self.path)
+            self._initialise()
+
+    def _initialise(self) -> None:
+        """result_cache is created by migration 7 (migrations.py)."""
+        migrate(self._pool.connection())
+
+    def _cursor(self):
+        return self._pool.cursor()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        normalised = " ".join(text.split())
+        return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, model_id: str, text: str) -> Optional[Any]:
+        return self.get_many(namespace, model_id, [text])[0]
+
+    def get_many(self, namespace: str, model_id: str, texts: List[str]) -> List[Optional[Any]]:
+        now = time.time()
+        keys = [(namespace, model_id, self.content_hash(text)) for text in texts]
+        results: List[Optional[Any]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        with self._lock:
+            stats = self._namespace_stats(namespace)
+            for idx, key in enumerate(keys):
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[0] <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    results[idx] = entry[1]
+                    stats["memory_hits"] += 1
+                else:
+                    pending.setdefault(key[2], []).append(idx)
+
+        if pending and self.path:
+            found = self._load(namespace, model_id, list(pending), now)
+            with self._lock:
+                stats = self._namespace_stats(namespace)
+                for digest, (created_at, value) in found.items():
+                    self._remember((namespace, model_id, digest), created_at, value)
+                    for idx in pending.pop(digest):
+                        results[idx] = value
+                        stats["disk_hits"] += 1
+
+        with self._lock:
+            self._namespace_stats(namespace)["misses"] += sum(len(idxs) for idxs in pending.values())
+        return results
+
+    def set(self, namespace: str, model_id: str, text: str, value: Any) -> None:
+        self.set_many(namespace, model_id, [text], [value])
+
+    def set_many(self, namespace: str, model_id: str, texts: List[str], values: List[Any]) -> None:
+        now = time.time()
+        entries = [
+            (self.content_hash(text), value) for text, value in zip(texts, values) if value is not None
+        ]
+        if not entries:
+            return
+        with self._lock:
+            for digest, value in entries:
+                self._remember((namespace, model_id, digest), now, value)
+        rows = [(namespace, model_id, digest, json.dumps(value), now) for digest, value in entries]
+        if self.path:
+            with self._cursor() as cur:
+                cur.executemany(
+                    """
+                    INSERT OR REPLACE INTO result_cache
+                    (namespace, model_id, content_hash, payload, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+            with self._lock:
+                due = now >= self._next_purge
+                if due:
+                    self._next_purge = now + min(max(self.ttl_seconds, 0.0), _PURGE_INTERVAL_SECONDS)
+            if due:
+                self.purge_expired(now)
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Delete rows older than the TTL from the table; returns how many went."""
+        if not self.path:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.ttl_seconds
+        with self._cursor() as cur:
+            cur.execute("DELETE FROM result_cache WHERE created_at < ?", (cutoff,))
+            removed = cur.rowcount
+        with self._lock:
+            self._purged += removed
+        return removed
+
+    def invalidate(self, namespace: str, current_model_id: str) -> None:
+        """Forget every entry in `namespace` not produced by `current_model_id`."""
+        with self._lock:
+            for key in [key for key in self._memory if key[0] == namespace and key[1] != current_model_id]:
+                del self._memory[key]
+        if self.path:
+            with self._cursor() as cur:
+                cur.execute(
+                    "DELETE FROM result_cache WHERE namespace = ? AND model_id != ?",
+                    (namespace, current_model_id),
+                )
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {name: dict(stats) for name, stats in self._stats.items()}
+            size = len(self._memory)
+        for stats in namespaces.values():
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return {
+            "memory_entries": size,
+            "persistent": bool(self.path),
+            "purged_rows": self._purged,
+            "namespaces": namespaces,
+        }
+
+    def _load(
+        self, namespace: str, model_id: str, digests: List[str], now: float
+    ) -> Dict[str, Tuple[float, Any]]:
+        found: Dict[str, Tuple[float, Any]] = {}
+        with self._cursor() as cur:
+            for start in range(0, len(digests), 500):  # stay under SQLite's variable limit
+                chunk = digests[start : start + 500]
+                cur.execute(
+                    f"""
+                    SELECT content_hash, payload, created_at FROM result_cache
+                    WHERE namespace = ? AND model_id = ? AND created_at >= ?
+                    AND content_hash IN ({",".join("?" * len(chunk))})
+                """,
+                    (namespace, model_id, now - self.ttl_seconds, *chunk),
+                )
+                for digest, payload, created_at in cur.fetchall():
+                    found[digest] = (created_at, json.loads(payload))
+        return found
+
+    def _remember(self, key: CacheKey, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _namespace_stats(self, namespace: str) -> Dict[str, int]:
+        return self._stats.setdefault(namespace, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+
+
+def create_result_cache(settings: Optional[Settings] = None) -> Optional[ResultCache]:
+    settings = settings or get_settings()
+    if not settings.result_cache_enabled:
+        return None
+    path = None
+    if settings.result_cache_backend == "sqlite":
+        path = settings.database_url.replace("sqlite:///", "")
+    return ResultCache(
+        path,
+        max_entries=settings.result_cache_max_entries,
+        ttl_seconds=settings.result_cache_ttl_seconds,
+    )
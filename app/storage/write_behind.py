@@ -0,0 +1,203 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+Write = Tuple[str, Tuple]  # (SQL statement, parameters)
+
+_COMMIT_ATTEMPTS = 3  # group commit tries before falling back to row-by-row
+_RETRY_BACKOFF_SECONDS = 0.05  # doubled after each failed attempt
+
+
+class WriteBehindQueue:
+    """
+    Group-commit writer for Database in DB_DURABILITY_MODE=write_behind.
+
+    Callers enqueue (sql, params) rows and return immediately. One writer
+    thread drains the queue every `flush_interval_ms` or as soon as
+    `flush_rows` rows are waiting, and commits each group in a single
+    transaction (one fsync instead of one per row). The queue is bounded:
+    when it holds `max_rows`, enqueue blocks until the writer catches up.
+
+    Every row gets a sequence number when enqueued and the writer advances
+    a commit watermark behind it, so `flush()` waits only for rows enqueued
+    before the call, never for rows other threads keep adding. A group that
+    fails is retried with backoff, then committed row by row so one bad row
+    does not discard the rest; rows that still fail are counted.
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        max_rows: int = 10000,
+        flush_interval_ms: float = 50,
+        flush_rows: int = 500,
+    ) -> None:
+        self.pool = pool
+        self.max_rows = max(1, max_rows)
+        self.flush_interval = max(0.001, flush_interval_ms / 1000)
+        self.flush_rows = max(1, flush_rows)
+        self._pending: Deque[Write] = deque()
+        self._cond = threading.Condition()
+        self._enqueued_seq = 0  # sequence number of the newest enqueued row
+        self._committed_seq = 0  # every row up to here has been written (or given up on)
+        self._flush_waiters = 0
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "flushes": 0,
+            "errors": 0,
+            "retries": 0,
+            "failed_rows": 0,
+            "blocked": 0,
+        }
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._worker.start()
+
+    def enqueue(self, writes: List[Write]) -> None:
+        with self._cond:
+            for write in writes:
+                if self._stopped:
+                    raise RuntimeError("write-behind queue is stopped")
+                if len(self._pending) >= self.max_rows:
+                    self._stats["blocked"] += 1
+                    while len(self._pending) >= self.max_rows and not self._stopped:
+                        self._cond.wait()  # backpressure: wait for the writer
+                self._pending.append(write)
+                self._enqueued_seq += 1
+                self._stats["enqueued"] += 1
+            self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Wait until every row enqueued before this call is committed."""
+        with self._cond:
+            target = self._enqueued_seq
+            if self._committed_seq >= target:
+                return
+            self._flush_waiters += 1
+            self._cond.notify_all()  # commit now instead of waiting out the interval
+            try:
+                self._cond.wait_for(lambda: self._committed_seq >= target)
+            finally:
+                self._flush_waiters -= 1
+
+    def stop(self) -> None:
+        """Commit everything still queued, then stop the writer."""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify_all()
+        self._worker.join()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "queue_depth": len(self._pending)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.flush_rows and not self._stopped and not self._flush_waiters:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                size = len(self._pending) if self._stopped else min(len(self._pending), self.flush_rows)
+                group = [self._pending.popleft() for _ in range(size)]
+                stopping = self._stopped and not self._pending
+                self._cond.notify_all()  # room for blocked enqueuers
+            self._commit(group)
+            with self._cond:
+                self._committed_seq += len(group)
+                self._cond.notify_all()
+            if stopping:
+                return
+
+    def _commit(self, group: List[Write]) -> None:
+        if not group:
+            return
+        for attempt in range(_COMMIT_ATTEMPTS):
+            try:
+                self._write_group(group)
+            except Exception as exc:
+                logger.warning(f"Write-behind flush of {len(group)} rows failed (attempt {attempt + 1}): {exc}")
+                with self._cond:
+                    self._stats["errors"] += 1
+                    self._stats["retries"] += 1 if attempt + 1 < _COMMIT_ATTEMPTS else 0
+                if attempt + 1 < _COMMIT_ATTEMPTS:
+                    time.sleep(_RETRY_BACKOFF_SECONDS * 2**attempt)
+                continue
+            with self._cond:
+                self._stats["written"] += len(group)
+                self._stats["flushes"] += 1
+            return
+        self._commit_rows(group)
+
+    def _commit_rows(self, group: List[Write]) -> None:
+        """Last resort: one transaction per row, so only the rows that fail are lost."""
+        written = failed = 0
+        for sql, params in group:
+            try:
+                with self.pool.cursor() as cur:
+                    cur.execute(sql, params)
+                written += 1
+            except Exception as exc:
+                failed += 1
+                logger.error(f"Write-behind row dropped: {exc}")
+        with self._cond:
+            self._stats["written"] += written
+            self._stats["failed_rows"] += failed
+            self._stats["flushes"] += 1
+
+    def _write_group(self, group: List[Write]) -> None:
+        with self.pool.cursor() as cur:
+            start = 0
+            while start < len(group):
+                # executemany over each run of identical statements, keeping order.
+                end = start
+                while end < len(group) and group[end][0] == group[start][0]:
+                    end += 1
+                cur.executemany(group[start][0], [params for _, params in group[start:end]])
+                start = end
+
+
+_writers: Dict[str, Tuple[WriteBehindQueue, int]] = {}
+_writers_lock = threading.Lock()
+
+
+def acquire_writer(pool: ConnectionPool, **options: Any) -> WriteBehindQueue:
+    """
+    Process-wide writer for the pool's database file, shared by every Database
+    on it so a read through any of them flushes rows queued by the others.
+    Pair each call with release_writer; the last release stops the writer.
+    """
+    key = os.path.abspath(pool.path)
+    with _writers_lock:
+        writer, users = _writers.get(key, (None, 0))
+        if writer is None:
+            writer = WriteBehindQueue(pool, **options)
+        _writers[key] = (writer, users + 1)
+        return writer
+
+
+def release_writer(writer: WriteBehindQueue) -> None:
+    key = os.path.abspath(writer.pool.path)
+    with _writers_lock:
+        current, users = _writers.get(key, (None, 0))
+        if current is writer and users > 1:
+            _writers[key] = (writer, users - 1)
+            writer.flush()
+            return
+        if current is writer:
+            del _writers[key]
+    writer.stop()
@@ -0,0 +1,93 @@
+"""
+Event bus cost (app/services/event_bus.py): what `_emit_event` pays per
+publish and how long an event takes to reach a dashboard's subscription,
+for the in-process bus and the SQLite log bus.
+
+"local" events are published in the same process as the dashboard (the
+tailer is woken immediately); "remote" events come from a second spawned
+process sharing the database file, i.e. another uvicorn worker, and are
+picked up on the next poll.
+
+Usage:
+    python -m benchmarks.bench_event_bus --events 500 --poll-ms 100
+"""
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from app.services.event_bus import MemoryEventBus, SQLiteEventBus
+from app.services.events import EventBroadcaster
+
+
+def publish_remote(path: str, events: int, interval: float) -> None:
+    bus = SQLiteEventBus(path, EventBroadcaster())
+    for n in range(events):
+        bus.publish({"n": n, "sent": time.time()})
+        time.sleep(interval)
+
+
+async def measure(bus, events: int, interval: float, remote_path: str = ""):
+    bus.start()
+    dashboard = bus.broadcaster.subscribe()
+    costs: List[float] = []
+    latencies: List[float] = []
+    process = None
+    if remote_path:
+        process = multiprocessing.get_context("spawn").Process(
+            target=publish_remote, args=(remote_path, events, interval)
+        )
+        process.start()
+    else:
+
+        def publish() -> None:
+            for n in range(events):
+                started = time.perf_counter()
+                bus.publish({"n": n, "sent": time.time()})
+                costs.append(time.perf_counter() - started)
+                time.sleep(interval)
+
+        asyncio.get_running_loop().run_in_executor(None, publish)
+    while len(latencies) < events:
+        event = await dashboard.get(timeout=30)
+        if event is None:
+            break
+        latencies.append(time.time() - event.data["sent"])
+    if process is not None:
+        process.join()
+    bus.close()
+    return costs, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--interval-ms", type=float, default=2.0)
+    parser.add_argument("--poll-ms", type=float, default=100.0)
+    args = parser.parse_args()
+    interval = args.interval_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench_events.db")
+        runs = (
+            ("memory   local", MemoryEventBus(EventBroadcaster()), ""),
+            ("sqlite   local", SQLiteEventBus(path, EventBroadcaster(), poll_interval=args.poll_ms / 1000), ""),
+            ("sqlite  remote", SQLiteEventBus(path, EventBroadcaster(), poll_interval=args.poll_ms / 1000), path),
+        )
+        for name, bus, remote_path in runs:
+            costs, latencies = asyncio.run(measure(bus, args.events, interval, remote_path))
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            publish = f"publish {statistics.mean(costs) * 1e6:7.1f} us/event" if costs else "publish (other process)"
+            print(
+                f"{name}  received {len(latencies):>4}/{args.events}  "
+                f"latency p50 {statistics.median(latencies) * 1e3:7.2f} ms p99 {p99 * 1e3:7.2f} ms  {publish}"
+            )
+
+
+if __name__ == "__main__":
+    main()
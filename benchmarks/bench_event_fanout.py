@@ -0,0 +1,116 @@
+"""
+SSE fan-out: the previous shared asyncio.Queue vs EventBroadcaster
+(app/services/events.py) with hundreds of concurrent dashboard clients.
+
+Each client is the endpoint's SSE generator (`sse_stream`) consumed on one
+event loop, i.e. everything the server does per client except the socket.
+Events are published from a worker thread, as `_emit_event` is from the
+threadpool, at a fixed rate. The queue baseline hands events to the loop
+with call_soon_threadsafe (the old code called put_nowait from the thread,
+which is not loop-safe), so it shows the best case of the old design.
+
+Reports how many events each client received, delivery latency from
+publish to frame, and publish cost per event.
+
+Usage:
+    python -m benchmarks.bench_event_fanout --clients 100 500 --events 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from typing import Callable, List
+
+from app.services.events import EventBroadcaster, sse_stream
+
+
+def publish_from_thread(publish: Callable[[dict], None], events: int, interval: float, costs: List[float]) -> None:
+    for n in range(events):
+        started = time.perf_counter()
+        publish({"n": n, "sent": started})
+        costs.append(time.perf_counter() - started)
+        time.sleep(interval)
+
+
+async def run_broadcaster(clients: int, events: int, interval: float):
+    broadcaster = EventBroadcaster(buffer_size=256)
+    latencies: List[float] = []
+    received = [0] * clients
+
+    async def client(idx: int) -> None:
+        stream = sse_stream(broadcaster.subscribe(), heartbeat_seconds=1.0)
+        async for frame in stream:
+            if frame.startswith(":"):
+                break  # idle: the publisher is done
+            payload = json.loads(frame.split("data: ", 1)[1])
+            latencies.append(time.perf_counter() - payload["sent"])
+            received[idx] += 1
+        await stream.aclose()
+
+    tasks = [asyncio.create_task(client(idx)) for idx in range(clients)]
+    await asyncio.sleep(0)
+    costs: List[float] = []
+    publisher = threading.Thread(target=publish_from_thread, args=(broadcaster.publish, events, interval, costs))
+    publisher.start()
+    await asyncio.gather(*tasks)
+    publisher.join()
+    return received, latencies, costs
+
+
+async def run_queue(clients: int, events: int, interval: float):
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=200)
+    latencies: List[float] = []
+    received = [0] * clients
+
+    def put(event: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def client(idx: int) -> None:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), 1.0)
+            except asyncio.TimeoutError:
+                return
+            frame = f"data: {json.dumps(event)}\n\n"
+            payload = json.loads(frame.split("data: ", 1)[1])
+            latencies.append(time.perf_counter() - payload["sent"])
+            received[idx] += 1
+
+    tasks = [asyncio.create_task(client(idx)) for idx in range(clients)]
+    costs: List[float] = []
+    publisher = threading.Thread(
+        target=publish_from_thread, args=(lambda event: loop.call_soon_threadsafe(put, event), events, interval, costs)
+    )
+    publisher.start()
+    await asyncio.gather(*tasks)
+    publisher.join()
+    return received, latencies, costs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for clients in args.clients:
+        for name, runner in (("queue", run_queue), ("broadcaster", run_broadcaster)):
+            received, latencies, costs = asyncio.run(runner(clients, args.events, args.interval_ms / 1000))
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+            print(
+                f"{clients:>4} clients {name:<11} received/client min {min(received):>4} "
+                f"mean {statistics.mean(received):7.1f} of {args.events}  "
+                f"latency p50 {statistics.median(latencies) * 1e3:6.2f} ms p99 {p99 * 1e3:6.2f} ms  "
+                f"publish {statistics.mean(costs) * 1e6:6.1f} us/event"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+GCN scoring cost in GraphIntelEngine (app/models/gnn.py).
+
+1. Reference forward: dense vs sparse (CSR) normalised adjacency on synthetic
+   actor/content/narrative/region graphs (about 1.5 edges per node, the
+   same shape intake produces). This is the path offline training uses.
+2. Engine path: rescoring every node (`IncrementalGCN.refresh(full=True)`)
+   vs the incremental refresh after one more intake, which only touches
+   the 2-hop neighbourhood of the nodes it changed.
+
+Usage:
+    python -m benchmarks.bench_gnn_projection --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import time
+
+import torch
+
+from app.models.gnn import GCNScorer, normalized_adjacency
+from benchmarks.bench_graph_analytics import build_engine, synthetic_events
+
+DENSE_LIMIT = 8000  # 8k x 8k float32 is already 256 MB
+ENGINE_LIMIT = 200000  # replaying intake events is the slow part beyond this
+
+
+def synthetic_edges(size: int, seed: int = 7):
+    generator = torch.Generator().manual_seed(seed)
+    content = int(size * 0.6)
+    actors = int(size * 0.3)
+    narratives = max(1, int(size * 0.05))
+    regions = max(1, size - content - actors - narratives)
+    actor_ids = content + torch.randint(0, actors, (content,), generator=generator)
+    narrative_ids = content + actors + torch.randint(0, narratives, (content,), generator=generator)
+    region_ids = content + actors + narratives + torch.randint(0, regions, (actors,), generator=generator)
+    content_ids = torch.arange(content)
+    sources = torch.cat([content_ids, content_ids, content + torch.arange(actors)])
+    targets = torch.cat([actor_ids, narrative_ids, region_ids])
+    rows = torch.cat([sources, targets]).numpy()
+    cols = torch.cat([targets, sources]).numpy()
+    return rows, cols
+
+
+def adjacency_bytes(adjacency) -> int:
+    if adjacency.layout == torch.strided:
+        return adjacency.element_size() * adjacency.nelement()
+    parts = (adjacency.crow_indices(), adjacency.col_indices(), adjacency.values())
+    return sum(part.element_size() * part.nelement() for part in parts)
+
+
+def run_reference(size: int, scorer: GCNScorer) -> None:
+    rows, cols = synthetic_edges(size)
+    features = torch.rand((size, 5), dtype=torch.float32)
+    results = {}
+    for backend in ("sparse", "dense"):
+        if backend == "dense" and size > DENSE_LIMIT:
+            print(f"{size:>9} dense   skipped (would need {size * size * 4 / 1e9:.1f}GB)")
+            return
+        start = time.perf_counter()
+        adjacency = normalized_adjacency(rows, cols, size, sparse=backend == "sparse")
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        with torch.no_grad():
+            results[backend] = scorer.forward(features, adjacency)
+        forward_ms = (time.perf_counter() - start) * 1000
+        drift = f"  max|diff|={(results['dense'] - results['sparse']).abs().max().item():.2e}" if len(results) == 2 else ""
+        print(
+            f"{size:>9} {backend:<7} build={build_ms:9.1f}ms  forward={forward_ms:9.1f}ms  "
+            f"adjacency={adjacency_bytes(adjacency) / 1e6:10.2f}MB{drift}"
+        )
+
+
+def run_engine(size: int, repeat: int = 20) -> None:
+    engine = build_engine(size)
+    start = time.perf_counter()
+    engine._gnn.refresh(engine.compact, full=True)
+    full_ms = (time.perf_counter() - start) * 1000
+    late = list(synthetic_events(size, seed=29))[:repeat]
+    rescored = 0
+    start = time.perf_counter()
+    for idx, event in enumerate(late):
+        engine._apply_event({**event, "intake_id": f"late-{idx}"})
+        rescored += engine._gnn.refresh(engine.compact)
+    incremental_ms = (time.perf_counter() - start) * 1000 / len(late)
+    print(
+        f"{len(engine.compact):>9} engine  full refresh={full_ms:9.1f}ms  "
+        f"per intake={incremental_ms:7.2f}ms (apply + refresh, {rescored / len(late):.0f} nodes rescored)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    args = parser.parse_args()
+    scorer = GCNScorer()
+    for size in args.sizes:
+        run_reference(size, scorer)
+        if size <= ENGINE_LIMIT:
+            run_engine(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Full graph summary cost: the previous per-section networkx walks vs the
+single analytics pass over CSR arrays in GraphIntelEngine._summarise.
+
+Synthetic intake streams (shared actor pool, a few narratives per post,
+regions, occasional near-duplicate links) are replayed straight into the
+engine's graph, then both summaries are built from the same GCN scores
+(every node rescored on each run, as the full path does) and compared for
+equality.
+
+Usage:
+    python -m benchmarks.bench_graph_analytics --nodes 10000 100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import networkx as nx
+
+from app.models.graph_intel import GraphIntelEngine
+from app.schemas import (
+    CommunitySnapshot,
+    CoordinationAlert,
+    GNNCluster,
+    GraphSummary,
+    PropagationChain,
+)
+from app.storage.graph_store import MemoryGraphStore
+
+
+def synthetic_events(nodes: int, seed: int = 11) -> Iterator[Dict]:
+    """About 0.6 content, 0.3 actor, 0.05 narrative and 0.05 region nodes per node."""
+    rng = random.Random(seed)
+    actors = max(1, int(nodes * 0.3))
+    narratives = max(1, int(nodes * 0.05))
+    regions = max(1, int(nodes * 0.05))
+    start = datetime(2024, 1, 1)
+    for idx in range(int(nodes * 0.6)):
+        yield {
+            "intake_id": f"intake-{idx}",
+            "actor_id": f"actor::named::{rng.randrange(actors)}",
+            "score": rng.random(),
+            "classification": rng.choice(["high-risk", "medium-risk", "low-risk"]),
+            "ts": (start + timedelta(seconds=idx)).isoformat(),
+            "platform": rng.choice(["telegram-channel", "web", "darknet", "x"]),
+            "source": f"source-{idx % 97}",
+            "tags": [f"tag-{rng.randrange(narratives)}" for _ in range(rng.randint(0, 2))],
+            "region": f"R{rng.randrange(regions)}" if rng.random() < 0.5 else None,
+            "near_duplicates": [f"intake-{rng.randrange(idx)}"] if idx and rng.random() < 0.1 else [],
+        }
+
+
+def build_engine(nodes: int, seed: int = 11) -> GraphIntelEngine:
+    engine = GraphIntelEngine(incremental=False, store=MemoryGraphStore())
+    engine._max_content_nodes = nodes
+    engine._loaded = True
+    for event in synthetic_events(nodes, seed):
+        engine._apply_event(event)
+    return engine
+
+
+# --- previous implementation, kept for comparison -------------------------
+
+
+def _insertion_rank(graph: nx.Graph) -> Dict[str, int]:
+    return {node: rank for rank, node in enumerate(graph)}
+
+
+def _lookup(projection: Dict[str, List[float]]) -> Dict[str, float]:
+    return dict(zip(projection.get("nodes", []), projection.get("scores", [])))
+
+
+def legacy_top_risk_actors(engine, projection, limit: int = 5) -> List[str]:
+    graph = engine.graph
+    score_lookup = _lookup(projection)
+    scores: List[Tuple[str, float]] = []
+    for actor, data in graph.nodes(data=True):
+        if data.get("type") != "actor":
+            continue
+        neighbor_scores = [
+            graph.nodes[n].get("score", 0.0) for n in graph.neighbors(actor) if graph.nodes[n].get("type") == "content"
+        ]
+        if neighbor_scores:
+            avg_neighbor = sum(neighbor_scores) / len(neighbor_scores)
+            scores.append((actor, 0.6 * avg_neighbor + 0.4 * score_lookup.get(actor, avg_neighbor)))
+    scores.sort(key=lambda item: item[1], reverse=True)
+    return [actor for actor, _ in scores[:limit]]
+
+
+def legacy_communities(engine, projection) -> List[CommunitySnapshot]:
+    communities = []
+    score_lookup = _lookup(projection)
+    rank = _insertion_rank(engine.graph)
+    for component in nx.connected_components(engine.graph):
+        members = sorted(component, key=rank.__getitem__)
+        content = [node for node in members if node.startswith("content::")]
+        actors = [node for node in members if node.startswith("actor::")]
+        narratives = [node for node in members if node.startswith("narrative::")]
+        regions = [node for node in members if node.startswith("region::")]
+        if not (content or actors or narratives):
+            continue
+        avg_score = sum(score_lookup.get(node, 0.0) for node in members) / len(members)
+        communities.append(
+            CommunitySnapshot(
+                actors=actors,
+                content=content,
+                narratives=[node.split("::", 1)[1] for node in narratives],
+                regions=[node.split("::", 1)[1] for node in regions],
+                gnn_score=round(avg_score, 3),
+            )
+        )
+    return communities
+
+
+def legacy_clusters(engine, projection, limit: int = 5) -> List[GNNCluster]:
+    if not projection:
+        return []
+    score_lookup = _lookup(projection)
+    rank = _insertion_rank(engine.graph)
+    clusters = []
+    for idx, component in enumerate(nx.connected_components(engine.graph), start=1):
+        members = sorted(component, key=rank.__getitem__)
+        avg_score = sum(score_lookup.get(node, 0.0) for node in members) / len(members)
+        if avg_score < 0.35:
+            continue
+        clusters.append(
+            GNNCluster(
+                cluster_id=f"cluster-{idx}",
+                score=round(avg_score, 3),
+                actors=[node for node in members if node.startswith("actor::")][:10],
+                narratives=[node.split("::", 1)[1] for node in members if node.startswith("narrative::")][:10],
+                content=[node for node in members if node.startswith("content::")][:10],
+            )
+        )
+    clusters.sort(key=lambda cluster: cluster.score, reverse=True)
+    return clusters[:limit]
+
+
+def legacy_actor_alert(engine, actor: str, score_lookup: Dict[str, float]) -> Optional[CoordinationAlert]:
+    graph = engine.graph
+    content_neighbors = [n for n in graph.neighbors(actor) if graph.nodes[n].get("type") == "content"]
+    linked_content = set(content_neighbors)
+    for content in content_neighbors:
+        linked_content.update(n for n in graph.neighbors(content) if graph.nodes[n].get("type") == "content")
+    peer_actors = sorted(
+        {
+            peer
+            for content in linked_content
+            for peer in graph.neighbors(content)
+            if graph.nodes[peer].get("type") == "actor" and peer != actor
+        }
+    )
+    if not peer_actors:
+        return None
+    shared_tags = sorted(
+        {
+            graph.nodes[tag].get("tag", tag.split("::", 1)[-1])
+            for content in content_neighbors
+            for tag in graph.neighbors(content)
+            if graph.nodes[tag].get("type") == "narrative"
+        }
+    )
+    if not shared_tags:
+        return None
+    platforms = sorted(
+        {graph.nodes[content].get("platform", "unknown") or "unknown" for content in content_neighbors}
+    ) or ["unknown"]
+    risk = max(
+        score_lookup.get(actor, 0.0),
+        max((score_lookup.get(peer, 0.0) for peer in peer_actors), default=0.0),
+    )
+    return CoordinationAlert(
+        actor=actor,
+        peer_actors=peer_actors[:5],
+        shared_tags=shared_tags[:5],
+        platforms=platforms,
+        risk=round(risk, 3),
+    )
+
+
+def legacy_alerts(engine, projection, limit: int = 10) -> List[CoordinationAlert]:
+    if not projection:
+        return []
+    score_lookup = _lookup(projection)
+    alerts = []
+    for actor, data in engine.graph.nodes(data=True):
+        if data.get("type") == "actor":
+            alert = legacy_actor_alert(engine, actor, score_lookup)
+            if alert:
+                alerts.append(alert)
+    alerts.sort(key=lambda alert: alert.risk, reverse=True)
+    return alerts[:limit]
+
+
+def legacy_chains(engine, projection, limit: int = 5) -> List[PropagationChain]:
+    if not projection:
+        return []
+    graph = engine.graph
+    score_lookup = _lookup(projection)
+    chains: List[PropagationChain] = []
+    for narrative, data in graph.nodes(data=True):
+        if data.get("type") != "narrative":
+            continue
+        actors = [n for n in graph.neighbors(narrative) if graph.nodes[n].get("type") == "actor"]
+        contents = [n for n in graph.neighbors(narrative) if graph.nodes[n].get("type") == "content"]
+        if len(actors) < 2 or not contents:
+            continue
+        ranked = sorted(actors, key=lambda node: score_lookup.get(node, 0.0), reverse=True)[:2]
+        for content in contents[:2]:
+            likelihood = (
+                score_lookup.get(content, 0.0)
+                + score_lookup.get(narrative, 0.0)
+                + sum(score_lookup.get(actor, 0.0) for actor in ranked)
+            ) / max(1, 2 + len(ranked))
+            chains.append(
+                PropagationChain(
+                    path=[ranked[0], content, narrative, ranked[-1]],
+                    likelihood=round(min(0.99, likelihood), 3),
+                    platforms=sorted({graph.nodes[content].get("platform", "unknown") or "unknown"}),
+                )
+            )
+            if len(chains) >= limit:
+                return chains
+    return chains
+
+
+def legacy_summarise(engine: GraphIntelEngine) -> GraphSummary:
+    engine._gnn.refresh(engine.compact, full=True)  # the full path rescores every node too
+    projection = engine._gnn_projection()
+    return GraphSummary(
+        node_count=engine.graph.number_of_nodes(),
+        edge_count=engine.graph.number_of_edges(),
+        high_risk_actors=legacy_top_risk_actors(engine, projection),
+        communities=legacy_communities(engine, projection),
+        gnn_clusters=legacy_clusters(engine, projection),
+        coordination_alerts=legacy_alerts(engine, projection),
+        propagation_chains=legacy_chains(engine, projection),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.nodes:
+        engine = build_engine(size)
+        engine.graph  # materialise the networkx view the legacy walks read, outside the timings
+        timings = {}
+        results = {}
+        for name, summarise in (("legacy", legacy_summarise), ("kernel", GraphIntelEngine._summarise)):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results[name] = summarise(engine)
+            timings[name] = (time.perf_counter() - start) / args.repeat
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            engine._gnn.refresh(engine.compact, full=True)
+        projection = (time.perf_counter() - start) / args.repeat
+        identical = results["legacy"].model_dump() == results["kernel"].model_dump()
+        print(
+            f"{engine.graph.number_of_nodes():>7} nodes {engine.graph.number_of_edges():>7} edges: "
+            f"legacy {timings['legacy'] * 1e3:8.1f} ms  kernel {timings['kernel'] * 1e3:7.1f} ms  "
+            f"({timings['legacy'] / timings['kernel']:4.1f}x)  projection alone {projection * 1e3:6.1f} ms  "
+            f"identical={identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
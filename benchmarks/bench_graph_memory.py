@@ -0,0 +1,144 @@
+"""
+Memory per node of the threat graph's hot window: the previous storage
+(a networkx graph with one attribute dict per node plus the string-keyed
+bookkeeping dicts next to it) vs CompactGraph in GraphIntelEngine.
+
+Both replay the same synthetic intake stream (bench_graph_analytics) and
+are measured with tracemalloc, so the figures cover every Python object
+the storage keeps alive, numpy buffers included.
+
+Usage:
+    python -m benchmarks.bench_graph_memory --nodes 10000 100000
+"""
+import argparse
+import tracemalloc
+from collections import OrderedDict
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Set
+
+import networkx as nx
+
+from app.models.graph_intel import GraphIntelEngine
+from app.storage.graph_store import MemoryGraphStore
+from benchmarks.bench_graph_analytics import synthetic_events
+
+
+class LegacyGraphState:
+    """The storage GraphIntelEngine kept before CompactGraph, mutated the same way."""
+
+    def __init__(self) -> None:
+        self.graph = nx.Graph()
+        self.node_seq: Dict[str, int] = {}
+        self.seq = count()
+        self.component_ids = count()
+        self.component_of: Dict[str, int] = {}
+        self.components: Dict[int, Set[str]] = {}
+        self.actor_stats: Dict[str, List[float]] = {}
+        self.content_lru: "OrderedDict[str, str]" = OrderedDict()
+
+    def apply(self, event: Dict) -> None:
+        content_node = f"content::{event['intake_id']}"
+        score = event["score"]
+        platform = event["platform"]
+        self._add_node(
+            content_node,
+            type="content",
+            score=score,
+            classification=event["classification"],
+            ts=event["ts"],
+            platform=platform,
+            source=event["source"],
+        )
+        actor_id = event["actor_id"]
+        self._add_node(actor_id, type="actor")
+        record = self.graph.nodes[actor_id]
+        history = record.get("score_history", [])
+        history.append(score)
+        record["score_history"] = history[-20:]
+        record["avg_score"] = sum(record["score_history"]) / len(record["score_history"])
+        platforms = set(record.get("platforms", []))
+        if platform:
+            platforms.add(platform)
+        record["platforms"] = sorted(platforms)
+        record["last_seen"] = event["ts"]
+        if not self.graph.has_edge(actor_id, content_node):
+            stats = self.actor_stats.setdefault(actor_id, [0.0, 0])
+            stats[0] += score
+            stats[1] += 1
+        self._add_edge(actor_id, content_node, relation="published")
+        for tag in event["tags"]:
+            self._add_node(f"narrative::{tag}", type="narrative", tag=tag)
+            self._add_edge(content_node, f"narrative::{tag}", relation="targets")
+        if event["region"]:
+            self._add_node(f"region::{event['region']}", type="region")
+            self._add_edge(actor_id, f"region::{event['region']}", relation="origin")
+        for peer in event.get("near_duplicates", ()):
+            if f"content::{peer}" in self.graph:
+                self._add_edge(content_node, f"content::{peer}", relation="near_duplicate")
+        self.content_lru[content_node] = event["ts"]
+
+    def _add_node(self, node: str, **attrs) -> None:
+        self.graph.add_node(node, **attrs)
+        if node in self.node_seq:
+            return
+        self.node_seq[node] = next(self.seq)
+        cid = next(self.component_ids)
+        self.component_of[node] = cid
+        self.components[cid] = {node}
+
+    def _add_edge(self, source: str, target: str, **attrs) -> None:
+        self.graph.add_edge(source, target, **attrs)
+        left, right = self.component_of[source], self.component_of[target]
+        if left == right:
+            return
+        if len(self.components[left]) < len(self.components[right]):
+            left, right = right, left
+        absorbed = self.components.pop(right)
+        for node in absorbed:
+            self.component_of[node] = left
+        self.components[left].update(absorbed)
+
+
+def legacy_replay(events: Iterable[Dict]) -> LegacyGraphState:
+    state = LegacyGraphState()
+    for event in events:
+        state.apply(event)
+    return state
+
+
+def compact_replay(events: Iterable[Dict]) -> GraphIntelEngine:
+    engine = GraphIntelEngine(incremental=False, store=MemoryGraphStore())
+    engine._max_content_nodes = 10**9
+    engine._loaded = True
+    for event in events:
+        engine._apply_event(event)
+    return engine
+
+
+def traced(replay: Callable, events: Iterable[Dict]):
+    tracemalloc.start()
+    result = replay(events)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for size in args.nodes:
+        legacy, legacy_bytes = traced(legacy_replay, synthetic_events(size))
+        engine, compact_bytes = traced(compact_replay, synthetic_events(size))
+        nodes = len(engine.compact)
+        assert nodes == legacy.graph.number_of_nodes()
+        print(
+            f"{nodes:>7} nodes {engine.compact.number_of_edges():>7} edges: "
+            f"networkx {legacy_bytes / nodes:7.0f} B/node  compact {compact_bytes / nodes:6.0f} B/node  "
+            f"({legacy_bytes / compact_bytes:4.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
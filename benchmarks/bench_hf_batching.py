@@ -0,0 +1,62 @@
+"""
+Throughput of AIDetector: one forward pass per text vs length-bucketed micro-batches.
+
+Needs the Hugging Face models to be downloadable (or cached) and
+DISABLE_AI_MODELS unset. Texts are built from samples/ at mixed lengths so
+bucketing has something to do.
+
+Usage:
+    python -m benchmarks.bench_hf_batching --texts 256 --batch-sizes 1 4 8 16 32
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import List
+
+from app.integrations.hf_detector import get_ai_detector
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "samples"
+
+
+def build_texts(count: int, seed: int = 13) -> List[str]:
+    words: List[str] = []
+    for path in sorted(SAMPLES_DIR.glob("*.json")):
+        words.extend(json.loads(path.read_text(encoding="utf-8")).get("text", "").split())
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        # Mostly short posts with a long tail, like crawler bursts.
+        length = min(int(rng.expovariate(1 / 60)) + 8, 600)
+        texts.append(" ".join(rng.choice(words) for _ in range(length)))
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    detector = get_ai_detector()
+    if not detector.available:
+        raise SystemExit("AI detector models are not available; nothing to benchmark.")
+    texts = build_texts(args.texts)
+    detector.analyze_batch(texts[:8])  # warm-up
+
+    start = time.perf_counter()
+    for text in texts:
+        detector.analyze_text(text)
+    elapsed = time.perf_counter() - start
+    print(f"{'analyze_text':>18}: {len(texts) / elapsed:8.1f} texts/sec")
+
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        detector.analyze_batch(texts, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{f'batch_size={batch_size}':>18}: {len(texts) / elapsed:8.1f} texts/sec")
+
+
+if __name__ == "__main__":
+    main()
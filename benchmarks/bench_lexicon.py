@@ -0,0 +1,58 @@
+"""
+Lexicon scanning cost: the previous per-term substring / per-pattern regex
+scan vs LexiconMatcher's token trie, as the lexicon grows.
+
+Synthetic lexicons mix single words and two-word phrases; texts are built
+from the same vocabulary so a share of terms actually hit.
+
+Usage:
+    python -m benchmarks.bench_lexicon --sizes 30 1000 5000 --chars 2000 20000
+"""
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from app.models.lexicon import LexiconMatcher
+
+
+def legacy_scan(text_lower: str, words: List[str], patterns: List[str]) -> int:
+    hits = sum(1 for word in words if word in text_lower)
+    return hits + sum(re.search(pattern, text_lower) is not None for pattern in patterns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 1000, 5000])
+    parser.add_argument("--chars", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+    for size in args.sizes:
+        words = rng.sample(vocabulary, size - size // 4)
+        phrases = [f"{rng.choice(vocabulary)} {rng.choice(vocabulary)}" for _ in range(size // 4)]
+        patterns = [phrase.replace(" ", r"\s+") for phrase in phrases]
+        matcher = LexiconMatcher({"words": words, "phrases": phrases})
+        for chars in args.chars:
+            text = ""
+            while len(text) < chars:
+                text += rng.choice(words + phrases + vocabulary[:2000]) + " "
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                legacy_scan(text, words, patterns)
+            legacy = (time.perf_counter() - start) / args.repeat
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                matcher.counts(text)
+            trie = (time.perf_counter() - start) / args.repeat
+            print(
+                f"{size:>6} terms, {chars:>6} chars: legacy {legacy * 1e3:8.2f} ms  "
+                f"matcher {trie * 1e3:6.2f} ms  ({legacy / trie:6.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
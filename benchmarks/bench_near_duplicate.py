@@ -0,0 +1,74 @@
+"""
+Recall and query latency of the MinHash/LSH near-duplicate index against a
+brute-force scan over every stored signature.
+
+Signatures are synthetic: `--size` random base signatures, and each query is
+a copy of a random base where every permutation keeps its value with
+probability `jaccard` (which is how MinHash agreement behaves for a pair at
+that Jaccard similarity). Recall is the share of brute-force matches at or
+above the threshold that the LSH lookup also returns. Both paths compare
+against in-memory signatures, so the numbers exclude the SQLite fetch.
+
+Usage:
+    python -m benchmarks.bench_near_duplicate --size 1000000 --queries 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.near_duplicate import LSHIndex
+
+
+def perturb(rng: np.random.Generator, signature: np.ndarray, jaccard: float) -> np.ndarray:
+    keep = rng.random(len(signature)) < jaccard
+    return np.where(keep, signature, rng.integers(0, 2**32, len(signature), dtype=np.uint32))
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--num-perm", type=int, default=settings.near_duplicate_num_perm)
+    parser.add_argument("--bands", type=int, default=settings.near_duplicate_bands)
+    parser.add_argument("--threshold", type=float, default=settings.near_duplicate_threshold)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    signatures = rng.integers(0, 2**32, (args.size, args.num_perm), dtype=np.uint32)
+    index = LSHIndex(args.num_perm, args.bands)
+
+    start = time.perf_counter()
+    index.bulk_load([str(idx) for idx in range(args.size)], index.band_keys(signatures))
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.size} signatures")
+
+    for jaccard in (0.9, 0.8, 0.7, 0.6):
+        queries = [perturb(rng, signatures[rng.integers(args.size)], jaccard) for _ in range(args.queries)]
+        expected = found = 0
+        brute_time = lsh_time = 0.0
+        for query in queries:
+            start = time.perf_counter()
+            agreement = np.count_nonzero(signatures == query, axis=1) / args.num_perm
+            truth = set(np.flatnonzero(agreement >= args.threshold).tolist())
+            brute_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            candidates = np.fromiter(index.candidates(index.band_keys(query[None, :])[0]), dtype=np.int64)
+            agreement = np.count_nonzero(signatures[candidates] == query, axis=1) / args.num_perm
+            hits = set(candidates[agreement >= args.threshold].tolist())
+            lsh_time += time.perf_counter() - start
+
+            expected += len(truth)
+            found += len(truth & hits)
+        recall = found / expected if expected else 1.0
+        print(
+            f"jaccard {jaccard:.1f}: recall {recall:6.1%}  "
+            f"brute force {brute_time * 1000 / args.queries:8.2f} ms/query  "
+            f"lsh {lsh_time * 1000 / args.queries:6.3f} ms/query"
+        )
+
+
+if __name__ == "__main__":
+    main()
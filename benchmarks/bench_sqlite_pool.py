@@ -0,0 +1,120 @@
+"""
+Insert throughput of storage.Database: connect-per-call (the old _cursor), pooled WAL
+connections, and pooled WAL with the write-behind group-commit queue.
+
+Each simulated intake does what _process_sync does: save_case, log_action and
+store_fingerprint, three separate commits. All variants write to fresh files
+in a temporary directory. The write-behind timing includes the final flush.
+
+The pipeline variants run the real AnalysisOrchestrator._process_sync (AI models
+disabled, SimHash and near-duplicate matchers on, as by default), so reads in the
+intake path that would force write-behind flushes show up in the flush count.
+
+Usage:
+    python -m benchmarks.bench_sqlite_pool --intakes 2000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from app.config import get_settings
+from app.storage.database import Database
+from app.storage.migrations import migrate
+
+
+class LegacyDatabase(Database):
+    """Database as it was: a new rollback-journal connection for every call."""
+
+    def __init__(self) -> None:
+        self.path = get_settings().database_url.replace("sqlite:///", "")
+        self.durability_mode = "strict"
+        self._writer = None
+        self._initialise()
+
+    def _initialise(self) -> None:
+        with self._cursor() as cur:
+            migrate(cur.connection)
+
+    @contextmanager
+    def _cursor(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            cur = conn.cursor()
+            yield cur
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def run(label: str, database: Database, intakes: int) -> None:
+    text = "Urgent: polling stations closed early, share before it is removed. " * 4
+    start = time.perf_counter()
+    for idx in range(intakes):
+        intake_id = f"{label}-{idx}"
+        database.save_case(
+            intake_id=intake_id,
+            raw_text=text,
+            classification="medium-risk",
+            composite_score=0.5,
+            metadata={"platform": "web"},
+            breakdown={"heuristics": []},
+            provenance={"content_hash": "0" * 64},
+        )
+        database.log_action(intake_id, "analysis_completed", "system", {"score": 0.5})
+        database.store_fingerprint(intake_id, text, "0" * 64)
+    database.close()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>12}: {intakes / elapsed:8.1f} intakes/sec  ({elapsed * 1000 / intakes:.2f} ms/intake)")
+
+
+def run_pipeline(label: str, intakes: int) -> None:
+    from app.schemas import ContentIntake, SourceMetadata
+    from app.services.orchestrator import AnalysisOrchestrator
+
+    orchestrator = AnalysisOrchestrator()
+    texts = [
+        ContentIntake(
+            text=f"Urgent: polling station {idx % 50} closed early, share before it is removed.",
+            source="crawler",
+            metadata=SourceMetadata(platform="web"),
+        )
+        for idx in range(intakes)
+    ]
+    detection = orchestrator.detector.detect(texts[0])  # detection cost is not what is measured
+    start = time.perf_counter()
+    for intake in texts:
+        orchestrator._process_sync(intake, detection)
+    orchestrator.db.close()
+    elapsed = time.perf_counter() - start
+    flushes = orchestrator.db.persistence_metrics().get("flushes", "-")
+    print(f"{label:>12}: {intakes / elapsed:8.1f} intakes/sec  ({elapsed * 1000 / intakes:.2f} ms/intake, flushes {flushes})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--intakes", type=int, default=2000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        variants = (
+            ("legacy", LegacyDatabase, "strict"),
+            ("pooled", Database, "strict"),
+            ("write-behind", Database, "write_behind"),
+        )
+        for label, factory, mode in variants:
+            os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/{label}.db"
+            os.environ["DB_DURABILITY_MODE"] = mode
+            get_settings.cache_clear()
+            run(label, factory(), args.intakes)
+        os.environ["DISABLE_AI_MODELS"] = "true"
+        for label, mode in (("pipeline", "strict"), ("pipeline-wb", "write_behind")):
+            os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/{label}.db"
+            os.environ["DB_DURABILITY_MODE"] = mode
+            get_settings.cache_clear()
+            run_pipeline(label, args.intakes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Stylometric feature extraction: the previous multi-pass `_extract_features`
+(kept below as `legacy_extract_features`) vs the single-pass
+StylometricExtractor.
+
+Inputs are the samples/ texts, mixed-length posts built from their words,
+and ~20k-character documents. Every input is checked for identical output
+before timing.
+
+Usage:
+    python -m benchmarks.bench_stylometry --repeat 200
+"""
+import argparse
+import json
+import math
+import random
+import re
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.models.detection import DetectorEngine
+from app.models.stylometry import StylometricExtractor, calculate_burstiness, calculate_mattr
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "samples"
+
+
+def _legacy_tokenize(text: str) -> List[str]:
+    return re.findall(r"\b[\w'-]+\b", text)
+
+
+def legacy_extract_features(text: str) -> Dict[str, float]:
+    tokens = _legacy_tokenize(text)
+    token_count = len(tokens) or 1
+    sentences = re.split(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s", text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+    sentence_lengths = [len(_legacy_tokenize(s)) for s in sentences]
+    if not sentence_lengths:
+        sentence_lengths = [token_count]
+    avg_token_length = sum(len(t) for t in tokens) / token_count
+    matt_r = calculate_mattr(tokens, window=50)
+    counts = Counter(tokens)
+    hapax = sum(1 for _, count in counts.items() if count == 1)
+    hapax_ratio = hapax / token_count
+    try:
+        sentence_length_var = statistics.variance(sentence_lengths)
+    except statistics.StatisticsError:
+        sentence_length_var = 0.0
+    uppercase_tokens = sum(1 for t in tokens if t.isupper() and len(t) > 1)
+    function_words = sum(1 for t in tokens if t.lower() in DetectorEngine.FUNCTION_WORDS)
+    trigrams = list(zip(tokens, tokens[1:], tokens[2:]))
+    if trigrams:
+        repetition_rate = 1.0 - (len(set(trigrams)) / len(trigrams))
+    else:
+        repetition_rate = 0.0
+    char_counts = Counter(text)
+    char_probs = [count / len(text) for count in char_counts.values()] if text else []
+    char_entropy = -sum(p * math.log2(p) for p in char_probs) if char_probs else 0.0
+    char_count = sum(len(t) for t in tokens)
+    avg_chars_per_word = char_count / token_count
+    avg_words_per_sent = token_count / max(len(sentences), 1)
+    readability = (4.71 * avg_chars_per_word) + (0.5 * avg_words_per_sent) - 21.43
+    punct_types = set(re.findall(r'[!?.;,:\-–—()"]', text))
+    freq_squares = sum((count / token_count) ** 2 for count in counts.values())
+    return {
+        "avg_token_length": avg_token_length,
+        "mattr": matt_r,
+        "hapax_ratio": hapax_ratio,
+        "sentence_length_var": sentence_length_var,
+        "burstiness": calculate_burstiness(sentence_lengths),
+        "function_word_ratio": function_words / token_count,
+        "uppercase_ratio": uppercase_tokens / token_count,
+        "repetition_rate": repetition_rate,
+        "entropy": char_entropy,
+        "readability_score": max(0, readability),
+        "punctuation_variety": len(punct_types) / 8.0,
+        "vocabulary_richness": 1.0 - freq_squares,
+    }
+
+
+def build_corpora(seed: int = 7) -> Dict[str, List[str]]:
+    samples = [
+        json.loads(path.read_text(encoding="utf-8")).get("text", "") for path in sorted(SAMPLES_DIR.glob("*.json"))
+    ]
+    words = " ".join(samples).split() + ["Dr.", "U.S.", "e.g.", "NOW!", "why?", "--", "(see", "it's", '"quoted"']
+    rng = random.Random(seed)
+
+    def document(length: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(length))
+
+    posts = [document(min(int(rng.expovariate(1 / 60)) + 8, 600)) for _ in range(200)]
+    long_docs = []
+    for _ in range(5):
+        text = ""
+        while len(text) < 20_000:
+            text += document(rng.randint(5, 30)) + rng.choice([". ", "! ", "? ", ".\n", " "])
+        long_docs.append(text[:20_000])
+    return {"samples/": samples, "posts": posts, "20k chars": long_docs}
+
+
+def timed(func: Callable[[str], Dict[str, float]], texts: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) / (repeat * len(texts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    extractor = StylometricExtractor(DetectorEngine.FUNCTION_WORDS)
+    for name, texts in build_corpora().items():
+        for text in texts:
+            assert extractor.extract(text) == legacy_extract_features(text), f"output differs on {text[:60]!r}"
+        repeat = max(1, args.repeat // 20) if name == "20k chars" else args.repeat
+        legacy = timed(legacy_extract_features, texts, repeat)
+        single = timed(extractor.extract, texts, repeat)
+        print(
+            f"{name:>10}: legacy {legacy * 1e6:9.1f} us  single-pass {single * 1e6:9.1f} us  "
+            f"speedup {legacy / single:4.2f}x  (identical on {len(texts)} texts)"
+        )
+
+
+if __name__ == "__main__":
+    main()
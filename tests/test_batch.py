@@ -0,0 +1,115 @@
+import os
+
+os.environ["HF_MODEL_NAME"] = "disabled"
+os.environ["HF_TOKENIZER_NAME"] = "disabled"
+
+from app.config import get_settings
+from app.schemas import ContentIntake, SourceMetadata
+from app.services.orchestrator import AnalysisOrchestrator
+
+get_settings.cache_clear()
+
+
+def test_batch_intake_persists_every_item(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/batch.db")
+    get_settings.cache_clear()
+    try:
+        orchestrator = AnalysisOrchestrator()
+        intakes = [
+            ContentIntake(
+                text="Batch item: share this now before it is censored, urgent update.",
+                source="crawler",
+                metadata=SourceMetadata(platform="web", region="IN"),
+                tags=["election"],
+            )
+            for _ in range(3)
+        ]
+        batch = orchestrator._process_batch_sync(intakes)
+        single = orchestrator.detector.detect(intakes[0])
+    finally:
+        get_settings.cache_clear()
+
+    assert batch.stats.items == 3
+    assert [result.composite_score for result in batch.results][0] == single[0]
+    for result in batch.results:
+        assert orchestrator.db.fetch_case(result.intake_id) is not None
+    assert len(orchestrator.db.check_fingerprint(intakes[0].text)) == 3
+    assert batch.graph_summary.node_count >= 3
+    assert all(result.graph_summary is None for result in batch.results)  # once per batch
+    metrics = orchestrator.metrics()
+    assert metrics["detection_cascade"] == orchestrator.detector.metrics()["detection_cascade"]
+    assert {"inference_batcher", "result_cache", "ollama_async", "persistence", "events"} <= set(metrics)
+
+
+def test_batch_survives_near_duplicate_index_failure(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/batch.db")
+    get_settings.cache_clear()
+    try:
+        orchestrator = AnalysisOrchestrator()
+
+        def broken_add_many(items):
+            raise RuntimeError("disk I/O error")
+
+        orchestrator.near_duplicates.add_many = broken_add_many
+        intake = ContentIntake(text="Polling hours extended in ward 12, pass it on.", source="crawler")
+        batch = orchestrator._process_batch_sync([intake, intake])
+    finally:
+        get_settings.cache_clear()
+
+    assert batch.stats.items == 2
+    for result in batch.results:
+        assert orchestrator.db.fetch_case(result.intake_id) is not None
+
+
+def test_length_buckets_never_mix_buckets(monkeypatch):
+    from app.integrations.hf_detector import AIDetector
+
+    monkeypatch.setenv("DISABLE_AI_MODELS", "true")
+    detector = AIDetector()
+    batches = detector._length_buckets([5, 70, 3, 600, 130, 65, 64], 2)
+    assert sorted(idx for batch in batches for idx in batch) == list(range(7))
+    assert batches == [[2, 0], [6], [5, 1], [4], [3]]
+
+
+class _WordTokenizer:
+    """One token per word; enough of the HF tokenizer API for _batched_probabilities."""
+
+    def __call__(self, texts, truncation=True, max_length=512):
+        return {"input_ids": [[1] * len(text.split()) for text in texts]}
+
+    def pad(self, features, padding=True, return_tensors="pt"):
+        import torch
+
+        width = max(len(feature["input_ids"]) for feature in features)
+        ids = [feature["input_ids"] + [0] * (width - len(feature["input_ids"])) for feature in features]
+        return _Inputs(input_ids=torch.tensor(ids))
+
+
+class _Inputs(dict):
+    def to(self, device):
+        return self
+
+
+class _FlakyModel:
+    """Fails any micro-batch padded to exactly three tokens."""
+
+    config = type("Config", (), {"id2label": {0: "HUMAN", 1: "AI"}})()
+
+    def __call__(self, input_ids):
+        import torch
+
+        if input_ids.shape[1] == 3:
+            raise RuntimeError("CUDA out of memory")
+        return type("Output", (), {"logits": torch.zeros(input_ids.shape[0], 2)})()
+
+
+def test_failed_micro_batch_only_loses_its_own_items(monkeypatch):
+    from app.integrations.hf_detector import AIDetector
+
+    monkeypatch.setenv("DISABLE_AI_MODELS", "true")
+    detector = AIDetector()
+    detector._ai_human_model = _FlakyModel()
+    detector._ai_human_tokenizer = _WordTokenizer()
+    texts = ["one two three", "a b", "x y z", "single", "four five six seven"]
+    results = detector.analyze_batch(texts, batch_size=2)
+    assert [ai is None for ai, _ in results] == [True, False, True, False, False]
@@ -0,0 +1,57 @@
+from app.models.compact_graph import ACTOR, CONTENT, HISTORY_SIZE, PUBLISHED, CompactGraph, to_micros
+from app.models.graph_intel import GraphIntelEngine
+from app.storage.graph_store import MemoryGraphStore
+
+
+def _event(idx, actor="actor::a", platform="web"):
+    return {
+        "intake_id": f"intake-{idx}",
+        "actor_id": actor,
+        "score": idx / 100,
+        "classification": "medium-risk",
+        "ts": f"2024-01-01T00:00:{idx % 60:02d}",
+        "platform": platform,
+        "source": "feed",
+        "tags": ["election"],
+        "region": "IN" if idx % 2 else None,
+        "near_duplicates": [],
+    }
+
+
+def test_actor_history_ring_wraps_and_view_keeps_attributes():
+    graph = CompactGraph(capacity=2)
+    actor = graph.add_node("actor::a", ACTOR, 0)
+    scores = [idx / 10 for idx in range(HISTORY_SIZE + 5)]
+    for idx, score in enumerate(scores):
+        graph.record_actor_score(actor, score, ["web", "x"][idx % 2], to_micros("2024-01-01T00:00:00"))
+    assert graph.score_history(actor) == scores[-HISTORY_SIZE:]
+    assert graph.score[actor] == sum(scores[-HISTORY_SIZE:]) / HISTORY_SIZE
+
+    content = graph.add_node("content::1", CONTENT, 1)
+    graph.set_content(content, 0.5, "low-risk", to_micros("2024-01-02T03:04:05.000006"), None, "feed")
+    graph.add_edge(actor, content, PUBLISHED)
+    view = graph.to_networkx()
+    assert view.nodes["actor::a"]["platforms"] == ["web", "x"]
+    assert view.nodes["content::1"] == {
+        "type": "content",
+        "score": 0.5,
+        "classification": "low-risk",
+        "ts": "2024-01-02T03:04:05.000006",
+        "platform": None,
+        "source": "feed",
+    }
+    assert view.edges["actor::a", "content::1"] == {"relation": "published"}
+
+
+def test_engine_reuses_slots_after_eviction():
+    engine = GraphIntelEngine(store=MemoryGraphStore())
+    engine._max_content_nodes = 4
+    engine._loaded = True
+    for idx in range(40):
+        engine._apply_event(_event(idx, actor=f"actor::{idx % 3}", platform=["web", "x"][idx % 2]))
+    compact = engine.compact
+    assert sum(1 for node in engine.graph if node.startswith("content::")) == 4
+    assert len(compact.names) <= 12  # freed slots are recycled instead of growing
+    # Evictions rebuild the ring from the content still in the window (intakes 36 and 39).
+    assert engine.graph.nodes["actor::0"]["score_history"] == [0.36, 0.39]
+    assert engine._summarise().dict() == engine._summarise_incremental().dict()
@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 os.environ["HF_MODEL_NAME"] = "disabled"
 os.environ["HF_TOKENIZER_NAME"] = "disabled"
 
@@ -10,6 +12,16 @@ from app.schemas import ContentIntake, SourceMetadata
 get_settings.cache_clear()
 
 
+@pytest.fixture(autouse=True)
+def isolated_settings(tmp_path, monkeypatch):
+    """DetectorEngine() opens the result cache; keep it off the repo's data/app.db."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/detection.db")
+    monkeypatch.setenv("RESULT_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
 def test_detection_scores_with_heuristics_only():
     engine = DetectorEngine()
     intake = ContentIntake(
@@ -27,3 +39,164 @@ def test_detection_scores_with_heuristics_only():
     assert classification in {"low-risk", "medium-risk", "high-risk"}
     assert breakdown.linguistic_score >= 0
     assert breakdown.behavioral_score > 0
+
+
+def test_async_detection_runs_stages_concurrently_and_drops_late_signals():
+    import asyncio
+    import time
+
+    engine = DetectorEngine()
+    engine.settings = engine.settings.model_copy(
+        update={"detection_hf_timeout": 1.0, "detection_ollama_timeout": 0.3}
+    )
+
+    def slow_ai(text):
+        time.sleep(0.2)
+        return {"ai_probability": 0.9, "is_ai": True}, None
+
+    def stuck_ollama(text):
+        time.sleep(1.0)
+        return 0.99
+
+    engine._ai_detection = slow_ai
+    engine._ollama_risk_assessment = stuck_ollama
+    intake = ContentIntake(
+        text="Share this now before they delete it. The vote has been moved to Friday.",
+        source="web",
+        metadata=SourceMetadata(platform="web", region="IN"),
+    )
+
+    async def timed():
+        started = time.perf_counter()
+        result = await engine.detect_async(intake)
+        return result, time.perf_counter() - started
+
+    (composite, _, breakdown), elapsed = asyncio.run(timed())
+
+    assert elapsed < 0.9  # bounded by the Ollama timeout, not the stage sum
+    assert breakdown.ai_probability == 0.9
+    assert breakdown.ollama_risk is None
+    assert "Ollama timed out; score blended without it." in breakdown.heuristics
+    assert 0.0 <= composite <= 1.0
+
+
+def test_async_detection_degrades_when_a_stage_raises():
+    import asyncio
+
+    engine = DetectorEngine()
+
+    def broken_ai(text):
+        raise RuntimeError("CUDA out of memory")
+
+    engine._ai_detection = broken_ai
+    engine._ollama_risk_assessment = lambda text: None
+    engine._async_ollama = None
+    intake = ContentIntake(
+        text="Share this now before they delete it. The vote has been moved to Friday.",
+        source="web",
+        metadata=SourceMetadata(platform="web", region="IN"),
+    )
+
+    composite, _, breakdown = asyncio.run(engine.detect_async(intake))
+
+    assert breakdown.ai_probability is None
+    assert "AI detector failed; score blended without it." in breakdown.heuristics
+    assert 0.0 <= composite <= 1.0
+
+
+def test_cascade_only_escalates_uncertain_intakes():
+    engine = DetectorEngine()
+    engine.settings = engine.settings.model_copy(
+        update={"detection_cascade_enabled": True, "detection_cascade_low": 0.2, "detection_cascade_high": 0.75}
+    )
+    calls = []
+
+    class StubDetector:
+        available = True
+        model_identity = "stub"
+
+        def analyze_text(self, text):
+            calls.append(text)
+            return {"ai_probability": 0.5, "is_ai": False}, None
+
+    engine._ai_detector = StubDetector()
+    engine._batcher = None
+    scores = iter([0.1, 0.5])  # first intake settles on the fast path, second escalates
+    real_blend = engine._blend_scores
+
+    def blend(base_prob, behavior_score, ai_score, ollama_risk=None):
+        if ai_score is None:
+            return next(scores)
+        return real_blend(base_prob, behavior_score, ai_score, ollama_risk)
+
+    engine._blend_scores = blend
+    intake = ContentIntake(
+        text="Community meeting moved to the library on Tuesday evening.",
+        source="web",
+        metadata=SourceMetadata(platform="web", region="IN"),
+    )
+    fast = engine.detect(intake)
+    deep = engine.detect(intake)
+
+    assert fast[0] == 0.1 and any("Provisional score" in note for note in fast[2].heuristics)
+    assert deep[2].ai_probability == 0.5
+    assert calls == [intake.text]
+    tiers = engine.cascade_metrics()["tiers"]
+    assert tiers["fast"] == {"count": 1, "fraction": 0.5}
+    assert tiers["ai_detector"] == {"count": 1, "fraction": 0.5}
+
+
+def test_cascade_without_models_counts_uncertain_intakes_as_no_model():
+    engine = DetectorEngine()
+    engine.settings = engine.settings.model_copy(
+        update={"detection_cascade_enabled": True, "detection_cascade_low": 0.0, "detection_cascade_high": 1.01}
+    )
+    engine._ai_detector = None
+    engine._ollama_client = None
+    intake = ContentIntake(
+        text="Community meeting moved to the library on Tuesday evening.",
+        source="web",
+        metadata=SourceMetadata(platform="web", region="IN"),
+    )
+    _, _, breakdown = engine.detect(intake)
+    engine.detect_batch([intake])
+
+    assert not any("cheap signals were decisive" in note for note in breakdown.heuristics)
+    assert any("no detection model was available" in note for note in breakdown.heuristics)
+    tiers = engine.cascade_metrics()["tiers"]
+    assert tiers["no_model"]["count"] == 2 and tiers["fast"]["count"] == 0
+
+
+def test_aclose_stops_batcher_and_async_ollama():
+    import asyncio
+
+    engine = DetectorEngine()
+    closed = []
+
+    class Batcher:
+        def stop(self):
+            closed.append("batcher")
+
+    class AsyncOllama:
+        async def aclose(self):
+            closed.append("ollama")
+
+    engine._batcher, engine._async_ollama = Batcher(), AsyncOllama()
+    asyncio.run(engine.aclose())
+    assert closed == ["batcher", "ollama"]
+
+
+def test_indexed_coherence_matches_pairwise():
+    import random
+
+    rng = random.Random(11)
+    vocabulary = [f"word{idx}" for idx in range(25)]
+    for _ in range(200):
+        sent_keywords = [
+            set(rng.sample(vocabulary, rng.randint(0, 6))) for _ in range(rng.randint(0, 30))
+        ]
+        assert abs(
+            DetectorEngine._coherence_indexed(sent_keywords)
+            - DetectorEngine._coherence_pairwise(sent_keywords)
+        ) < 1e-12
+    assert DetectorEngine._coherence_indexed([set(), set(), {"alpha"}, {"alpha", "beta"}]) == 0.5 / 5
@@ -0,0 +1,169 @@
+import asyncio
+import multiprocessing
+import queue
+import sqlite3
+import threading
+
+from app.services.event_bus import BrokerEventBus, SQLiteEventBus
+from app.services.events import EventBroadcaster
+
+WORKERS = 3
+PUBLISHES = 10
+
+
+def _worker(path, worker, results):
+    """One uvicorn worker: its own broadcaster and a dashboard, publishing its own intakes."""
+
+    async def run():
+        bus = SQLiteEventBus(path, EventBroadcaster(), poll_interval=0.02)
+        bus.start()
+        dashboard = bus.broadcaster.subscribe(last_event_id=0)  # also replays what others already sent
+        for n in range(PUBLISHES):
+            bus.publish({"worker": worker, "n": n})
+        seen = []
+        while len(seen) < WORKERS * PUBLISHES:
+            event = await dashboard.get(timeout=10)
+            if event is None:
+                break
+            seen.append((event.id, event.data["worker"], event.data["n"]))
+        bus.close()
+        return seen
+
+    results.put((worker, asyncio.run(run())))
+
+
+def test_sqlite_bus_delivers_every_workers_events_to_every_worker(tmp_path):
+    path = str(tmp_path / "events.db")
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [context.Process(target=_worker, args=(path, worker, results)) for worker in range(WORKERS)]
+    for process in workers:
+        process.start()
+    seen = dict(results.get(timeout=60) for _ in workers)
+    for process in workers:
+        process.join(timeout=10)
+        assert process.exitcode == 0
+
+    expected = {(worker, n) for worker in range(WORKERS) for n in range(PUBLISHES)}
+    for worker in range(WORKERS):
+        assert {(source, n) for _, source, n in seen[worker]} == expected
+        assert seen[worker] == seen[0]  # same ids, same order on every worker
+    assert [event_id for event_id, _, _ in seen[0]] == list(range(1, WORKERS * PUBLISHES + 1))
+
+    # A dashboard reconnecting to a worker started later resumes from the shared log.
+    async def resume():
+        bus = SQLiteEventBus(path, EventBroadcaster())
+        bus.start()
+        dashboard = bus.broadcaster.subscribe(last_event_id=WORKERS * PUBLISHES - 2)
+        replay = [(await dashboard.get(timeout=1)).id for _ in range(2)]
+        bus.close()
+        return replay
+
+    assert asyncio.run(resume()) == [WORKERS * PUBLISHES - 1, WORKERS * PUBLISHES]
+
+
+def test_sqlite_bus_tailer_survives_errors_and_bad_rows(tmp_path):
+    bus = SQLiteEventBus(str(tmp_path / "events.db"), EventBroadcaster(), poll_interval=0.01)
+    real_drain = bus._drain
+    failures = []
+
+    def flaky_drain():
+        if not failures:
+            failures.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        real_drain()
+
+    async def run():
+        bus.start()
+        bus._drain = flaky_drain
+        dashboard = bus.broadcaster.subscribe()
+        with bus._cursor() as cur:
+            cur.execute("INSERT INTO stream_events (payload, created_at) VALUES ('{not json', '')")
+        bus.publish({"n": 1})
+        event = await dashboard.get(timeout=2)
+        metrics = bus.metrics()
+        bus.close()
+        return event, metrics
+
+    event, metrics = asyncio.run(run())
+    assert failures and event.data == {"n": 1} and event.id == 2
+    assert metrics["tailing"] is True
+    assert bus.metrics()["tailing"] is False
+
+
+class FakeBroker:
+    """The redis-py subset BrokerEventBus uses, shared by every 'worker' in the test."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.lists = {}
+        self.channels = {}
+
+    def incr(self, key):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+            return self.counters[key]
+
+    def rpush(self, key, value):
+        with self._lock:
+            self.lists.setdefault(key, []).append(value)
+
+    def ltrim(self, key, start, end):
+        with self._lock:
+            self.lists[key] = self.lists.get(key, [])[start:][: None if end == -1 else end + 1]
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            return list(self.lists.get(key, [])[start:][: None if end == -1 else end + 1])
+
+    def publish(self, channel, message):
+        with self._lock:
+            for inbox in self.channels.get(channel, []):
+                inbox.put({"type": "message", "data": message})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, broker):
+        self.broker = broker
+        self.inbox = queue.Queue()
+
+    def subscribe(self, channel):
+        with self.broker._lock:
+            self.broker.channels.setdefault(channel, []).append(self.inbox)
+        self.inbox.put({"type": "subscribe", "data": 1})
+
+    def listen(self):
+        while True:
+            message = self.inbox.get()
+            if message is None:
+                return
+            yield message
+
+    def close(self):
+        self.inbox.put(None)
+
+
+def test_broker_bus_shares_ids_and_history_between_workers():
+    broker = FakeBroker()
+    first = BrokerEventBus(broker, EventBroadcaster(), history_size=5)
+    first.publish({"n": 0})  # before anyone tails: reaches the others through the history list
+
+    async def run():
+        buses = [first, BrokerEventBus(broker, EventBroadcaster(), history_size=5)]
+        dashboards = []
+        for bus in buses:
+            bus.start()
+            dashboards.append(bus.broadcaster.subscribe(last_event_id=0))
+        for n in range(1, 4):
+            buses[n % 2].publish({"n": n})
+        received = [[(await dashboard.get(timeout=1)).id for _ in range(4)] for dashboard in dashboards]
+        for bus in buses:
+            bus.close()
+        return received
+
+    assert asyncio.run(run()) == [[1, 2, 3, 4], [1, 2, 3, 4]]
+    assert len(broker.lists["events:history"]) == 4
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+from app.services.events import DISCONNECT, EventBroadcaster, format_sse, sse_stream
+
+
+def test_every_subscriber_gets_thread_published_events_and_can_resume():
+    broadcaster = EventBroadcaster(buffer_size=50, history_size=100)
+
+    async def run():
+        dashboards = [broadcaster.subscribe() for _ in range(3)]
+        publisher = threading.Thread(target=lambda: [broadcaster.publish({"n": n}) for n in range(20)])
+        publisher.start()
+        received = [[(await dashboard.get(timeout=1)).data["n"] for _ in range(20)] for dashboard in dashboards]
+        publisher.join()
+
+        # A reconnecting EventSource resumes after the last id it saw.
+        resumed = broadcaster.subscribe(last_event_id=15)
+        replay = [(await resumed.get(timeout=1)).id for _ in range(5)]
+        assert await resumed.get(timeout=0.01) is None  # idle -> heartbeat
+        return received, replay
+
+    received, replay = asyncio.run(run())
+    assert received == [list(range(20))] * 3
+    assert replay == [16, 17, 18, 19, 20]
+    assert broadcaster.metrics()["subscribers"] == 4
+    assert broadcaster._history[0].frame == format_sse(1, {"n": 0}) == 'id: 1\ndata: {"n": 0}\n\n'
+
+
+def test_slow_consumer_policies():
+    async def run(policy):
+        broadcaster = EventBroadcaster(buffer_size=3, slow_consumer=policy)
+        slow = broadcaster.subscribe()
+        for n in range(5):
+            broadcaster.publish({"n": n})
+        frames = []
+        stream = sse_stream(slow, heartbeat_seconds=0.01)
+        async for frame in stream:
+            frames.append(frame)
+            if frame.startswith(":") or len(frames) == 5:
+                break
+        await stream.aclose()  # what the server does when the client goes away
+        return broadcaster.metrics(), frames
+
+    metrics, frames = asyncio.run(run("drop_oldest"))
+    assert [frame.split("\n")[0] for frame in frames] == ["id: 3", "id: 4", "id: 5", ": keepalive"]
+    assert metrics["dropped"] == 2 and metrics["subscribers"] == 0  # closed when the stream ends
+
+    metrics, frames = asyncio.run(run(DISCONNECT))
+    assert frames == [] and metrics["disconnected"] == 1
@@ -0,0 +1,160 @@
+import os
+import threading
+
+os.environ["HF_MODEL_NAME"] = "disabled"
+os.environ["HF_TOKENIZER_NAME"] = "disabled"
+
+from app.config import get_settings
+from app.models.graph_intel import _COMPACT_EVERY, GraphIntelEngine
+from app.models.compact_graph import ACTOR, CONTENT, NARRATIVE
+from app.models.graph_kernel import GraphCSR
+from app.schemas import ContentIntake, SourceMetadata
+from app.storage.graph_store import MemoryGraphStore, SQLiteGraphStore
+
+get_settings.cache_clear()
+
+
+def _sample_intakes():
+    regions = ["RU", None, "IN", None]
+    tags = [["election"], None, None, ["riot", "leak"], None]
+    intakes = []
+    for idx in range(24):
+        intakes.append(
+            ContentIntake(
+                text=f"Sample intake number {idx} with enough characters to validate.",
+                source=f"source-{idx % 5}",
+                metadata=SourceMetadata(
+                    platform=["telegram-channel", "web", "darknet"][idx % 3],
+                    region=regions[idx % 4],
+                    actor_id=f"actor::named::{idx % 7}" if idx % 3 else None,
+                ),
+                tags=tags[idx % 5],
+            )
+        )
+    return intakes
+
+
+def test_incremental_summary_matches_full_recompute():
+    full = GraphIntelEngine(incremental=False, store=MemoryGraphStore())
+    incremental = GraphIntelEngine(incremental=True, store=MemoryGraphStore())
+    for idx, intake in enumerate(_sample_intakes()):
+        score = (idx * 37 % 100) / 100
+        classification = "high-risk" if score >= 0.6 else "low-risk"
+        expected = full.ingest(f"intake-{idx}", intake, classification, score)
+        actual = incremental.ingest(f"intake-{idx}", intake, classification, score)
+        assert actual.dict() == expected.dict()
+    assert incremental.summary().dict() == full.summary().dict()
+
+
+def test_sqlite_store_bounds_memory_and_survives_restart(tmp_path):
+    path = str(tmp_path / "graph.db")
+    engine = GraphIntelEngine(store=SQLiteGraphStore(path))
+    engine._max_content_nodes = 10
+    reference = GraphIntelEngine(incremental=False, store=MemoryGraphStore())
+    reference._max_content_nodes = 10
+    for idx, intake in enumerate(_sample_intakes()):
+        summary = engine.ingest(f"intake-{idx}", intake, "medium-risk", (idx % 10) / 10)
+        assert summary.dict() == reference.ingest(
+            f"intake-{idx}", intake, "medium-risk", (idx % 10) / 10
+        ).dict()
+    content = [node for node in engine.graph if node.startswith("content::")]
+    assert len(content) == 10
+
+    restarted = GraphIntelEngine(store=SQLiteGraphStore(path))
+    restarted._max_content_nodes = 10
+    restarted_content = {node for node in restarted.graph if node.startswith("content::")}
+    assert restarted_content == set()  # loaded lazily
+    restarted.summary()
+    restarted_content = {node for node in restarted.graph if node.startswith("content::")}
+    assert restarted_content == set(content)
+
+    # A second worker's intake becomes visible through the shared log.
+    engine.ingest("intake-late", _sample_intakes()[0], "high-risk", 0.9)
+    restarted.summary()
+    assert "content::intake-late" in restarted.graph
+
+
+def test_read_models_are_cached_until_the_graph_changes(tmp_path):
+    path = str(tmp_path / "graph.db")
+    writer = GraphIntelEngine(store=SQLiteGraphStore(path))
+    reader = GraphIntelEngine(store=SQLiteGraphStore(path))
+    for idx, intake in enumerate(_sample_intakes()[:8]):
+        writer.ingest(f"intake-{idx}", intake, "medium-risk", (idx % 10) / 10)
+
+    feed = reader.threat_intel_feed()
+    etag = reader.etag()
+    calls = []
+    summarise = reader._current_summary
+    reader._current_summary = lambda: calls.append(1) or summarise()
+    assert reader.threat_intel_feed() is feed
+    assert reader.summary() is feed.graph_summary
+    assert reader.siem_payload() is reader.siem_payload()
+    assert reader.etag() == etag == writer.etag()
+    assert calls == []
+
+    # Another worker's intake bumps the generation through catch-up.
+    writer.ingest("intake-late", _sample_intakes()[9], "high-risk", 0.9)
+    fresh = reader.threat_intel_feed()
+    assert calls == [1]
+    assert reader.etag() != etag
+    assert fresh.dataset_fingerprint != feed.dataset_fingerprint
+    assert fresh.graph_summary.dict() == writer.summary().dict()
+
+
+def test_csr_kernel_matches_networkx_adjacency():
+    engine = GraphIntelEngine(incremental=False, store=MemoryGraphStore())
+    for idx, intake in enumerate(_sample_intakes()):
+        duplicates = [f"intake-{idx - 3}"] if idx % 4 == 3 else []
+        engine.ingest(f"intake-{idx}", intake, "medium-risk", (idx % 10) / 10, near_duplicates=duplicates)
+
+    csr = GraphCSR.from_compact(engine.compact, engine.compact.slots())
+    nodes = csr.nodes
+    assert nodes == list(engine.graph.nodes())
+    rows, cols = csr.edge_index()
+    assert len(rows) == 2 * engine.graph.number_of_edges() == 2 * engine.compact.number_of_edges()
+    for idx, node in enumerate(nodes):
+        assert [nodes[peer] for peer in csr.neighbors(idx)] == list(engine.graph.neighbors(node))
+        for code, name in ((CONTENT, "content"), (ACTOR, "actor"), (NARRATIVE, "narrative")):
+            expected = [peer for peer in engine.graph.neighbors(node) if engine.graph.nodes[peer]["type"] == name]
+            assert [nodes[peer] for peer in csr.neighbors_of_type(idx, code)] == expected
+
+    # Content copies link their publishers: a shared tag plus a near-duplicate edge raises an alert.
+    alerts = {alert.actor: alert for alert in engine.summary().coordination_alerts}
+    assert alerts and all(alert.peer_actors and alert.shared_tags for alert in alerts.values())
+
+
+def test_concurrent_ingests_apply_each_logged_event_once(tmp_path):
+    path = str(tmp_path / "graph.db")
+    engine = GraphIntelEngine(store=SQLiteGraphStore(path))
+    intakes = _sample_intakes()
+
+    def ingest(worker):
+        for idx in range(30):
+            engine.ingest(f"intake-{worker}-{idx}", intakes[idx % len(intakes)], "medium-risk", (idx % 10) / 10)
+
+    threads = [threading.Thread(target=ingest, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert engine._generation == 8 * 30  # no event applied twice
+    replayed = GraphIntelEngine(store=SQLiteGraphStore(path))
+    assert replayed.summary().dict() == engine.summary().dict()
+
+
+def test_log_compaction_drops_events_replay_cannot_reach(tmp_path):
+    store = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    engine = GraphIntelEngine(store=store)
+    engine._max_content_nodes = 10
+    intakes = _sample_intakes()
+    for idx in range(_COMPACT_EVERY):
+        engine.ingest(f"intake-{idx}", intakes[idx % len(intakes)], "medium-risk", 0.5)
+    assert [event_id for event_id, _ in store.events_between(0)] == list(range(_COMPACT_EVERY - 9, _COMPACT_EVERY + 1))
+    assert store.prune("1970-01-01", keep_last=10) == 0
+
+    restarted = GraphIntelEngine(store=SQLiteGraphStore(str(tmp_path / "graph.db")))
+    restarted._max_content_nodes = 10
+    restarted.summary()
+    content = {node for node in engine.graph if node.startswith("content::")}
+    assert {node for node in restarted.graph if node.startswith("content::")} == content
@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.integrations.inference_batcher import InferenceBatcher
+
+
+class EchoDetector:
+    """Stands in for AIDetector: records batch sizes and echoes each text back."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def analyze_batch(self, texts, batch_size=None):
+        with self.lock:
+            self.batch_sizes.append(len(texts))
+        return [({"text": text}, None) for text in texts]
+
+
+def test_concurrent_requests_share_forward_passes():
+    detector = EchoDetector()
+    batcher = InferenceBatcher(detector, max_batch_size=8, max_wait_ms=50)
+    texts = [f"text-{idx}" for idx in range(16)]
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(batcher.analyze_text, texts))
+    finally:
+        batcher.stop()
+
+    assert [ai["text"] for ai, _ in results] == texts
+    assert sum(detector.batch_sizes) == 16
+    assert len(detector.batch_sizes) < 16
+    assert max(detector.batch_sizes) <= 8
+    metrics = batcher.metrics()
+    assert metrics["requests"] == 16
+    assert metrics["batches"] == len(detector.batch_sizes)
+    assert 0 < metrics["fill_ratio"] <= 1
+
+
+def test_batch_failure_reaches_every_caller():
+    class BrokenDetector:
+        def analyze_batch(self, texts, batch_size=None):
+            raise RuntimeError("model crashed")
+
+    batcher = InferenceBatcher(BrokenDetector(), max_batch_size=4, max_wait_ms=5)
+    try:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            batcher.submit("anything").result(timeout=5)
+    finally:
+        batcher.stop()
+    assert batcher.metrics()["errors"] == 1
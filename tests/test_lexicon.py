@@ -0,0 +1,30 @@
+import os
+
+os.environ["HF_MODEL_NAME"] = "disabled"
+os.environ["HF_TOKENIZER_NAME"] = "disabled"
+
+from app.models.lexicon import LexiconMatcher, load_lexicons
+
+
+def test_matches_whole_words_and_phrases_per_category():
+    matcher = LexiconMatcher(
+        {"urgency": ["now", "must-see", "breaking"], "cta": ["click here", "share this", "sign up now"]}
+    )
+    text = "I know it's a MUST-SEE! Click   here, share. This is breaking, sign up now"
+    assert matcher.match(text) == {
+        "urgency": {"now", "must-see", "breaking"},
+        "cta": {"click here", "sign up now"},  # "share. This" spans punctuation
+    }
+    assert matcher.counts("Snowfall is unknown") == {"urgency": 0, "cta": 0}
+
+
+def test_language_lexicons_load_from_files_on_top_of_builtins(tmp_path):
+    spanish = tmp_path / "es"
+    spanish.mkdir()
+    (spanish / "urgency.txt").write_text("# urgencia\nurgente\n\nahora mismo\n", encoding="utf-8")
+    (spanish / "cta.txt").write_text("comparte esto\n", encoding="utf-8")
+
+    matchers = load_lexicons(str(tmp_path), {"urgency": ["now"]})
+    assert set(matchers) == {"default", "es"}
+    assert matchers["es"].counts("URGENTE: comparte esto ahora mismo, now") == {"urgency": 3, "cta": 1}
+    assert matchers["default"].counts("urgente now") == {"urgency": 1}
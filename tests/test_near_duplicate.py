@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from app.config import get_settings
+from app.models.near_duplicate import LSHIndex, MinHasher, NearDuplicateIndex
+from app.storage.database import Database
+
+BASE = (
+    "Officials confirmed that polling stations in the northern district will close two hours "
+    "early on Thursday because of a reported security threat near the central market"
+)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/near_duplicate.db")
+    get_settings.cache_clear()
+    yield Database()
+    get_settings.cache_clear()
+
+
+def test_near_duplicates_found_and_reloaded_from_sqlite(database):
+    index = NearDuplicateIndex(database, threshold=0.5)
+    index.add("original", BASE)
+    index.add("unrelated", "Recipe: whisk two eggs with flour, sugar and a pinch of salt, then bake for forty minutes")
+
+    edited = BASE.replace("Thursday", "Friday")
+    matches = index.query(edited)
+    assert [match["intake_id"] for match in matches] == ["original"]
+    assert 0.5 <= matches[0]["similarity"] < 1.0
+
+    reloaded = NearDuplicateIndex(database, threshold=0.5)
+    assert [match["intake_id"] for match in reloaded.query(edited)] == ["original"]
+    assert len(reloaded.index) == 2
+
+    # Another worker's intake is tailed on the next query; our own rows are not indexed twice.
+    index.add("copy", BASE.replace("northern", "southern"))
+    assert {match["intake_id"] for match in reloaded.query(edited)} == {"original", "copy"}
+    assert len(reloaded.index) == 3
+    index.query(edited)
+    assert len(index.index) == 3
+
+
+def test_lsh_candidates_survive_merges():
+    hasher = MinHasher(num_perm=32)
+    index = LSHIndex(num_perm=32, bands=8)
+    texts = [f"{BASE} variant {idx} {idx * 7}" for idx in range(3000)]  # > 1024 pending: forces merges
+    keys = index.band_keys(np.stack([hasher.signature(text) for text in texts]))
+    index.bulk_load([f"bulk-{idx}" for idx in range(1000)], keys[:1000])
+    for idx in range(1000, 3000):
+        index.add(f"item-{idx}", keys[idx])
+
+    for idx in (0, 999, 1000, 2999):
+        assert idx in index.candidates(keys[idx])
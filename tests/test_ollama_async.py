@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.integrations.ollama_client import AsyncOllamaClient
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """Answers /api/generate like Ollama, after `delay` seconds, tracking concurrency."""
+
+    delay = 0.2
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        with StubOllama.lock:
+            StubOllama.active += 1
+            StubOllama.peak = max(StubOllama.peak, StubOllama.active)
+        time.sleep(StubOllama.delay)
+        with StubOllama.lock:
+            StubOllama.active -= 1
+        body = json.dumps(
+            {
+                "model": "stub",
+                "created_at": "2024-01-01T00:00:00Z",
+                "response": '{"risk": 0.7, "justification": "urgency cues"}',
+                "done": True,
+            }
+        ).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ollama(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("OLLAMA_HOST", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setenv("OLLAMA_MAX_CONCURRENCY", "2")
+    monkeypatch.setenv("OLLAMA_TIMEOUT", "1")
+    StubOllama.delay, StubOllama.peak = 0.2, 0
+    get_settings.cache_clear()
+    yield StubOllama
+    server.shutdown()
+    get_settings.cache_clear()
+
+
+def test_generations_are_capped_and_parsed(stub_ollama):
+    client = AsyncOllamaClient(available=True)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(client.risk_assessment(f"post {idx}") for idx in range(6)))
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == [0.7] * 6
+    assert stub_ollama.peak == 2
+    assert client.metrics()["max_in_flight"] == 2
+
+
+def test_slow_generation_times_out(stub_ollama):
+    stub_ollama.delay = 1.5
+    client = AsyncOllamaClient(available=True)
+
+    async def run():
+        try:
+            return await client.risk_assessment("slow post")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) is None
+    assert client.metrics()["timeouts"] == 1
+
+
+def test_client_from_a_previous_loop_is_closed(stub_ollama):
+    stub_ollama.delay = 0.01
+    client = AsyncOllamaClient(available=True)
+    assert asyncio.run(client.risk_assessment("first loop")) == 0.7
+    stale = client._client._client
+
+    async def second_loop():
+        try:
+            score = await client.risk_assessment("second loop")
+            await asyncio.sleep(0)  # let the stale close run
+            return score
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(second_loop()) == 0.7
+    assert stale.is_closed
@@ -0,0 +1,83 @@
+import os
+import time
+
+os.environ["HF_MODEL_NAME"] = "disabled"
+os.environ["HF_TOKENIZER_NAME"] = "disabled"
+
+from app.config import get_settings
+from app.models.detection import DetectorEngine
+from app.storage.result_cache import ResultCache
+
+get_settings.cache_clear()
+
+
+def test_two_tiers_normalisation_and_invalidation(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(path, max_entries=2)
+    cache.set("ollama", "llama|chars=2000", "Vote  early,\nvote often", 0.8)
+    assert cache.get("ollama", "llama|chars=2000", "Vote early, vote often") == 0.8
+    assert cache.get("ollama", "mistral|chars=2000", "Vote early, vote often") is None
+
+    # A fresh process only has the SQLite tier.
+    restarted = ResultCache(path)
+    assert restarted.get("ollama", "llama|chars=2000", "Vote early, vote often") == 0.8
+    stats = restarted.metrics()["namespaces"]["ollama"]
+    assert stats == {"memory_hits": 0, "disk_hits": 1, "misses": 0, "hit_rate": 1.0}
+
+    restarted.invalidate("ollama", "mistral|chars=2000")
+    assert ResultCache(path).get("ollama", "llama|chars=2000", "Vote early, vote often") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), ttl_seconds=-1)
+    cache.set("ollama", "llama", "some text", 0.4)
+    assert cache.get("ollama", "llama", "some text") is None
+    assert cache.metrics()["namespaces"]["ollama"]["misses"] == 1
+
+
+def test_expired_rows_are_purged_from_sqlite(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+    cache.set("ollama", "llama", "old text", 0.4)  # first write also runs the (empty) sweep
+    cache.set("ollama", "llama", "new text", 0.7)
+    assert cache.purge_expired(now=time.time() + 30) == 0
+    assert cache.purge_expired(now=time.time() + 120) == 2
+    with cache._cursor() as cur:
+        assert cur.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0] == 0
+    assert cache.metrics()["purged_rows"] == 2
+
+
+class CountingDetector:
+    available = True
+    model_identity = "adapter|family"
+
+    def __init__(self):
+        self.texts = []
+
+    def analyze_text(self, text):
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts, batch_size=None):
+        self.texts.extend(texts)
+        return [({"ai_probability": 0.9, "is_ai": True}, {"family": "gpt"}) for _ in texts]
+
+
+def test_reposted_text_skips_the_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/cache.db")
+    monkeypatch.setenv("HF_MICROBATCH_ENABLED", "false")
+    get_settings.cache_clear()
+    try:
+        engine = DetectorEngine()
+        detector = CountingDetector()
+        engine._ai_detector = detector
+        first = engine._ai_detection("Breaking: the dam has failed, evacuate now!")
+        repost = engine._ai_detection("Breaking:  the dam has failed, evacuate now!\n")
+        batch = engine._ai_detection_batch(
+            ["Breaking: the dam has failed, evacuate now!", "A different post entirely."]
+        )
+    finally:
+        get_settings.cache_clear()
+    assert repost == first == batch[0]
+    assert detector.texts == [
+        "Breaking: the dam has failed, evacuate now!",
+        "A different post entirely.",
+    ]
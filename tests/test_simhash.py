@@ -0,0 +1,74 @@
+import os
+
+os.environ["HF_MODEL_NAME"] = "disabled"
+os.environ["HF_TOKENIZER_NAME"] = "disabled"
+
+from app.config import get_settings
+from app.models.graph_intel import GraphIntelEngine
+from app.models.simhash import CampaignMatcher, SimHashIndex, hamming, simhash64
+from app.schemas import ContentIntake, SourceMetadata
+from app.storage.database import Database
+from app.storage.graph_store import MemoryGraphStore
+
+get_settings.cache_clear()
+
+CAMPAIGN = (
+    "Officials confirmed that polling stations in the northern district will close two hours "
+    "early on Thursday because of a reported security threat. Share this before it is deleted!"
+)
+
+
+def test_index_finds_hashes_within_k_bits_and_stays_bounded():
+    index = SimHashIndex(max_distance=3, bucket_limit=8, max_matches=2)
+    base = simhash64(CAMPAIGN)
+    index.add("near", base ^ 0b111)  # 3 bits apart
+    index.add("far", base ^ 0b1111)  # 4 bits apart
+    assert index.query(base) == [("near", 3)]
+
+    for idx in range(100):
+        index.add(f"copy-{idx}", base)
+    assert index.query(base) == [("copy-99", 0), ("copy-98", 0)]
+    assert max(len(bucket) for table in index._tables for bucket in table.values()) == 8
+    assert hamming(base, simhash64(CAMPAIGN.upper() + "  ")) == 0
+
+
+def test_campaign_copies_link_content_nodes_and_actors(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/simhash.db")
+    get_settings.cache_clear()
+    try:
+        db = Database()
+        matcher = CampaignMatcher(db)
+        engine = GraphIntelEngine(store=MemoryGraphStore())
+        texts = [CAMPAIGN, CAMPAIGN.replace("Share this", "Share it"), "Unrelated weather report for the coast."]
+        for idx, text in enumerate(texts):
+            simhash, near_duplicates = matcher.match(f"intake-{idx}", text)
+            db.store_fingerprint(f"intake-{idx}", text, "0" * 64, simhash=simhash)
+            intake = ContentIntake(
+                text=text,
+                source="crawler",
+                metadata=SourceMetadata(platform="web", actor_id=f"actor::named::{idx}"),
+                tags=["election"],
+            )
+            engine.ingest(f"intake-{idx}", intake, "high-risk", 0.8, near_duplicates=near_duplicates)
+        reloaded = CampaignMatcher(db)
+        _, reposted = reloaded.match("intake-3", CAMPAIGN)
+        # A copy ingested by the first worker after the second one loaded is still matched.
+        simhash, _ = matcher.match("intake-4", CAMPAIGN.replace("Share this", "Forward this"))
+        db.store_fingerprint("intake-4", CAMPAIGN, "0" * 64, simhash=simhash)
+        _, late = reloaded.match("intake-5", CAMPAIGN)
+        matcher.match("intake-6", "Another unrelated note about the harvest.")
+        indexed = [item_id for table in matcher.index._tables for bucket in table.values() for item_id, _ in bucket]
+    finally:
+        get_settings.cache_clear()
+
+    edge = engine.graph.get_edge_data("content::intake-1", "content::intake-0")
+    assert edge == {"relation": "near_duplicate"}
+    assert not any(
+        engine.graph.nodes[node].get("type") == "content"
+        for node in engine.graph.neighbors("content::intake-2")
+    )
+    alerts = {alert.actor: alert for alert in engine.summary().coordination_alerts}
+    assert "actor::named::0" in alerts["actor::named::1"].peer_actors
+    assert set(reposted) == {"intake-0", "intake-1"}
+    assert "intake-4" in late
+    assert indexed.count("intake-4") == len(matcher.index._tables)  # own row not indexed twice
@@ -0,0 +1,183 @@
+import sqlite3
+import threading
+
+import pytest
+
+from app.config import get_settings
+from app.storage.database import Database
+from app.storage.migrations import SCHEMA_VERSION
+from app.storage.pool import get_pool
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/storage.db")
+    get_settings.cache_clear()
+    yield Database()
+    get_settings.cache_clear()
+
+
+def test_pool_reuses_one_wal_connection_per_thread(database):
+    pool = get_pool(database.path)
+    conn = pool.connection()
+    database.log_action("case-1", "analysis_completed", "system", {})
+    assert pool.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(pool.connection()))
+    worker.start()
+    worker.join()
+    assert other[0] is not conn
+
+
+def test_failed_write_is_rolled_back(database):
+    with pytest.raises(RuntimeError):
+        with database._cursor() as cur:
+            cur.execute(database._AUDIT_INSERT, database._audit_row("case-2", "a", "system", {}))
+            raise RuntimeError("boom")
+    with database._cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM audit_log WHERE intake_id = 'case-2'")
+        assert cur.fetchone()[0] == 0
+
+
+def test_write_behind_groups_commits_and_flushes_on_close(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/write_behind.db")
+    monkeypatch.setenv("DB_DURABILITY_MODE", "write_behind")
+    monkeypatch.setenv("DB_WRITE_BEHIND_MAX_ROWS", "4")
+    monkeypatch.setenv("DB_WRITE_BEHIND_FLUSH_MS", "1000")
+    get_settings.cache_clear()
+    try:
+        database = Database()
+    finally:
+        get_settings.cache_clear()
+
+    for idx in range(10):  # more than the queue holds: enqueue blocks, never drops
+        database.log_action(f"case-{idx}", "analysis_completed", "system", {"idx": idx})
+    database.store_fingerprint("case-0", "Polls close at noon", "0" * 64)
+    assert database.check_fingerprint("polls close at NOON")  # reads see queued writes
+    database.log_action("case-last", "analysis_completed", "system", {})
+    database.close()
+
+    metrics = database.persistence_metrics()
+    assert metrics["durability_mode"] == "write_behind"
+    assert metrics["written"] == metrics["enqueued"] == 12
+    assert metrics["flushes"] < 12
+    with database._cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM audit_log")
+        assert cur.fetchone()[0] == 11
+
+
+def test_migrations_upgrade_unversioned_database_and_index_lookups(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE cases (intake_id TEXT PRIMARY KEY, raw_text TEXT NOT NULL,
+            classification TEXT NOT NULL, composite_score REAL NOT NULL, metadata_json TEXT,
+            breakdown_json TEXT, provenance_json TEXT, created_at TEXT NOT NULL);
+        CREATE TABLE audit_log (id INTEGER PRIMARY KEY AUTOINCREMENT, intake_id TEXT,
+            action TEXT NOT NULL, actor TEXT NOT NULL, payload TEXT, created_at TEXT NOT NULL);
+        CREATE TABLE fingerprints (id INTEGER PRIMARY KEY AUTOINCREMENT, intake_id TEXT NOT NULL,
+            content_hash TEXT NOT NULL, normalized_hash TEXT NOT NULL, created_at TEXT NOT NULL);
+        INSERT INTO cases VALUES ('old-case', 'text', 'low-risk', 0.1, '{}', '{}', '{}', '2024-01-01');
+        """
+    )
+    conn.close()
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{path}")
+    get_settings.cache_clear()
+    try:
+        database = Database()
+        Database()  # a second worker starting up is a no-op
+    finally:
+        get_settings.cache_clear()
+
+    with database._cursor() as cur:
+        assert cur.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(cases)")}
+        assert {"summary_text", "decision_reason"} <= columns
+        plan = " ".join(
+            str(row[3])
+            for row in cur.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM fingerprints WHERE normalized_hash = ? OR content_hash = ?",
+                ("a", "a"),
+            )
+        )
+    assert "idx_fingerprints_normalized_hash" in plan and "idx_fingerprints_content_hash" in plan
+    assert database.fetch_case("old-case")["classification"] == "low-risk"
+
+
+@pytest.fixture
+def write_behind_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/shared.db")
+    monkeypatch.setenv("DB_DURABILITY_MODE", "write_behind")
+    monkeypatch.setenv("DB_WRITE_BEHIND_FLUSH_MS", "1000")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_write_behind_reads_see_other_instances_and_flush_is_bounded(write_behind_env):
+    writer_db, reader_db = Database(), Database()  # orchestrator.db and database_l2
+    assert writer_db._writer is reader_db._writer
+    writer_db.save_case("case-new", "text", "low-risk", 0.1, {}, {}, {})
+    assert reader_db.fetch_case("case-new") is not None  # no 404 for a queued case
+
+    stop = threading.Event()
+
+    def sustained_intake():
+        idx = 0
+        while not stop.is_set():
+            writer_db.log_action(f"case-{idx}", "analysis_completed", "system", {})
+            idx += 1
+
+    intake = threading.Thread(target=sustained_intake)
+    intake.start()
+    try:
+        for _ in range(5):  # each flush returns although rows keep arriving
+            reader_db.flush()
+    finally:
+        stop.set()
+        intake.join()
+    writer_db.close()
+    assert reader_db._writer._worker.is_alive()  # still serving the other instance
+    reader_db.close()
+    assert not reader_db._writer._worker.is_alive()
+
+
+def test_write_behind_failed_group_keeps_its_good_rows(write_behind_env):
+    database = Database()
+    good = database._audit_row("case-ok", "analysis_completed", "system", {})
+    bad = ("case-bad", None, "system", "{}", "2024-01-01")  # action is NOT NULL
+    database._writer.enqueue([(database._AUDIT_INSERT, good), (database._AUDIT_INSERT, bad)])
+    database.close()
+
+    metrics = database.persistence_metrics()
+    assert metrics["failed_rows"] == 1 and metrics["written"] == 1 and metrics["retries"] == 2
+    with database._cursor() as cur:
+        assert cur.execute("SELECT intake_id FROM audit_log").fetchall() == [("case-ok",)]
+
+
+def test_write_behind_keeps_grouping_with_matchers_enabled(write_behind_env, monkeypatch):
+    from app.schemas import ContentIntake, SourceMetadata
+    from app.services.orchestrator import AnalysisOrchestrator
+
+    monkeypatch.setenv("DISABLE_AI_MODELS", "true")
+    monkeypatch.setenv("DB_WRITE_BEHIND_FLUSH_MS", "60000")
+    monkeypatch.setenv("DB_WRITE_BEHIND_FLUSH_ROWS", "10000")
+    get_settings.cache_clear()
+    orchestrator = AnalysisOrchestrator()
+    assert orchestrator.campaigns is not None and orchestrator.near_duplicates is not None
+    text = "Copy-paste campaign: polling booths shut early, forward to everyone before noon today."
+    intake = ContentIntake(text=text, source="crawler", metadata=SourceMetadata(platform="web"))
+    results = [orchestrator._process_sync(intake) for _ in range(20)]
+
+    # The matchers' tailing reads do not flush the queue: nothing committed yet...
+    assert orchestrator.db.persistence_metrics()["flushes"] == 0
+    # ...yet copies still match, from the in-memory indexes.
+    _, campaign = orchestrator.campaigns.match("probe", text)
+    assert campaign and set(campaign) <= {result.intake_id for result in results}
+    assert len(orchestrator.check_near_duplicates(text)) == 20
+    orchestrator.db.close()
+    with orchestrator.db._cursor() as cur:
+        assert cur.execute("SELECT COUNT(*) FROM cases").fetchone()[0] == 20
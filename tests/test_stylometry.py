@@ -0,0 +1,48 @@
+import re
+
+import pytest
+
+from app.models.detection import DetectorEngine
+from app.models.stylometry import StylometricExtractor, calculate_mattr, calculate_mattr_exact
+
+TEXTS = [
+    "",
+    "   ",
+    "Dr. Smith said the U.S. vote is rigged! Share now... Why? Because   !!! they lie.",
+    "No sentence break here at all",
+    "Mr. Jones left. -- ? It's over! 'Quoted' text - here.\n\nNext paragraph?  Yes.",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_single_pass_split_matches_sentence_by_sentence_tokenizing(text):
+    sentences = re.split(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s", text)
+    sentences = [s.strip() for s in sentences if s.strip()]
+    expected_lengths = [len(re.findall(r"\b[\w'-]+\b", s)) for s in sentences]
+
+    tokens, lengths = StylometricExtractor(DetectorEngine.FUNCTION_WORDS).split(text)
+    assert tokens == re.findall(r"\b[\w'-]+\b", text)
+    assert lengths == expected_lengths
+
+
+def test_features_are_pinned():
+    features = StylometricExtractor(DetectorEngine.FUNCTION_WORDS).extract(TEXTS[2])
+    assert features["sentence_length_var"] == 11.5  # lengths 9, 2, 1, 1, 2
+    assert features["function_word_ratio"] == pytest.approx(2 / 15)
+    assert features["uppercase_ratio"] == 0.0  # single letters do not count
+    assert features["punctuation_variety"] == 0.375
+    assert features["repetition_rate"] == 0.0
+
+
+def test_mattr_exact_and_approx_are_pinned():
+    assert calculate_mattr_exact(["a", "a", "b", "b"], window=2) == pytest.approx(2 / 3)
+    assert calculate_mattr(["a", "a", "b", "b"], window=2) == 0.75  # includes the 1-token tail window
+
+    # Squares mod 37 repeat every 37 tokens, so every 50-token window holds 19 types.
+    tokens = [f"t{(idx * idx) % 37}" for idx in range(200)]
+    assert calculate_mattr_exact(tokens) == pytest.approx(0.38, abs=1e-12)
+    assert calculate_mattr(tokens) == pytest.approx(0.4075, abs=1e-12)
+    assert calculate_mattr_exact(tokens[:40]) == calculate_mattr(tokens[:40]) == 19 / 40  # shorter than a window
+
+    exact = StylometricExtractor([], mattr_method="exact").extract(" ".join(tokens))
+    assert exact["mattr"] == pytest.approx(0.38, abs=1e-12)